@@ -1,11 +1,25 @@
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from src.data.ingestion import load_from_s3, save_to_local
 from src.config.settings import settings
+from src.infrastructure.artifacts import (
+    CATALOG_ARTIFACTS,
+    FAISS_INDEX_SUFFIX,
+    LEGACY_FAISS_INDEX_SUFFIX,
+    index_sidecar_paths,
+)
 from src.infrastructure.logging import setup_logging, get_logger
+from src.infrastructure.s3 import (
+    MAX_TRANSFER_WORKERS,
+    download_compressed_catalog,
+    find_latest_key,
+    get_s3_client,
+    get_transfer_config,
+)
 
 setup_logging()
 logger = get_logger(__name__)
@@ -31,32 +45,23 @@ def download_data_from_s3():
 def download_artifacts_from_s3(version: str = None):
     logger.info("Downloading artifacts from S3", bucket=settings.s3_bucket, version=version)
 
-    import boto3
-    import glob
-
-    s3_client = boto3.client(
-        "s3",
-        region_name=settings.aws_region,
-        aws_access_key_id=settings.aws_access_key_id,
-        aws_secret_access_key=settings.aws_secret_access_key,
-    )
+    s3_client = get_s3_client()
 
     if version is None:
         logger.info("No version specified, listing available versions")
         prefix = f"{settings.s3_prefix}/models/collaborative/"
-        response = s3_client.list_objects_v2(Bucket=settings.s3_bucket, Prefix=prefix, Delimiter="/")
-        
-        if "CommonPrefixes" in response:
-            versions = [cp["Prefix"].split("/")[-2] for cp in response["CommonPrefixes"]]
-            if versions:
-                version = max(versions)
-                logger.info("Using latest version", version=version)
-            else:
-                logger.error("No versions found")
-                return
-        else:
+        # Listing pages are followed so more than 1000 versions are still all seen
+        paginator = s3_client.get_paginator("list_objects_v2")
+        versions = [
+            cp["Prefix"].split("/")[-2]
+            for page in paginator.paginate(Bucket=settings.s3_bucket, Prefix=prefix, Delimiter="/")
+            for cp in page.get("CommonPrefixes", [])
+        ]
+        if not versions:
             logger.error("No models found in S3")
             return
+        version = max(versions)
+        logger.info("Using latest version", version=version)
 
     artifacts_dir = "data/artifacts"
     os.makedirs(artifacts_dir, exist_ok=True)
@@ -67,33 +72,60 @@ def download_artifacts_from_s3(version: str = None):
         (f"catalogs/{version}/product_catalog.json", "product_catalog.json"),
     ]
 
-    embedding_prefix = f"{settings.s3_prefix}/embeddings/{version}/"
-    response = s3_client.list_objects_v2(Bucket=settings.s3_bucket, Prefix=embedding_prefix)
-    if "Contents" in response:
-        embedding_files = [obj["Key"] for obj in response["Contents"] if obj["Key"].endswith(".npy")]
-        if embedding_files:
-            latest_embedding = max(embedding_files)
-            files_to_download.append((latest_embedding, os.path.basename(latest_embedding)))
-
-    index_prefix = f"{settings.s3_prefix}/indices/{version}/"
-    response = s3_client.list_objects_v2(Bucket=settings.s3_bucket, Prefix=index_prefix)
-    if "Contents" in response:
-        index_files = [obj["Key"] for obj in response["Contents"] if obj["Key"].endswith(".pkl")]
-        if index_files:
-            latest_index = max(index_files)
-            files_to_download.append((latest_index, os.path.basename(latest_index)))
-
-    for s3_key, local_file in files_to_download:
+    # Both listings are independent round-trips, so issue them concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        latest_embedding_future = executor.submit(
+            find_latest_key, s3_client, f"{settings.s3_prefix}/embeddings/{version}/", ".npy"
+        )
+        latest_index_future = executor.submit(
+            find_latest_key,
+            s3_client,
+            f"{settings.s3_prefix}/indices/{version}/",
+            FAISS_INDEX_SUFFIX,
+            LEGACY_FAISS_INDEX_SUFFIX,
+        )
+        wait([latest_embedding_future, latest_index_future])
+
+    latest_keys = [latest_embedding_future.result()]
+    latest_index_key = latest_index_future.result()
+    if latest_index_key:
+        latest_keys.append(latest_index_key)
+        if latest_index_key.endswith(FAISS_INDEX_SUFFIX):
+            latest_keys.extend(index_sidecar_paths(latest_index_key))
+
+    for latest_key in latest_keys:
+        if latest_key:
+            files_to_download.append((latest_key, os.path.basename(latest_key)))
+
+    def download_artifact(s3_key: str, local_file: str) -> None:
         full_s3_key = f"{settings.s3_prefix}/{s3_key}" if not s3_key.startswith(settings.s3_prefix) else s3_key
         local_path = os.path.join(artifacts_dir, local_file)
-        
+
         logger.info("Downloading artifact", s3_key=full_s3_key, local=local_path)
         try:
-            s3_client.download_file(settings.s3_bucket, full_s3_key, local_path)
+            # Catalogs are uploaded gzip-compressed; older versions only have the plain JSON
+            if local_file in CATALOG_ARTIFACTS and download_compressed_catalog(
+                s3_client, full_s3_key, local_path
+            ):
+                logger.info("Artifact downloaded", local=local_path, compressed=True)
+                return
+
+            s3_client.download_file(
+                settings.s3_bucket, full_s3_key, local_path, Config=get_transfer_config()
+            )
             logger.info("Artifact downloaded", local=local_path)
         except Exception as e:
             logger.warning("Failed to download artifact", s3_key=full_s3_key, error=str(e))
 
+    # boto3 clients are thread-safe, so all workers share the same connection pool
+    with ThreadPoolExecutor(max_workers=min(MAX_TRANSFER_WORKERS, len(files_to_download))) as executor:
+        futures = [
+            executor.submit(download_artifact, s3_key, local_file)
+            for s3_key, local_file in files_to_download
+        ]
+        for future in as_completed(futures):
+            future.result()
+
     logger.info("Artifacts download completed")
 
 
@@ -4,55 +4,120 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import pandas as pd
-import json
 from datetime import datetime
-import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend
-import matplotlib.pyplot as plt
-import seaborn as sns
+from typing import Any, Dict, List, Optional, Sequence
 
 from src.data.ingestion import load_from_local
+from src.config.constants import RATINGS_COLUMNS
 from src.data.validation import get_data_quality_report
+from src.infrastructure.serialization import write_json_report
 from src.infrastructure.logging import setup_logging, get_logger
 
 setup_logging()
 logger = get_logger(__name__)
 
-# Set style
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (12, 6)
+# Figures are already laid out with tight_layout(), so they are saved in a single
+# render pass at screen resolution.
+FIGURE_DPI = 100
+MAX_TIME_SERIES_POINTS = 1000
 
 
-def generate_eda_report(df: pd.DataFrame, output_file: str = "data/reports/eda_report.json") -> None:
+def _compute_eda_stats_duckdb(df: pd.DataFrame, top_n: int) -> Dict[str, Any]:
+    import duckdb
+
+    con = duckdb.connect()
+    con.register("ratings", df)
+
+    def count_by(column: str, order_by: str, limit: Optional[int] = None) -> pd.Series:
+        query = f'SELECT "{column}", COUNT(*) AS n FROM ratings GROUP BY 1 ORDER BY {order_by}'
+        if limit is not None:
+            query += f" LIMIT {limit}"
+        return con.execute(query).df().set_index(column)["n"]
+
+    unique_users, unique_products = con.execute(
+        "SELECT COUNT(DISTINCT user_id), COUNT(DISTINCT product_id) FROM ratings"
+    ).fetchone()
+    stats = {
+        "unique_users": int(unique_users),
+        "unique_products": int(unique_products),
+        "top_users": count_by("user_id", "n DESC", top_n),
+        "top_products": count_by("product_id", "n DESC", top_n),
+    }
+    if "rating" in df.columns:
+        stats["rating_counts"] = count_by("rating", "1")
+        stats["avg_rating"] = float(con.execute("SELECT AVG(rating) FROM ratings").fetchone()[0])
+    con.close()
+    return stats
+
+
+def compute_eda_stats(df: pd.DataFrame, top_n: int = 10) -> Dict[str, Any]:
+    """Compute the aggregates shared by the JSON and HTML reports.
+    
+    Each column is scanned once; both report generators reuse the result.
+    Aggregations run in DuckDB (vectorized, multithreaded, zero-copy over the
+    Arrow-backed frame) when it is installed, otherwise in pandas.
+    
+    Args:
+        df: DataFrame with transaction data
+        top_n: Number of top users/products to keep
+    
+    Returns:
+        Dictionary with unique counts, rating counts and top users/products
+    """
+    try:
+        return _compute_eda_stats_duckdb(df, top_n)
+    except ImportError:
+        logger.debug("DuckDB not available, computing EDA stats with pandas")
+
+    stats = {
+        "unique_users": int(df["user_id"].nunique()),
+        "unique_products": int(df["product_id"].nunique()),
+        "top_users": df.groupby("user_id", sort=False, observed=True).size().nlargest(top_n),
+        "top_products": df.groupby("product_id", sort=False, observed=True).size().nlargest(top_n),
+    }
+    if "rating" in df.columns:
+        stats["rating_counts"] = df.groupby("rating", sort=True, observed=True).size()
+        stats["avg_rating"] = float(df["rating"].mean())
+    return stats
+
+
+def generate_eda_report(
+    df: pd.DataFrame,
+    output_file: str = "data/reports/eda_report.json",
+    stats: Optional[Dict[str, Any]] = None,
+) -> None:
     """Generate EDA report in JSON format.
     
     Args:
         df: DataFrame with transaction data
         output_file: Path to save JSON report
+        stats: Precomputed aggregates from compute_eda_stats. Computed if None.
     """
     logger.info("Generating EDA report", output_file=output_file)
     
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
     
+    if stats is None:
+        stats = compute_eda_stats(df)
+    
     report = {
         "generated_at": datetime.now().isoformat(),
         "data_quality": get_data_quality_report(df, data_type="transactions"),
         "summary": {
             "total_rows": len(df),
-            "unique_users": df["user_id"].nunique(),
-            "unique_products": df["product_id"].nunique(),
+            "unique_users": stats["unique_users"],
+            "unique_products": stats["unique_products"],
             "date_range": {
                 "min": str(df["timestamp"].min()) if "timestamp" in df.columns else None,
                 "max": str(df["timestamp"].max()) if "timestamp" in df.columns else None,
             },
         },
-        "rating_distribution": df["rating"].value_counts().to_dict() if "rating" in df.columns else {},
-        "top_users": df["user_id"].value_counts().head(10).to_dict(),
-        "top_products": df["product_id"].value_counts().head(10).to_dict(),
+        "rating_distribution": stats["rating_counts"].to_dict() if "rating_counts" in stats else {},
+        "top_users": stats["top_users"].to_dict(),
+        "top_products": stats["top_products"].to_dict(),
     }
     
-    with open(output_file, "w") as f:
-        json.dump(report, f, indent=2, default=str)
+    write_json_report(output_file, report)
     
     logger.info("EDA report generated", output_file=output_file)
     print(f"\nEDA Report Summary:")
@@ -62,17 +127,42 @@ def generate_eda_report(df: pd.DataFrame, output_file: str = "data/reports/eda_r
     print(f"Report saved to: {output_file}")
 
 
-def generate_eda_html_report(df: pd.DataFrame, output_file: str = "data/reports/eda_report.html") -> None:
+def _render_table(headers: List[str], columns: List[Sequence[str]]) -> str:
+    """Render pre-formatted columns as an HTML table with a single join."""
+    header_row = "<tr>" + "".join(f"<th>{header}</th>" for header in headers) + "</tr>"
+    rows = ["<tr><td>" + "</td><td>".join(cells) + "</td></tr>" for cells in zip(*columns)]
+    return "\n".join(["<table>", header_row, *rows, "</table>"])
+
+
+def generate_eda_html_report(
+    df: pd.DataFrame,
+    output_file: str = "data/reports/eda_report.html",
+    stats: Optional[Dict[str, Any]] = None,
+) -> None:
     """Generate EDA report in HTML format with visualizations.
     
     Args:
         df: DataFrame with transaction data
         output_file: Path to save HTML report
+        stats: Precomputed aggregates from compute_eda_stats. Computed if None.
     """
     logger.info("Generating EDA HTML report", output_file=output_file)
     
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
     
+    if stats is None:
+        stats = compute_eda_stats(df)
+    
+    # Plotting libraries are only needed for the HTML report, so they are not
+    # imported at script start-up.
+    import matplotlib
+    matplotlib.use('Agg')  # Non-interactive backend
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
+    sns.set_style("whitegrid")
+    plt.rcParams['figure.figsize'] = (12, 6)
+    
     # Create figures directory
     figures_dir = os.path.join(os.path.dirname(output_file), "figures")
     os.makedirs(figures_dir, exist_ok=True)
@@ -110,16 +200,16 @@ def generate_eda_html_report(df: pd.DataFrame, output_file: str = "data/reports/
     html_parts.append("<h2>Summary Statistics</h2>")
     html_parts.append('<div class="summary">')
     html_parts.append(f'<div class="summary-card"><h3>Total Rows</h3><p>{len(df):,}</p></div>')
-    html_parts.append(f'<div class="summary-card"><h3>Unique Users</h3><p>{df["user_id"].nunique():,}</p></div>')
-    html_parts.append(f'<div class="summary-card"><h3>Unique Products</h3><p>{df["product_id"].nunique():,}</p></div>')
+    html_parts.append(f'<div class="summary-card"><h3>Unique Users</h3><p>{stats["unique_users"]:,}</p></div>')
+    html_parts.append(f'<div class="summary-card"><h3>Unique Products</h3><p>{stats["unique_products"]:,}</p></div>')
     if "rating" in df.columns:
-        html_parts.append(f'<div class="summary-card"><h3>Avg Rating</h3><p>{df["rating"].mean():.2f}</p></div>')
+        html_parts.append(f'<div class="summary-card"><h3>Avg Rating</h3><p>{stats["avg_rating"]:.2f}</p></div>')
     html_parts.append("</div>")
     
     # Rating distribution
     if "rating" in df.columns:
         html_parts.append("<h2>Rating Distribution</h2>")
-        rating_counts = df["rating"].value_counts().sort_index()
+        rating_counts = stats["rating_counts"]
         
         # Create bar chart
         plt.figure(figsize=(10, 6))
@@ -130,43 +220,49 @@ def generate_eda_html_report(df: pd.DataFrame, output_file: str = "data/reports/
         plt.xticks(rotation=0)
         plt.tight_layout()
         chart_path = os.path.join(figures_dir, "rating_distribution.png")
-        plt.savefig(chart_path, dpi=150, bbox_inches='tight')
+        plt.savefig(chart_path, dpi=FIGURE_DPI)
         plt.close()
         
         html_parts.append(f'<img src="figures/rating_distribution.png" alt="Rating Distribution">')
         
         # Table
-        html_parts.append("<table>")
-        html_parts.append("<tr><th>Rating</th><th>Count</th><th>Percentage</th></tr>")
-        for rating, count in rating_counts.items():
-            pct = (count / len(df)) * 100
-            html_parts.append(f"<tr><td>{rating}</td><td>{count:,}</td><td>{pct:.2f}%</td></tr>")
-        html_parts.append("</table>")
+        html_parts.append(_render_table(
+            ["Rating", "Count", "Percentage"],
+            [
+                rating_counts.index.astype(str),
+                rating_counts.map("{:,}".format),
+                (rating_counts / len(df) * 100).map("{:.2f}%".format),
+            ],
+        ))
     
     # Top users
     html_parts.append("<h2>Top 10 Most Active Users</h2>")
-    top_users = df["user_id"].value_counts().head(10)
-    html_parts.append("<table>")
-    html_parts.append("<tr><th>User ID</th><th>Interactions</th></tr>")
-    for user_id, count in top_users.items():
-        html_parts.append(f"<tr><td>{user_id}</td><td>{count:,}</td></tr>")
-    html_parts.append("</table>")
+    top_users = stats["top_users"]
+    html_parts.append(_render_table(
+        ["User ID", "Interactions"],
+        [top_users.index.astype(str), top_users.map("{:,}".format)],
+    ))
     
     # Top products
     html_parts.append("<h2>Top 10 Most Popular Products</h2>")
-    top_products = df["product_id"].value_counts().head(10)
-    html_parts.append("<table>")
-    html_parts.append("<tr><th>Product ID</th><th>Interactions</th></tr>")
-    for product_id, count in top_products.items():
-        html_parts.append(f"<tr><td>{product_id}</td><td>{count:,}</td></tr>")
-    html_parts.append("</table>")
+    top_products = stats["top_products"]
+    html_parts.append(_render_table(
+        ["Product ID", "Interactions"],
+        [top_products.index.astype(str), top_products.map("{:,}".format)],
+    ))
     
     # Time series if timestamp available
     if "timestamp" in df.columns:
         html_parts.append("<h2>Activity Over Time</h2>")
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df["date"] = df["timestamp"].dt.date
-        daily_counts = df.groupby("date").size()
+        # Flooring stays in datetime64 space instead of boxing a Python date per row
+        timestamps = df["timestamp"]
+        if not pd.api.types.is_datetime64_any_dtype(timestamps):
+            # Processed ratings store ISO 8601 strings; an explicit format skips inference
+            timestamps = pd.to_datetime(timestamps, utc=True, format="ISO8601")
+        daily_counts = timestamps.dt.floor("D").value_counts().sort_index()
+        # Beyond screen resolution extra points only slow down the line renderer
+        if len(daily_counts) > MAX_TIME_SERIES_POINTS:
+            daily_counts = daily_counts.resample("1W").sum()
         
         plt.figure(figsize=(14, 6))
         daily_counts.plot(kind='line', color='#4CAF50', linewidth=2)
@@ -176,7 +272,7 @@ def generate_eda_html_report(df: pd.DataFrame, output_file: str = "data/reports/
         plt.grid(True, alpha=0.3)
         plt.tight_layout()
         chart_path = os.path.join(figures_dir, "time_series.png")
-        plt.savefig(chart_path, dpi=150, bbox_inches='tight')
+        plt.savefig(chart_path, dpi=FIGURE_DPI)
         plt.close()
         
         html_parts.append(f'<img src="figures/time_series.png" alt="Time Series">')
@@ -211,11 +307,15 @@ def main():
         ingest_main()
     
     logger.info("Loading processed data", file=input_file)
-    df = load_from_local(input_file)
+    df = load_from_local(input_file, columns=RATINGS_COLUMNS, dtype_backend="pyarrow")
+    # Encode the ID columns once so every count/nunique/duplicate check in both
+    # reports hashes integer codes instead of strings.
+    df = df.astype({"user_id": "category", "product_id": "category"})
     
     logger.info("Generating EDA reports")
-    generate_eda_report(df)
-    generate_eda_html_report(df)
+    stats = compute_eda_stats(df)
+    generate_eda_report(df, stats=stats)
+    generate_eda_html_report(df, stats=stats)
     
     logger.info("EDA pipeline completed")
 
@@ -1,85 +1,123 @@
 import sys
 import os
-import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import pandas as pd
 
 from src.data.ingestion import load_from_local
+from src.config.constants import RATINGS_COLUMNS
 from src.data.splitting import temporal_split
-from src.data.catalog import UserCatalog, ProductCatalog
 from src.models.baseline import PopularityBaseline, UserPopularityBaseline
 from src.models.collaborative import CollaborativeFilter
-from src.models.hybrid import HybridRecommender
 from src.models.evaluation import RecommenderEvaluator
-from src.services.vector_store import FAISSVectorStore
 from src.config.settings import settings
+from src.infrastructure.artifacts import find_latest_index
+from src.infrastructure.serialization import write_json_report
 from src.infrastructure.logging import setup_logging, get_logger
 
 setup_logging()
 logger = get_logger(__name__)
 
+K_VALUES = [5, 10, 20]
+MODEL_NAMES = ["popularity", "collaborative", "hybrid"]
+COLLABORATIVE_MODEL_PATH = "data/artifacts/collaborative_model.pkl"
 
-def main():
-    logger.info("Starting evaluation pipeline")
+# Set once per worker process by _init_worker; evaluation tasks only receive a name
+_EVALUATOR: Optional[RecommenderEvaluator] = None
+_POPULAR_ITEMS: List[str] = []
+_INDEX_PATH: Optional[str] = None
 
-    logger.info("Loading data")
-    df = load_from_local("data/processed/ratings.parquet")
-    train_df, val_df, test_df = temporal_split(df)
 
-    logger.info("Loading models and catalogs")
-    user_catalog = UserCatalog.load("data/artifacts/user_catalog.json")
-    product_catalog = ProductCatalog.load("data/artifacts/product_catalog.json")
-    collaborative_model = CollaborativeFilter.load("data/artifacts/collaborative_model.pkl")
-
-    import glob
-    index_files = glob.glob("data/artifacts/faiss_index_*.pkl")
-    if index_files:
-        latest_index = max(index_files)
-        vector_store = FAISSVectorStore.load(latest_index)
-    else:
-        logger.error("No FAISS index found")
-        return
+def _init_worker(evaluator: RecommenderEvaluator, popular_items: List[str], index_path: str) -> None:
+    global _EVALUATOR, _POPULAR_ITEMS, _INDEX_PATH
+    _EVALUATOR = evaluator
+    _POPULAR_ITEMS = popular_items
+    _INDEX_PATH = index_path
 
-    hybrid_recommender = HybridRecommender(
+
+def _load_model(name: str) -> Any:
+    # Models are loaded inside the worker: FAISS starts an OpenMP thread pool, and
+    # a process forked after that can deadlock in it, so workers are spawned and
+    # the parent never touches FAISS
+    collaborative_model = CollaborativeFilter.load(COLLABORATIVE_MODEL_PATH)
+    if name == "collaborative":
+        return collaborative_model
+
+    from src.models.hybrid import HybridRecommender
+    from src.services.vector_store import FAISSVectorStore
+
+    return HybridRecommender(
         collaborative_model=collaborative_model,
-        vector_store=vector_store,
+        vector_store=FAISSVectorStore.load(_INDEX_PATH),
         alpha=0.5,
     )
 
-    logger.info("Evaluating models")
 
-    evaluator = RecommenderEvaluator(test_df)
+def _evaluate_popularity() -> Dict[str, Any]:
+    logger.info("Evaluating popularity baseline")
+    # The baseline is user-independent, so a single ranked list serves every user
+    return _EVALUATOR.evaluate_recommendations(
+        {user_id: _POPULAR_ITEMS for user_id in _EVALUATOR.user_ground_truth},
+        k_values=K_VALUES,
+    )
 
-    results = {}
 
-    logger.info("Evaluating popularity baseline")
-    popularity_baseline = PopularityBaseline(train_df)
+def _evaluate_batch_model(name: str) -> Dict[str, Any]:
+    logger.info("Evaluating model", model=name)
+    test_users = list(_EVALUATOR.user_ground_truth)
+    recommendations = _load_model(name).recommend_batch(test_users, top_k=max(K_VALUES))
+    return _EVALUATOR.evaluate_recommendations(
+        {user_id: [item_id for item_id, _ in recs] for user_id, recs in recommendations.items()},
+        k_values=K_VALUES,
+    )
 
-    def popularity_recommend(user_id: str, top_k: int):
-        return popularity_baseline.recommend(top_k=top_k)
 
-    results["popularity"] = evaluator.evaluate(popularity_recommend, k_values=[5, 10, 20])
+def _run_evaluation(name: str) -> Dict[str, Any]:
+    if name == "popularity":
+        return _evaluate_popularity()
+    return _evaluate_batch_model(name)
 
-    logger.info("Evaluating collaborative filter")
 
-    def collaborative_recommend(user_id: str, top_k: int):
-        return collaborative_model.recommend(user_id, top_k=top_k)
+def main():
+    logger.info("Starting evaluation pipeline")
 
-    results["collaborative"] = evaluator.evaluate(collaborative_recommend, k_values=[5, 10, 20])
+    logger.info("Loading data")
+    df = load_from_local("data/processed/ratings.parquet", columns=RATINGS_COLUMNS)
+    train_df, val_df, test_df = temporal_split(df)
 
-    logger.info("Evaluating hybrid recommender")
+    latest_index = find_latest_index("data/artifacts")
+    if not latest_index:
+        logger.error("No FAISS index found")
+        return
 
-    def hybrid_recommend(user_id: str, top_k: int):
-        return hybrid_recommender.recommend(user_id, top_k=top_k)
+    logger.info("Evaluating models")
 
-    results["hybrid"] = evaluator.evaluate(hybrid_recommend, k_values=[5, 10, 20])
+    # Only the columns the ground truth is built from are kept; the evaluator is
+    # pickled to each worker once
+    evaluator = RecommenderEvaluator(test_df[["user_id", "product_id", "rating"]])
+    popular_items = [
+        product_id
+        for product_id, _ in PopularityBaseline(train_df).recommend(top_k=max(K_VALUES))
+    ]
+
+    # Workers are spawned rather than forked, so none inherits a FAISS/OpenMP
+    # thread pool mid-flight; each loads the model it evaluates (see _load_model)
+    with ProcessPoolExecutor(
+        max_workers=len(MODEL_NAMES),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(evaluator, popular_items, latest_index),
+    ) as executor:
+        futures = {name: executor.submit(_run_evaluation, name) for name in MODEL_NAMES}
+        results = {name: future.result() for name, future in futures.items()}
 
     logger.info("Saving evaluation results")
     os.makedirs("data/reports", exist_ok=True)
-    with open("data/reports/evaluation_results.json", "w") as f:
-        json.dump(results, f, indent=2)
+    write_json_report("data/reports/evaluation_results.json", results)
 
     logger.info("Evaluation pipeline completed", results=results)
 
@@ -1,6 +1,5 @@
 import sys
 import os
-import json
 from datetime import datetime
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -8,24 +7,27 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 import pandas as pd
 
 from src.data.ingestion import load_from_local
+from src.config.constants import RATINGS_COLUMNS
 from src.data.splitting import temporal_split
 from src.data.catalog import UserCatalog, ProductCatalog
 from src.models.collaborative import CollaborativeFilter
-from src.models.hybrid import HybridRecommender
 from src.models.evaluation import RecommenderEvaluator
 from src.monitoring.drift_detection import DriftDetector
-from src.services.vector_store import FAISSVectorStore
+from src.infrastructure.artifacts import find_latest_index
+from src.infrastructure.serialization import write_json_report
 from src.infrastructure.logging import setup_logging, get_logger
 
 setup_logging()
 logger = get_logger(__name__)
 
+K_VALUES = [5, 10, 20]
+
 
 def main():
     logger.info("Starting production evaluation pipeline")
 
     logger.info("Loading data")
-    df = load_from_local("data/processed/ratings.parquet")
+    df = load_from_local("data/processed/ratings.parquet", columns=RATINGS_COLUMNS)
     train_df, val_df, test_df = temporal_split(df)
 
     logger.info("Loading models")
@@ -33,12 +35,15 @@ def main():
     product_catalog = ProductCatalog.load("data/artifacts/product_catalog.json")
     collaborative_model = CollaborativeFilter.load("data/artifacts/collaborative_model.pkl")
 
-    import glob
-    index_files = glob.glob("data/artifacts/faiss_index_*.pkl")
-    if not index_files:
+    latest_index = find_latest_index("data/artifacts")
+    if not latest_index:
         logger.error("No FAISS index found")
         return
-    latest_index = max(index_files)
+
+    # FAISS is only imported once there is an index to load
+    from src.models.hybrid import HybridRecommender
+    from src.services.vector_store import FAISSVectorStore
+
     vector_store = FAISSVectorStore.load(latest_index)
 
     hybrid_recommender = HybridRecommender(
@@ -57,7 +62,7 @@ def main():
     def hybrid_recommend(user_id: str, top_k: int):
         return hybrid_recommender.recommend(user_id, top_k=top_k)
 
-    evaluation_results = evaluator.evaluate(hybrid_recommend, k_values=[5, 10, 20])
+    evaluation_results = evaluator.evaluate(hybrid_recommend, k_values=K_VALUES)
 
     report = {
         "timestamp": datetime.now().isoformat(),
@@ -73,8 +78,7 @@ def main():
     report_file = f"data/reports/production_evaluation_{datetime.now().strftime('%Y%m%d')}.json"
     
     logger.info("Saving production evaluation report", file=report_file)
-    with open(report_file, "w") as f:
-        json.dump(report, f, indent=2, default=str)
+    write_json_report(report_file, report)
 
     logger.info("Production evaluation completed", report=report)
 
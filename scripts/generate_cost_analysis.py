@@ -2,12 +2,14 @@
 import sys
 import os
 import json
-import csv
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+import pandas as pd
+
 from src.config.settings import settings
 from src.infrastructure.logging import setup_logging, get_logger
 
@@ -38,11 +40,19 @@ COSTS = {
 }
 
 
+def estimate_tokens_for_length(text_length: int) -> int:
+    """Estimate token count from a character count (1 token ≈ 4 characters)."""
+    return text_length // 4
+
+
 def estimate_embedding_tokens(text: str) -> int:
     """Estimate token count (rough approximation: 1 token ≈ 4 characters)."""
-    return len(text) // 4
+    return estimate_tokens_for_length(len(text))
 
 
+# Scenario sweeps call the cost functions with repeated parameter sets; the cached
+# dictionaries are only read (spread into new result rows), never mutated.
+@lru_cache(maxsize=4096)
 def calculate_openai_costs(
     embedding_requests: int = 0,
     avg_text_length: int = 100,
@@ -60,7 +70,7 @@ def calculate_openai_costs(
     Returns:
         Dictionary with cost breakdown
     """
-    embedding_tokens = embedding_requests * estimate_embedding_tokens(" " * avg_text_length)
+    embedding_tokens = embedding_requests * estimate_tokens_for_length(avg_text_length)
     embedding_cost = (embedding_tokens / 1000) * COSTS["openai"]["embedding_text_embedding_3_large"]
     
     completion_tokens = completion_requests * avg_completion_tokens
@@ -77,6 +87,7 @@ def calculate_openai_costs(
     }
 
 
+@lru_cache(maxsize=4096)
 def calculate_aws_costs(
     s3_storage_gb: float = 1.0,
     s3_requests: int = 1000,
@@ -150,6 +161,74 @@ def calculate_aws_costs(
     }
 
 
+# Scenario keys passed to each cost function, with the value used when a scenario omits them
+OPENAI_SCENARIO_DEFAULTS = {
+    "embedding_requests": 0,
+    "completion_requests": 0,
+}
+AWS_SCENARIO_DEFAULTS = {
+    "s3_storage_gb": 1.0,
+    "s3_requests": 1000,
+    "s3_transfer_gb": 0.1,
+    "ecs_vcpu": 1.0,
+    "ecs_memory_gb": 2.0,
+    "ecs_hours": 730,
+    "cloudwatch_logs_gb": 1.0,
+    "cloudwatch_storage_gb": 1.0,
+    "alb_lcu_hours": 100,
+}
+
+# Above this many scenarios the cost formulas are evaluated once over column arrays
+VECTORIZED_MIN_SCENARIOS = 64
+
+
+def _scenario_params(scenario: Dict[str, any], defaults: Dict[str, any]) -> Dict[str, any]:
+    return {key: scenario.get(key, default) for key, default in defaults.items()}
+
+
+def _calculate_scenario_costs_vectorized(scenarios: List[Dict[str, any]]) -> pd.DataFrame:
+    """Evaluate the cost formulas for many scenarios at once.
+    
+    The formulas in calculate_openai_costs/calculate_aws_costs are plain
+    arithmetic, so their uncached versions are called with one pandas column
+    per parameter instead of once per scenario.
+    
+    Args:
+        scenarios: List of scenario dictionaries with parameters
+        
+    Returns:
+        DataFrame with one row per scenario and the same columns as the scalar path
+    """
+    params = pd.DataFrame(scenarios)
+    
+    def column(key: str, default: any) -> pd.Series:
+        if key not in params:
+            return pd.Series(default, index=params.index)
+        values = params[key].fillna(default)
+        # Missing entries turn integer counts into floats; restore them when possible
+        if isinstance(default, int) and (values % 1 == 0).all():
+            values = values.astype("int64")
+        return values
+    
+    def columns(defaults: Dict[str, any]) -> Dict[str, pd.Series]:
+        return {key: column(key, default) for key, default in defaults.items()}
+    
+    openai_costs = calculate_openai_costs.__wrapped__(**columns(OPENAI_SCENARIO_DEFAULTS))
+    aws_costs = calculate_aws_costs.__wrapped__(**columns(AWS_SCENARIO_DEFAULTS))
+    
+    results_df = pd.DataFrame({
+        "scenario": params["name"],
+        "description": params["description"].fillna("") if "description" in params else "",
+        "generated_at": datetime.now().isoformat(),
+        **openai_costs,
+        **aws_costs,
+    })
+    results_df["total_cost_usd"] = (
+        results_df["total_openai_cost_usd"] + results_df["total_aws_cost_usd"]
+    ).round(2)
+    return results_df
+
+
 def generate_cost_analysis(
     scenarios: List[Dict[str, any]] = None,
     output_json: str = "data/reports/cost_analysis.json",
@@ -222,36 +301,29 @@ def generate_cost_analysis(
     
     os.makedirs(os.path.dirname(output_json), exist_ok=True)
     
-    results = []
-    for scenario in scenarios:
-        openai_costs = calculate_openai_costs(
-            embedding_requests=scenario.get("embedding_requests", 0),
-            completion_requests=scenario.get("completion_requests", 0),
-        )
-        
-        aws_costs = calculate_aws_costs(
-            s3_storage_gb=scenario.get("s3_storage_gb", 1.0),
-            s3_requests=scenario.get("s3_requests", 1000),
-            s3_transfer_gb=scenario.get("s3_transfer_gb", 0.1),
-            ecs_vcpu=scenario.get("ecs_vcpu", 1.0),
-            ecs_memory_gb=scenario.get("ecs_memory_gb", 2.0),
-            ecs_hours=scenario.get("ecs_hours", 730),
-            cloudwatch_logs_gb=scenario.get("cloudwatch_logs_gb", 1.0),
-            cloudwatch_storage_gb=scenario.get("cloudwatch_storage_gb", 1.0),
-            alb_lcu_hours=scenario.get("alb_lcu_hours", 100),
-        )
-        
-        total_cost = openai_costs["total_openai_cost_usd"] + aws_costs["total_aws_cost_usd"]
+    if len(scenarios) > VECTORIZED_MIN_SCENARIOS:
+        results_df = _calculate_scenario_costs_vectorized(scenarios)
+        results = results_df.to_dict("records")
+    else:
+        results = []
+        for scenario in scenarios:
+            openai_costs = calculate_openai_costs(**_scenario_params(scenario, OPENAI_SCENARIO_DEFAULTS))
+            aws_costs = calculate_aws_costs(**_scenario_params(scenario, AWS_SCENARIO_DEFAULTS))
+            
+            total_cost = openai_costs["total_openai_cost_usd"] + aws_costs["total_aws_cost_usd"]
+            
+            result = {
+                "scenario": scenario["name"],
+                "description": scenario.get("description", ""),
+                "generated_at": datetime.now().isoformat(),
+                **openai_costs,
+                **aws_costs,
+                "total_cost_usd": round(total_cost, 2),
+            }
+            results.append(result)
         
-        result = {
-            "scenario": scenario["name"],
-            "description": scenario.get("description", ""),
-            "generated_at": datetime.now().isoformat(),
-            **openai_costs,
-            **aws_costs,
-            "total_cost_usd": round(total_cost, 2),
-        }
-        results.append(result)
+        results_df = pd.DataFrame(results)
+    totals = results_df["total_cost_usd"]
     
     # Save JSON
     report = {
@@ -259,9 +331,9 @@ def generate_cost_analysis(
         "cost_constants": COSTS,
         "scenarios": results,
         "summary": {
-            "min_cost": min(r["total_cost_usd"] for r in results),
-            "max_cost": max(r["total_cost_usd"] for r in results),
-            "avg_cost": sum(r["total_cost_usd"] for r in results) / len(results),
+            "min_cost": float(totals.min()),
+            "max_cost": float(totals.max()),
+            "avg_cost": float(totals.mean()),
         },
     }
     
@@ -272,18 +344,14 @@ def generate_cost_analysis(
     
     # Save CSV
     if results:
-        fieldnames = list(results[0].keys())
-        with open(output_csv, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(results)
+        results_df.to_csv(output_csv, index=False)
         
         logger.info("Cost analysis CSV saved", file=output_csv)
     
     print(f"\nCost Analysis Summary:")
     print(f"Scenarios analyzed: {len(results)}")
-    print(f"Min cost: ${min(r['total_cost_usd'] for r in results):.2f}/month")
-    print(f"Max cost: ${max(r['total_cost_usd'] for r in results):.2f}/month")
+    print(f"Min cost: ${report['summary']['min_cost']:.2f}/month")
+    print(f"Max cost: ${report['summary']['max_cost']:.2f}/month")
     print(f"Reports saved to: {output_json} and {output_csv}")
 
 
@@ -9,7 +9,12 @@ import pandas as pd
 import numpy as np
 
 from src.data.ingestion import load_from_local
-from src.models.embeddings import generate_embeddings, save_embeddings
+from src.models.embeddings import (
+    EMBEDDING_CACHE_PATH,
+    EmbeddingCache,
+    generate_embeddings,
+    save_embeddings,
+)
 from src.services.vector_store import FAISSVectorStore
 from src.config.settings import settings
 from src.infrastructure.logging import setup_logging, get_logger
@@ -35,10 +40,12 @@ def main():
     else:
         products_df = load_from_local(products_file)
 
-    products = products_df.to_dict("records")
-
-    logger.info("Generating embeddings", product_count=len(products))
-    embeddings = generate_embeddings(products, batch_size=100)
+    logger.info("Generating embeddings", product_count=len(products_df))
+    embedding_cache = EmbeddingCache(EMBEDDING_CACHE_PATH)
+    try:
+        embeddings = generate_embeddings(products_df, batch_size=100, cache=embedding_cache)
+    finally:
+        embedding_cache.close()
 
     version = datetime.now().strftime("%Y%m%d")
     embeddings_file = f"data/artifacts/embeddings_{version}.npy"
@@ -46,7 +53,7 @@ def main():
         "model_id": settings.openai_model_id,
         "dimension": settings.openai_embedding_dimension,
         "date": version,
-        "product_count": len(products),
+        "product_count": len(products_df),
     }
 
     logger.info("Saving embeddings", file=embeddings_file)
@@ -57,12 +64,15 @@ def main():
     vector_store = FAISSVectorStore(
         dimension=settings.openai_embedding_dimension,
         index_type=settings.faiss_index_type,
+        index_factory=settings.faiss_index_factory,
+        nprobe=settings.faiss_nprobe,
+        quantization=settings.faiss_quantization,
     )
 
-    product_ids = [p["product_id"] for p in products]
+    product_ids = products_df["product_id"].tolist()
     vector_store.add_embeddings(product_ids, embeddings)
 
-    index_file = f"data/artifacts/faiss_index_{version}.pkl"
+    index_file = f"data/artifacts/faiss_index_{version}.faiss"
     logger.info("Saving FAISS index", file=index_file)
     vector_store.save(index_file)
 
@@ -4,15 +4,15 @@ import argparse
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from src.data.ingestion import load_from_local, load_from_s3, save_to_local, save_to_s3
-from src.data.validation import validate_transactions, get_data_quality_report
-from src.data.transformation import clean_data
 from src.config.settings import settings
 from src.infrastructure.logging import setup_logging, get_logger
 
 setup_logging()
 logger = get_logger(__name__)
 
+# Rows validated and cleaned per batch while streaming the raw transactions
+INGEST_BATCH_ROWS = 1 << 16
+
 
 def main(source: str = "s3", output_location: str = "local"):
     """
@@ -22,6 +22,11 @@ def main(source: str = "s3", output_location: str = "local"):
         source: Source of data - "s3" or "local" (default: "s3")
         output_location: Where to save processed data - "s3" or "local" (default: "local")
     """
+    # pandas/boto3 are only imported once the pipeline runs, so --help stays fast
+    from src.data.ingestion import iter_local_csv_batches, load_from_s3, save_to_local, save_to_s3
+    from src.data.validation import get_data_quality_report
+    from src.data.transformation import validate_and_clean_batches
+
     logger.info("Starting data ingestion pipeline", source=source, output_location=output_location)
 
     input_file = "transactions.csv"
@@ -29,30 +34,34 @@ def main(source: str = "s3", output_location: str = "local"):
     output_file = "data/processed/ratings.parquet"
     s3_output_key = f"{settings.s3_prefix}/processed/ratings.parquet"
 
-    # Load data from S3 or local
+    # Load data from S3 or local. Local files are streamed in batches; an S3
+    # object is already in memory and is sliced into batches of the same size.
+    batches = None
     if source == "s3":
         logger.info("Loading data from S3", s3_key=s3_key, bucket=settings.s3_bucket)
         try:
             df = load_from_s3(s3_key)
             logger.info("Data loaded from S3", rows=len(df))
+            batches = (
+                df.iloc[start:start + INGEST_BATCH_ROWS]
+                for start in range(0, len(df), INGEST_BATCH_ROWS)
+            )
         except Exception as e:
             logger.error("Failed to load from S3, falling back to local", error=str(e))
-            if os.path.exists(input_file):
-                logger.info("Loading from local fallback", input_file=input_file)
-                df = load_from_local(input_file)
-            else:
+            if not os.path.exists(input_file):
                 raise FileNotFoundError(f"Neither S3 nor local file found: {s3_key} or {input_file}")
+            logger.info("Loading from local fallback", input_file=input_file)
     else:
         logger.info("Loading data from local", input_file=input_file)
         if not os.path.exists(input_file):
             raise FileNotFoundError(f"Local file not found: {input_file}")
-        df = load_from_local(input_file)
 
-    logger.info("Validating data")
-    df = validate_transactions(df)
+    if batches is None:
+        batches = iter_local_csv_batches(input_file, batch_size=INGEST_BATCH_ROWS)
 
-    logger.info("Cleaning data")
-    df = clean_data(df)
+    # Validation and cleaning happen in one pass over the batches
+    logger.info("Validating and cleaning data")
+    df = validate_and_clean_batches(batches)
 
     logger.info("Generating quality report")
     quality_report = get_data_quality_report(df, data_type="transactions")
@@ -89,8 +98,3 @@ if __name__ == "__main__":
     args = parser.parse_args()
     
     main(source=args.source, output_location=args.output)
-
-
-if __name__ == "__main__":
-    main()
-
@@ -3,14 +3,10 @@ import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-import pandas as pd
-import numpy as np
 from datetime import datetime
 
-from src.data.ingestion import load_from_local
-from src.models.embeddings import generate_embeddings, save_embeddings, load_embeddings
-from src.services.vector_store import FAISSVectorStore
 from src.config.settings import settings
+from src.infrastructure.artifacts import find_latest_artifact
 from src.infrastructure.logging import setup_logging, get_logger
 
 setup_logging()
@@ -18,6 +14,20 @@ logger = get_logger(__name__)
 
 
 def main():
+    # Heavy imports (numpy, pandas, OpenAI, FAISS) are deferred until the script actually runs
+    import numpy as np
+    import pandas as pd
+
+    from src.data.ingestion import load_from_local
+    from src.models.embeddings import (
+        EMBEDDING_CACHE_PATH,
+        EmbeddingCache,
+        generate_embeddings,
+        save_embeddings,
+        load_embeddings,
+    )
+    from src.services.vector_store import FAISSVectorStore
+
     logger.info("Starting embeddings refresh pipeline")
 
     products_file = "products_catalog.csv"
@@ -32,15 +42,13 @@ def main():
             "description": ["Product description"] * len(unique_products),
         })
     else:
-        products_df = pd.read_csv(products_file)
+        products_df = load_from_local(products_file, dtype_backend="pyarrow")
 
     logger.info("Checking for new products")
     artifacts_dir = "data/artifacts"
-    import glob
-    embedding_files = glob.glob(f"{artifacts_dir}/embeddings_*.npy")
+    latest_embeddings_file = find_latest_artifact(artifacts_dir, "embeddings_", ".npy")
     
-    if embedding_files:
-        latest_embeddings_file = max(embedding_files)
+    if latest_embeddings_file:
         logger.info("Loading existing embeddings", file=latest_embeddings_file)
         existing_embeddings = load_embeddings(latest_embeddings_file)
         
@@ -49,33 +57,52 @@ def main():
             import json
             with open(metadata_file, "r") as f:
                 metadata = json.load(f)
-            existing_product_ids = set(metadata.get("product_ids", []))
+            existing_product_ids = np.asarray(metadata.get("product_ids", []), dtype=object)
         else:
-            existing_product_ids = set()
+            existing_product_ids = np.array([], dtype=object)
     else:
         existing_embeddings = None
-        existing_product_ids = set()
+        existing_product_ids = np.array([], dtype=object)
 
-    all_product_ids = set(products_df["product_id"].unique())
-    new_product_ids = all_product_ids - existing_product_ids
+    # Vectorized difference over the ID arrays instead of two Python hash sets
+    all_product_ids = products_df["product_id"].unique()
+    new_product_ids = np.setdiff1d(all_product_ids, existing_product_ids, assume_unique=True)
 
-    if not new_product_ids:
+    if len(new_product_ids) == 0:
         logger.info("No new products found, embeddings are up to date")
         return
 
     logger.info("Found new products", count=len(new_product_ids))
-    new_products = products_df[products_df["product_id"].isin(new_product_ids)].to_dict("records")
+    # Take new rows in new_product_ids order so embeddings and IDs stay aligned
+    new_products = (
+        products_df.drop_duplicates("product_id")
+        .set_index("product_id")
+        .loc[new_product_ids]
+        .reset_index()
+    )
 
     logger.info("Generating embeddings for new products", count=len(new_products))
-    new_embeddings = generate_embeddings(new_products, batch_size=100)
+    embedding_cache = EmbeddingCache(EMBEDDING_CACHE_PATH)
+    try:
+        new_embeddings = generate_embeddings(new_products, batch_size=100, cache=embedding_cache)
+    finally:
+        embedding_cache.close()
 
     if existing_embeddings is not None:
         logger.info("Combining with existing embeddings")
-        all_embeddings = np.vstack([existing_embeddings, new_embeddings])
-        all_product_ids_list = list(existing_product_ids) + list(new_product_ids)
+        # Fill one preallocated buffer in the stored dtype; the existing rows are
+        # copied straight out of the memory-mapped file
+        n_existing = len(existing_embeddings)
+        all_embeddings = np.empty(
+            (n_existing + len(new_embeddings), existing_embeddings.shape[1]),
+            dtype=existing_embeddings.dtype,
+        )
+        all_embeddings[:n_existing] = existing_embeddings
+        all_embeddings[n_existing:] = new_embeddings
+        all_product_ids_list = existing_product_ids.tolist() + new_product_ids.tolist()
     else:
         all_embeddings = new_embeddings
-        all_product_ids_list = list(new_product_ids)
+        all_product_ids_list = new_product_ids.tolist()
 
     version = datetime.now().strftime("%Y%m%d")
     embeddings_file = f"{artifacts_dir}/embeddings_{version}.npy"
@@ -96,10 +123,13 @@ def main():
     vector_store = FAISSVectorStore(
         dimension=settings.openai_embedding_dimension,
         index_type=settings.faiss_index_type,
+        index_factory=settings.faiss_index_factory,
+        nprobe=settings.faiss_nprobe,
+        quantization=settings.faiss_quantization,
     )
     vector_store.add_embeddings(all_product_ids_list, all_embeddings)
 
-    index_file = f"{artifacts_dir}/faiss_index_{version}.pkl"
+    index_file = f"{artifacts_dir}/faiss_index_{version}.faiss"
     logger.info("Saving updated FAISS index", file=index_file)
     vector_store.save(index_file)
 
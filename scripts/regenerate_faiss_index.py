@@ -1,16 +1,11 @@
 import sys
 import os
-import glob
 import json
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-import numpy as np
-import pandas as pd
-from src.services.vector_store import FAISSVectorStore
-from src.models.embeddings import load_embeddings
-from src.data.ingestion import load_from_local
 from src.config.settings import settings
+from src.infrastructure.artifacts import find_latest_artifact
 from src.infrastructure.logging import setup_logging, get_logger
 
 setup_logging()
@@ -18,20 +13,25 @@ logger = get_logger(__name__)
 
 
 def main():
+    # Heavy imports (numpy, pandas, FAISS) are deferred until the script actually runs
+    from src.services.vector_store import FAISSVectorStore
+    from src.models.embeddings import load_embeddings
+    from src.data.ingestion import load_from_local
+
     logger.info("Regenerating FAISS index for current architecture")
 
     # Find latest embeddings file
-    embeddings_files = glob.glob("data/artifacts/embeddings_*.npy")
-    if not embeddings_files:
+    embeddings_file = find_latest_artifact("data/artifacts", "embeddings_", ".npy")
+    if not embeddings_file:
         logger.error("No embeddings files found")
         return
     
-    embeddings_file = max(embeddings_files)
     logger.info("Using embeddings file", file=embeddings_file)
 
     # Load embeddings
     logger.info("Loading embeddings", file=embeddings_file)
-    embeddings = load_embeddings(embeddings_file)
+    # Memory-mapped, so rows are paged in as FAISS consumes them
+    embeddings = load_embeddings(embeddings_file, mmap_mode="r")
 
     # Try to get product_ids from metadata or products catalog
     product_ids = None
@@ -77,6 +77,9 @@ def main():
     vector_store = FAISSVectorStore(
         dimension=embeddings.shape[1],
         index_type=settings.faiss_index_type,
+        index_factory=settings.faiss_index_factory,
+        nprobe=settings.faiss_nprobe,
+        quantization=settings.faiss_quantization,
     )
 
     logger.info("Adding embeddings to index")
@@ -84,18 +87,20 @@ def main():
 
     # Use same version as embeddings file
     version = os.path.basename(embeddings_file).replace("embeddings_", "").replace(".npy", "")
-    output_file = f"data/artifacts/faiss_index_{version}.pkl"
+    output_file = f"data/artifacts/faiss_index_{version}.faiss"
     logger.info("Saving index", file=output_file)
     vector_store.save(output_file)
 
-    # Verify the saved index
+    # Verify the saved index from the in-memory store and the written file's size,
+    # instead of deserializing the whole index again
     logger.info("Verifying saved index")
-    loaded_store = FAISSVectorStore.load(output_file)
-    try:
-        total = loaded_store.index.ntotal if hasattr(loaded_store.index, 'ntotal') else len(loaded_store.product_ids)
-    except:
-        total = len(loaded_store.product_ids)
-    logger.info("Index verified", total_vectors=total, product_ids_count=len(loaded_store.product_ids))
+    total = vector_store.index.ntotal if hasattr(vector_store.index, 'ntotal') else len(vector_store.product_ids)
+    logger.info(
+        "Index verified",
+        total_vectors=total,
+        product_ids_count=len(vector_store.product_ids),
+        bytes=os.path.getsize(output_file),
+    )
 
     logger.info("Index regenerated successfully", file=output_file)
 
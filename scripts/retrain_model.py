@@ -4,12 +4,14 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from src.data.ingestion import load_from_local
 from src.data.splitting import temporal_split
 from src.data.catalog import UserCatalog, ProductCatalog
 from src.models.collaborative import CollaborativeFilter
+from src.config.constants import RATINGS_COLUMNS
 from src.infrastructure.logging import setup_logging, get_logger
 
 setup_logging()
@@ -20,7 +22,9 @@ def main():
     logger.info("Starting model retraining pipeline")
 
     logger.info("Loading latest processed data")
-    df = load_from_local("data/processed/ratings.parquet")
+    # Only the columns the catalogs and model read are loaded, so the splits never
+    # gather unused columns
+    df = load_from_local("data/processed/ratings.parquet", columns=RATINGS_COLUMNS)
 
     logger.info("Splitting data")
     train_df, val_df, test_df = temporal_split(df)
@@ -30,7 +34,7 @@ def main():
 
     products_file = "products_catalog.csv"
     if os.path.exists(products_file):
-        products_df = pd.read_csv(products_file)
+        products_df = load_from_local(products_file, dtype_backend="pyarrow")
     else:
         logger.warning("Products catalog not found, creating from transactions")
         unique_products = train_df["product_id"].unique()
@@ -47,23 +51,34 @@ def main():
     artifacts_dir = "data/artifacts"
     os.makedirs(artifacts_dir, exist_ok=True)
 
-    logger.info("Saving updated catalogs", version=version)
-    user_catalog.save(f"{artifacts_dir}/user_catalog_{version}.json")
-    product_catalog.save(f"{artifacts_dir}/product_catalog_{version}.json")
+    model_path = f"{artifacts_dir}/collaborative_model_{version}.pkl"
 
-    logger.info("Training new collaborative filter", version=version)
-    collaborative_model = CollaborativeFilter(factors=50, iterations=15, regularization=0.1)
-    collaborative_model.fit(train_df)
+    # The artifact writes are independent, so the catalogs are written in the
+    # background while the model trains and all saves are awaited together
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        logger.info("Saving updated catalogs", version=version)
+        save_futures = [
+            executor.submit(user_catalog.save, f"{artifacts_dir}/user_catalog_{version}.json"),
+            executor.submit(product_catalog.save, f"{artifacts_dir}/product_catalog_{version}.json"),
+        ]
 
-    model_path = f"{artifacts_dir}/collaborative_model_{version}.pkl"
-    logger.info("Saving new model", path=model_path)
-    collaborative_model.save(model_path)
+        logger.info("Training new collaborative filter", version=version)
+        collaborative_model = CollaborativeFilter(factors=50, iterations=15, regularization=0.1)
+        collaborative_model.fit(train_df)
+
+        logger.info("Saving new model", path=model_path)
+        save_futures.append(executor.submit(collaborative_model.save, model_path))
+
+        for future in save_futures:
+            future.result()
 
     logger.info("Creating symlink to latest model")
     latest_path = f"{artifacts_dir}/collaborative_model.pkl"
-    if os.path.exists(latest_path):
-        os.remove(latest_path)
-    os.symlink(os.path.basename(model_path), latest_path)
+    # Build the new link under a temporary name and rename it over the old one, so
+    # readers always see either the previous or the new model, never a missing file
+    tmp_link_path = f"{latest_path}.{os.getpid()}.tmp"
+    os.symlink(os.path.basename(model_path), tmp_link_path)
+    os.replace(tmp_link_path, latest_path)
 
     logger.info("Model retraining pipeline completed", version=version, model_path=model_path)
 
@@ -3,6 +3,7 @@ import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+import numpy as np
 import pandas as pd
 
 from src.data.ingestion import load_from_local
@@ -11,7 +12,9 @@ from src.data.catalog import UserCatalog, ProductCatalog
 from src.models.collaborative import CollaborativeFilter
 from src.models.hybrid import HybridRecommender
 from src.services.vector_store import FAISSVectorStore
+from src.config.constants import RATINGS_COLUMNS
 from src.config.settings import settings
+from src.infrastructure.artifacts import find_latest_index
 from src.infrastructure.logging import setup_logging, get_logger
 
 setup_logging()
@@ -22,7 +25,7 @@ def main():
     logger.info("Starting training pipeline")
 
     logger.info("Loading processed data")
-    df = load_from_local("data/processed/ratings.parquet")
+    df = load_from_local("data/processed/ratings.parquet", columns=RATINGS_COLUMNS)
 
     logger.info("Splitting data")
     train_df, val_df, test_df = temporal_split(df)
@@ -34,15 +37,18 @@ def main():
     
     products_file = "products_catalog.csv"
     if os.path.exists(products_file):
-        products_df = pd.read_csv(products_file)
+        products_df = load_from_local(products_file, dtype_backend="pyarrow")
     else:
         logger.warning("Products catalog not found, creating from transactions")
         unique_products = train_df["product_id"].unique()
+        # Constant columns are single-category Categoricals over a shared int8 code
+        # array instead of one Python string reference per product
+        placeholder_codes = np.zeros(len(unique_products), dtype=np.int8)
         products_df = pd.DataFrame({
             "product_id": unique_products,
-            "category": ["unknown"] * len(unique_products),
+            "category": pd.Categorical.from_codes(placeholder_codes, categories=["unknown"]),
             "name": unique_products,
-            "description": ["Product description"] * len(unique_products),
+            "description": pd.Categorical.from_codes(placeholder_codes, categories=["Product description"]),
         })
     
     product_catalog = ProductCatalog(train_df, products_df)
@@ -60,16 +66,17 @@ def main():
     collaborative_model.save("data/artifacts/collaborative_model.pkl")
 
     logger.info("Loading vector store")
-    import glob
-    index_files = glob.glob("data/artifacts/faiss_index_*.pkl")
-    if index_files:
-        latest_index = max(index_files)
+    latest_index = find_latest_index("data/artifacts")
+    if latest_index:
         vector_store = FAISSVectorStore.load(latest_index)
     else:
         logger.warning("No FAISS index found, creating empty store")
         vector_store = FAISSVectorStore(
             dimension=settings.openai_embedding_dimension,
             index_type=settings.faiss_index_type,
+            index_factory=settings.faiss_index_factory,
+            nprobe=settings.faiss_nprobe,
+            quantization=settings.faiss_quantization,
         )
 
     logger.info("Creating hybrid recommender")
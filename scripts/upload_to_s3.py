@@ -1,7 +1,7 @@
+import io
 import sys
 import os
-import glob
-import boto3
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 sys.path.insert(
@@ -10,7 +10,22 @@ sys.path.insert(
 
 from src.data.ingestion import load_from_local, save_to_s3  # noqa: E402
 from src.config.settings import settings  # noqa: E402
+from src.infrastructure.artifacts import (  # noqa: E402
+    CATALOG_ARTIFACTS,
+    COMPRESSED_CATALOG_SUFFIX,
+    FAISS_INDEX_SUFFIX,
+    compress_catalog,
+    find_latest_artifact,
+    find_latest_index,
+    index_sidecar_paths,
+    list_artifact_names,
+)
 from src.infrastructure.logging import setup_logging, get_logger  # noqa: E402
+from src.infrastructure.s3 import (  # noqa: E402
+    MAX_TRANSFER_WORKERS,
+    get_s3_client,
+    get_transfer_config,
+)
 
 setup_logging()
 logger = get_logger(__name__)
@@ -42,12 +57,7 @@ def upload_artifacts_to_s3():
         logger.error("Artifacts directory not found", dir=artifacts_dir)
         return
 
-    s3_client = boto3.client(
-        "s3",
-        region_name=settings.aws_region,
-        aws_access_key_id=settings.aws_access_key_id,
-        aws_secret_access_key=settings.aws_secret_access_key,
-    )
+    s3_client = get_s3_client()
 
     version = datetime.now().strftime("%Y%m%d")
 
@@ -60,37 +70,73 @@ def upload_artifacts_to_s3():
         ("product_catalog.json", f"catalogs/{version}/product_catalog.json"),
     ]
 
-    embedding_files = glob.glob(f"{artifacts_dir}/embeddings_*.npy")
-    if embedding_files:
-        latest_embedding = max(embedding_files)
+    # One directory scan serves the latest-version lookups and the existence checks
+    artifact_names = list_artifact_names(artifacts_dir)
+
+    latest_embedding = find_latest_artifact(
+        artifacts_dir, "embeddings_", ".npy", names=artifact_names
+    )
+    if latest_embedding:
         embedding_name = os.path.basename(latest_embedding)
         files_to_upload.append(
             (embedding_name, f"embeddings/{version}/{embedding_name}")
         )
 
-    index_files = glob.glob(f"{artifacts_dir}/faiss_index_*.pkl")
-    if index_files:
-        latest_index = max(index_files)
-        index_name = os.path.basename(latest_index)
-        files_to_upload.append(
-            (index_name, f"indices/{version}/{index_name}")
-        )
+    latest_index = find_latest_index(artifacts_dir, names=artifact_names)
+    if latest_index:
+        index_files = [latest_index]
+        if latest_index.endswith(FAISS_INDEX_SUFFIX):
+            index_files.extend(index_sidecar_paths(latest_index))
+        for index_file in index_files:
+            index_name = os.path.basename(index_file)
+            files_to_upload.append(
+                (index_name, f"indices/{version}/{index_name}")
+            )
 
+    uploads = []
     for local_file, s3_key in files_to_upload:
         local_path = os.path.join(artifacts_dir, local_file)
-        if os.path.exists(local_path):
-            full_s3_key = f"{settings.s3_prefix}/{s3_key}"
+        if local_file in artifact_names:
+            uploads.append((local_path, f"{settings.s3_prefix}/{s3_key}"))
+        else:
+            logger.warning("File not found, skipping", file=local_path)
+
+    def upload_artifact(local_path: str, full_s3_key: str) -> None:
+        if os.path.basename(local_path) in CATALOG_ARTIFACTS:
+            # Catalog JSON compresses well, so it is uploaded gzip-compressed
+            full_s3_key += COMPRESSED_CATALOG_SUFFIX
             logger.info(
-                "Uploading artifact",
+                "Uploading compressed catalog",
                 local=local_path,
                 s3_key=full_s3_key
             )
-            s3_client.upload_file(
-                local_path, settings.s3_bucket, full_s3_key
+            s3_client.upload_fileobj(
+                io.BytesIO(compress_catalog(local_path)), settings.s3_bucket, full_s3_key,
+                ExtraArgs={"ContentType": "application/json", "ContentEncoding": "gzip"},
+                Config=get_transfer_config(),
             )
             logger.info("Artifact uploaded", s3_key=full_s3_key)
-        else:
-            logger.warning("File not found, skipping", file=local_path)
+            return
+
+        logger.info(
+            "Uploading artifact",
+            local=local_path,
+            s3_key=full_s3_key
+        )
+        s3_client.upload_file(
+            local_path, settings.s3_bucket, full_s3_key,
+            Config=get_transfer_config(),
+        )
+        logger.info("Artifact uploaded", s3_key=full_s3_key)
+
+    # boto3 clients are thread-safe, so all workers share the same connection pool
+    with ThreadPoolExecutor(max_workers=MAX_TRANSFER_WORKERS) as executor:
+        futures = [
+            executor.submit(upload_artifact, local_path, full_s3_key)
+            for local_path, full_s3_key in uploads
+        ]
+        for future in as_completed(futures):
+            future.result()
 
     logger.info("All artifacts uploaded successfully")
 
@@ -1,8 +1,22 @@
 import os
-import boto3
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from src.config.settings import settings
+from src.infrastructure.artifacts import (
+    CATALOG_ARTIFACTS,
+    FAISS_INDEX_SUFFIX,
+    LEGACY_FAISS_INDEX_SUFFIX,
+    find_latest_index,
+    index_sidecar_paths,
+)
 from src.infrastructure.logging import get_logger
+from src.infrastructure.s3 import (
+    MAX_TRANSFER_WORKERS,
+    download_compressed_catalog,
+    find_latest_key,
+    get_s3_client,
+    get_transfer_config,
+)
 
 logger = get_logger(__name__)
 
@@ -13,19 +27,12 @@ def download_report_from_s3(filename: str) -> None:
     Args:
         filename: Name of the report file (e.g., "eda_report.html")
     """
-    import boto3
     from botocore.exceptions import ClientError, NoCredentialsError
-    from src.config.settings import settings
     
     logger.info("Downloading report from S3", filename=filename, bucket=settings.s3_bucket)
     
     try:
-        s3_client = boto3.client(
-            "s3",
-            region_name=settings.aws_region,
-            aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key,
-        )
+        s3_client = get_s3_client()
         
         s3_key = f"{settings.s3_prefix}/reports/{filename}"
         local_path = f"data/reports/{filename}"
@@ -51,10 +58,7 @@ def download_artifacts_from_s3() -> None:
         logger.info("Not in production, skipping S3 download")
         return
 
-    s3_client = boto3.client(
-        "s3",
-        region_name=settings.aws_region,
-    )
+    s3_client = get_s3_client()
 
     artifacts_dir = "data/artifacts"
     os.makedirs(artifacts_dir, exist_ok=True)
@@ -65,44 +69,49 @@ def download_artifacts_from_s3() -> None:
         "product_catalog.json",
     ]
 
-    import glob
-    index_files = glob.glob(f"{artifacts_dir}/faiss_index_*.pkl")
-    if not index_files:
-        s3_client.list_objects_v2(
-            Bucket=settings.s3_bucket,
-            Prefix=f"{settings.s3_prefix}/indices/",
-        )
-        prefix = f"{settings.s3_prefix}/indices/"
-        response = s3_client.list_objects_v2(
-            Bucket=settings.s3_bucket,
-            Prefix=prefix,
+    if find_latest_index(artifacts_dir) is None:
+        latest_index_s3 = find_latest_key(
+            s3_client,
+            f"{settings.s3_prefix}/indices/",
+            FAISS_INDEX_SUFFIX,
+            LEGACY_FAISS_INDEX_SUFFIX,
         )
-        if "Contents" in response:
-            index_files_s3 = [
-                obj["Key"]
-                for obj in response["Contents"]
-                if obj["Key"].endswith(".pkl")
-            ]
-            if index_files_s3:
-                latest_index_s3 = max(index_files_s3)
-                artifacts_to_download.append(
-                    (latest_index_s3, os.path.basename(latest_index_s3))
-                )
+        if latest_index_s3:
+            index_keys = [latest_index_s3]
+            if latest_index_s3.endswith(FAISS_INDEX_SUFFIX):
+                index_keys.extend(index_sidecar_paths(latest_index_s3))
+            artifacts_to_download.extend(
+                (key, os.path.basename(key)) for key in index_keys
+            )
 
-    for artifact in artifacts_to_download:
+    def download_artifact(artifact) -> None:
         if isinstance(artifact, tuple):
-            s3_key, local_name = artifact
+            full_s3_key, local_name = artifact
         else:
-            s3_key = f"{settings.s3_prefix}/artifacts/{artifact}"
+            full_s3_key = f"{settings.s3_prefix}/artifacts/{artifact}"
             local_name = artifact
 
         local_path = os.path.join(artifacts_dir, local_name)
-        full_s3_key = f"{settings.s3_prefix}/artifacts/{artifact}" if not isinstance(artifact, tuple) else s3_key
 
         try:
             logger.info("Downloading artifact", s3_key=full_s3_key, local=local_path)
-            s3_client.download_file(settings.s3_bucket, full_s3_key, local_path)
+            if local_name in CATALOG_ARTIFACTS and download_compressed_catalog(
+                s3_client, full_s3_key, local_path
+            ):
+                logger.info("Artifact downloaded", local=local_path, compressed=True)
+                return
+            s3_client.download_file(
+                settings.s3_bucket, full_s3_key, local_path, Config=get_transfer_config()
+            )
             logger.info("Artifact downloaded", local=local_path)
         except Exception as e:
             logger.warning("Failed to download artifact", s3_key=full_s3_key, error=str(e))
 
+    # boto3 clients are thread-safe, so all workers share the same connection pool.
+    # Every artifact gets its own worker, so the small catalogs finish while the
+    # large model and index files are still transferring.
+    max_workers = min(MAX_TRANSFER_WORKERS, len(artifacts_to_download))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(download_artifact, artifact) for artifact in artifacts_to_download]
+        for future in as_completed(futures):
+            future.result()
@@ -1,21 +1,50 @@
+import asyncio
+import os
 from contextlib import asynccontextmanager
+from functools import cache
+
+import faiss
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.config.settings import settings
+from src.data.catalog import UserCatalog, ProductCatalog
+from src.infrastructure.artifacts import (
+    find_latest_artifact,
+    find_latest_index,
+    list_artifact_names,
+)
 from src.infrastructure.logging import setup_logging, get_logger
-from src.api.middleware.logging import LoggingMiddleware
-from src.api.middleware.metrics import MetricsMiddleware
+from src.models.collaborative import CollaborativeFilter
+from src.models.hybrid import HybridRecommender
+from src.services.recommendation import RecommendationService
+from src.services.search import SearchService
+from src.services.vector_store import FAISSVectorStore
+from src.api.middleware.observability import ObservabilityMiddleware
 from src.api.routes import search, recommendations, health, feedback, reports
 
 logger = get_logger(__name__)
 
 
+@cache
+def _get_index_regenerator():
+    # Only needed when the stored index is empty, so the script module is imported on demand
+    from scripts.regenerate_faiss_index import main as regenerate_main
+
+    return regenerate_main
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     setup_logging()
     logger.info("Starting application", environment=settings.environment)
 
+    # Queries are parallelized by batching them (see SearchService), and each API
+    # worker process runs its own OpenMP pool, so FAISS's per-query threading only
+    # adds contention. Set here rather than in the service so offline scripts that
+    # build a SearchService keep FAISS's multi-threaded defaults.
+    faiss.omp_set_num_threads(1)
+
     try:
         from src.api.download_artifacts import download_artifacts_from_s3
         download_artifacts_from_s3()
@@ -23,29 +52,38 @@ async def lifespan(app: FastAPI):
         logger.warning("Failed to download artifacts from S3, using local", error=str(e))
 
     try:
-        from src.models.collaborative import CollaborativeFilter
-        from src.models.hybrid import HybridRecommender
-        from src.services.vector_store import FAISSVectorStore
-        from src.services.recommendation import RecommendationService
-        from src.services.search import SearchService
-        from src.data.catalog import UserCatalog, ProductCatalog
-
         logger.info("Loading models and services")
 
-        import glob
-        import os
-        
-        collaborative_model_path = "data/artifacts/collaborative_model.pkl"
-        if not os.path.exists(collaborative_model_path):
+        # Check every artifact up front so a missing one is reported before any load
+        # starts; one directory scan answers all the existence checks
+        artifacts_dir = "data/artifacts"
+        artifact_names = list_artifact_names(artifacts_dir)
+
+        collaborative_model_path = os.path.join(artifacts_dir, "collaborative_model.pkl")
+        if "collaborative_model.pkl" not in artifact_names:
             raise FileNotFoundError(f"Collaborative model not found: {collaborative_model_path}")
-        collaborative_model = CollaborativeFilter.load(collaborative_model_path)
-        
-        index_files = glob.glob("data/artifacts/faiss_index_*.pkl")
-        if not index_files:
+
+        latest_index = find_latest_index(artifacts_dir, names=artifact_names)
+        if latest_index is None:
             raise FileNotFoundError("No FAISS index found")
-        latest_index = max(index_files)
-        vector_store = FAISSVectorStore.load(latest_index)
-        
+
+        user_catalog_path = os.path.join(artifacts_dir, "user_catalog.json")
+        if "user_catalog.json" not in artifact_names:
+            raise FileNotFoundError(f"User catalog not found: {user_catalog_path}")
+
+        product_catalog_path = os.path.join(artifacts_dir, "product_catalog.json")
+        if "product_catalog.json" not in artifact_names:
+            raise FileNotFoundError(f"Product catalog not found: {product_catalog_path}")
+
+        # The artifacts are independent, so their disk reads and deserialization
+        # overlap on worker threads
+        collaborative_model, vector_store, user_catalog, product_catalog = await asyncio.gather(
+            asyncio.to_thread(CollaborativeFilter.load, collaborative_model_path),
+            asyncio.to_thread(FAISSVectorStore.load, latest_index),
+            asyncio.to_thread(UserCatalog.load, user_catalog_path),
+            asyncio.to_thread(ProductCatalog.load, product_catalog_path),
+        )
+
         # Verify vector store is not empty, regenerate if needed
         try:
             total_vectors = vector_store.index.ntotal if hasattr(vector_store.index, 'ntotal') else len(vector_store.product_ids)
@@ -56,16 +94,13 @@ async def lifespan(app: FastAPI):
             logger.warning("Vector store is empty, attempting to regenerate from embeddings")
             try:
                 # Try to regenerate from embeddings
-                embeddings_files = glob.glob("data/artifacts/embeddings_*.npy")
-                if embeddings_files:
-                    latest_embeddings = max(embeddings_files)
+                latest_embeddings = find_latest_artifact("data/artifacts", "embeddings_", ".npy")
+                if latest_embeddings:
                     logger.info("Regenerating index from embeddings", file=latest_embeddings)
-                    from scripts.regenerate_faiss_index import main as regenerate_main
-                    regenerate_main()
+                    _get_index_regenerator()()
                     # Reload
-                    index_files = glob.glob("data/artifacts/faiss_index_*.pkl")
-                    if index_files:
-                        latest_index = max(index_files)
+                    latest_index = find_latest_index("data/artifacts")
+                    if latest_index:
                         vector_store = FAISSVectorStore.load(latest_index)
                         logger.info("Vector store regenerated successfully")
                 else:
@@ -73,16 +108,9 @@ async def lifespan(app: FastAPI):
             except Exception as e:
                 logger.error("Failed to regenerate vector store", error=str(e))
                 raise
-        
-        user_catalog_path = "data/artifacts/user_catalog.json"
-        if not os.path.exists(user_catalog_path):
-            raise FileNotFoundError(f"User catalog not found: {user_catalog_path}")
-        user_catalog = UserCatalog.load(user_catalog_path)
-        
-        product_catalog_path = "data/artifacts/product_catalog.json"
-        if not os.path.exists(product_catalog_path):
-            raise FileNotFoundError(f"Product catalog not found: {product_catalog_path}")
-        product_catalog = ProductCatalog.load(product_catalog_path)
+
+        if settings.faiss_use_gpu:
+            vector_store.to_gpu()
 
         hybrid_recommender = HybridRecommender(
             collaborative_model=collaborative_model,
@@ -116,9 +144,16 @@ async def lifespan(app: FastAPI):
         logger.error("Error loading models", error=str(e))
         raise
 
+    # Readiness is fixed once startup finishes, so /health serves this snapshot
+    app.state.health_snapshot = health.build_health_snapshot(app.state)
+
+    feedback_worker = feedback.start_feedback_worker()
+
     yield
 
     logger.info("Shutting down application")
+    await feedback.stop_feedback_worker(feedback_worker)
+    reports.shutdown_report_pool()
 
 
 app = FastAPI(
@@ -136,8 +171,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.add_middleware(LoggingMiddleware)
-app.add_middleware(MetricsMiddleware)
+app.add_middleware(ObservabilityMiddleware)
 
 app.include_router(search.router)
 app.include_router(recommendations.router)
@@ -1,55 +0,0 @@
-import time
-import uuid
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
-
-from src.infrastructure.logging import get_logger
-
-logger = get_logger(__name__)
-
-
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
-
-        start_time = time.time()
-
-        logger.info(
-            "Request started",
-            request_id=request_id,
-            method=request.method,
-            path=request.url.path,
-            client_ip=request.client.host if request.client else None,
-        )
-
-        try:
-            response = await call_next(request)
-            process_time = time.time() - start_time
-
-            logger.info(
-                "Request completed",
-                request_id=request_id,
-                method=request.method,
-                path=request.url.path,
-                status_code=response.status_code,
-                process_time_ms=process_time * 1000,
-            )
-
-            response.headers["X-Request-ID"] = request_id
-            return response
-
-        except Exception as e:
-            process_time = time.time() - start_time
-            logger.error(
-                "Request failed",
-                request_id=request_id,
-                method=request.method,
-                path=request.url.path,
-                error=str(e),
-                process_time_ms=process_time * 1000,
-            )
-            raise
-
@@ -0,0 +1,129 @@
+import itertools
+import os
+import time
+from functools import lru_cache
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infrastructure.metrics import (
+    http_requests_total,
+    http_request_duration_seconds,
+    http_errors_total,
+)
+from src.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Request IDs are a timestamp, a per-process counter and a random per-process node
+# tag, so they stay unique across workers without an os.urandom call per request
+_request_counter = itertools.count()
+_NODE_ID = os.urandom(4).hex()
+
+UNMATCHED_ENDPOINT = "unmatched"
+
+
+def _new_request_id() -> str:
+    return f"{time.time_ns():016x}{next(_request_counter) & 0xFFFFFFFF:08x}{_NODE_ID}"
+
+
+# Bound metric children are cached per label combination, so labels() only resolves
+# each (method, endpoint, ...) tuple once
+@lru_cache(maxsize=1024)
+def _requests_child(method: str, endpoint: str, status_code: int):
+    return http_requests_total.labels(method=method, endpoint=endpoint, status_code=status_code)
+
+
+@lru_cache(maxsize=1024)
+def _duration_child(method: str, endpoint: str):
+    return http_request_duration_seconds.labels(method=method, endpoint=endpoint)
+
+
+@lru_cache(maxsize=1024)
+def _errors_child(method: str, endpoint: str, error_type: str):
+    return http_errors_total.labels(method=method, endpoint=endpoint, error_type=error_type)
+
+
+def _endpoint_label(scope: Scope) -> str:
+    # The router stores the matched route in the scope, so the label is the route
+    # template (/api/v1/users/{user_id}) rather than the raw path; requests that
+    # matched no route share one label
+    return getattr(scope.get("route"), "path", UNMATCHED_ENDPOINT)
+
+
+def _record_metrics(method: str, endpoint: str, status_code: int, process_time_ns: int) -> None:
+    _requests_child(method, endpoint, status_code).inc()
+    _duration_child(method, endpoint).observe(process_time_ns / 1e9)
+
+    if status_code >= 400:
+        error_type = "client_error" if status_code < 500 else "server_error"
+        _errors_child(method, endpoint, error_type).inc()
+
+
+class ObservabilityMiddleware:
+    """Pure ASGI middleware that logs each request and records its Prometheus metrics.
+
+    Request logging and metrics share one wrapper instead of two
+    BaseHTTPMiddleware layers, so responses are streamed straight through
+    rather than relayed via anyio memory streams. Every response carries an
+    X-Request-ID header, and the ID is available as request.state.request_id.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _new_request_id()
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        start_ns = time.perf_counter_ns()
+
+        logger.info(
+            "Request started",
+            request_id=request_id,
+            method=method,
+            path=path,
+            client_ip=client[0] if client else None,
+        )
+
+        status_code = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        except Exception as e:
+            process_time_ns = time.perf_counter_ns() - start_ns
+            _record_metrics(method, _endpoint_label(scope), 500, process_time_ns)
+            logger.error(
+                "Request failed",
+                request_id=request_id,
+                method=method,
+                path=path,
+                error=e,
+                process_time_ms=process_time_ns / 1e6,
+            )
+            raise
+
+        process_time_ns = time.perf_counter_ns() - start_ns
+        _record_metrics(method, _endpoint_label(scope), status_code, process_time_ns)
+        logger.info(
+            "Request completed",
+            request_id=request_id,
+            method=method,
+            path=path,
+            status_code=status_code,
+            process_time_ms=process_time_ns / 1e6,
+        )
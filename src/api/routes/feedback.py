@@ -1,3 +1,7 @@
+import asyncio
+import contextlib
+from typing import Any, Dict, Optional
+
 from fastapi import APIRouter, HTTPException
 
 from src.api.schemas.feedback import FeedbackRequest, FeedbackResponse
@@ -7,17 +11,55 @@ logger = get_logger(__name__)
 
 router = APIRouter(prefix="/api/v1", tags=["feedback"])
 
+# Pending feedback events are bounded; when the queue is full new events are dropped
+# rather than making the request wait on log emission
+FEEDBACK_QUEUE_SIZE = 10_000
+
+_feedback_queue: Optional["asyncio.Queue[Dict[str, Any]]"] = None
+
+
+async def _drain_feedback(queue: "asyncio.Queue[Dict[str, Any]]") -> None:
+    while True:
+        item = await queue.get()
+        logger.info("Feedback received", **item)
+        queue.task_done()
+
+
+def start_feedback_worker() -> asyncio.Task:
+    """Create the feedback queue and start the task that logs queued events.
+
+    Returns:
+        The background drain task, to be passed to stop_feedback_worker().
+    """
+    global _feedback_queue
+    _feedback_queue = asyncio.Queue(maxsize=FEEDBACK_QUEUE_SIZE)
+    return asyncio.create_task(_drain_feedback(_feedback_queue))
+
+
+async def stop_feedback_worker(task: asyncio.Task) -> None:
+    """Log any events still queued, then stop the drain task."""
+    global _feedback_queue
+    if _feedback_queue is not None:
+        await _feedback_queue.join()
+        _feedback_queue = None
+
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+
 
 @router.post("/feedback", response_model=FeedbackResponse)
 async def submit_feedback(request: FeedbackRequest):
     try:
-        logger.info(
-            "Feedback received",
-            user_id=request.user_id,
-            product_id=request.product_id,
-            relevant=request.relevant,
-            recommendation_id=request.recommendation_id,
-        )
+        event = request.model_dump()
+
+        if _feedback_queue is None:
+            logger.info("Feedback received", **event)
+        else:
+            try:
+                _feedback_queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.warning("Feedback queue full, dropping event", user_id=request.user_id)
 
         return FeedbackResponse(
             success=True,
@@ -25,6 +67,5 @@ async def submit_feedback(request: FeedbackRequest):
         )
 
     except Exception as e:
-        logger.error("Feedback error", error=str(e))
+        logger.error("Feedback error", error=e)
         raise HTTPException(status_code=500, detail=f"Feedback submission failed: {str(e)}")
-
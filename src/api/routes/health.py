@@ -1,3 +1,5 @@
+from typing import Any
+
 from fastapi import APIRouter
 
 from src.api.schemas.health import HealthResponse
@@ -8,30 +10,39 @@ logger = get_logger(__name__)
 router = APIRouter(prefix="/api/v1", tags=["health"])
 
 
-@router.get("/health", response_model=HealthResponse)
-async def health_check():
+def build_health_snapshot(state: Any) -> HealthResponse:
+    """Compute the health response from the application state.
+
+    Readiness only changes during startup, so the lifespan stores the result
+    as app.state.health_snapshot and /health serves it as is.
+
+    Args:
+        state: The FastAPI app.state object
+
+    Returns:
+        HealthResponse describing which components are loaded.
+    """
     checks = {
         "api": "healthy",
+        "models": "loaded" if hasattr(state, "hybrid_recommender") else "not_loaded",
+        "vector_store": "loaded" if hasattr(state, "vector_store") else "not_loaded",
     }
+    status = "healthy" if "not_loaded" not in checks.values() else "degraded"
+
+    return HealthResponse(status=status, checks=checks)
 
+
+@router.get("/health", response_model=HealthResponse)
+async def health_check():
     try:
         from src.api.main import app
 
-        if hasattr(app.state, "hybrid_recommender"):
-            checks["models"] = "loaded"
-        else:
-            checks["models"] = "not_loaded"
+        snapshot = getattr(app.state, "health_snapshot", None)
+        if snapshot is not None:
+            return snapshot
 
-        if hasattr(app.state, "vector_store"):
-            checks["vector_store"] = "loaded"
-        else:
-            checks["vector_store"] = "not_loaded"
+        return build_health_snapshot(app.state)
 
     except Exception as e:
-        logger.error("Health check error", error=str(e))
-        checks["error"] = str(e)
-
-    status = "healthy" if all(v != "not_loaded" for v in checks.values() if isinstance(v, str)) else "degraded"
-
-    return HealthResponse(status=status, checks=checks)
-
+        logger.error("Health check error", error=e)
+        return HealthResponse(status="degraded", checks={"api": "healthy", "error": str(e)})
@@ -1,3 +1,5 @@
+import time
+
 from fastapi import APIRouter, HTTPException, Depends
 
 from src.api.schemas.recommendations import RecommendationRequest, RecommendationResponse
@@ -20,8 +22,7 @@ async def get_recommendations(
     recommendation_service: RecommendationService = Depends(get_recommendation_service),
 ):
     try:
-        import time
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
 
         recommendations = recommendation_service.get_recommendations_with_metadata(
             user_id=request.user_id,
@@ -30,7 +31,7 @@ async def get_recommendations(
             diversify=request.diversify,
         )
 
-        inference_time = (time.time() - start_time) * 1000
+        inference_time = (time.perf_counter_ns() - start_ns) / 1e6
 
         return RecommendationResponse(
             user_id=request.user_id,
@@ -40,9 +41,9 @@ async def get_recommendations(
         )
 
     except KeyError as e:
-        logger.warning("User not found", user_id=request.user_id, error=str(e))
+        logger.warning("User not found", user_id=request.user_id, error=e)
         raise HTTPException(status_code=404, detail=f"User not found: {request.user_id}")
     except Exception as e:
-        logger.error("Recommendation error", user_id=request.user_id, error=str(e))
+        logger.error("Recommendation error", user_id=request.user_id, error=e)
         raise HTTPException(status_code=500, detail=f"Recommendation failed: {str(e)}")
 
@@ -1,8 +1,15 @@
 """Routes for serving reports."""
+import asyncio
+import gzip
+import multiprocessing
 import os
+import re
 import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Request, Response
 from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
 from typing import Optional
 
@@ -12,12 +19,121 @@ logger = get_logger(__name__)
 
 router = APIRouter(prefix="/api/v1/reports", tags=["reports"])
 
+FIGURE_CONTENT_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".svg": "image/svg+xml",
+    ".webp": "image/webp",
+}
+# Plain file names with a known image extension; anything else (path separators,
+# traversal, other types) is rejected before the filesystem is touched
+FIGURE_FILENAME_PATTERN = re.compile(r"[A-Za-z0-9_.-]+\.(?:png|jpe?g|svg|webp)", re.IGNORECASE)
+# Figures are rewritten in place when the report is regenerated, so they are cached
+# for a day and revalidated against the ETag rather than marked immutable
+FIGURE_CACHE_CONTROL = "public, max-age=86400"
+
+REPORTS_DIR = "data/reports"
+# Fingerprint of the processed data the current local reports were built from
+EDA_SOURCE_FINGERPRINT_PATH = os.path.join(REPORTS_DIR, ".eda_source")
+
+# Report generation is CPU-bound pandas work, so it runs in a separate worker process
+# instead of on the API's event loop or thread pool. One worker is enough: concurrent
+# requests share the in-flight generation rather than starting another.
+_report_pool: Optional[ProcessPoolExecutor] = None
+_report_future: Optional[Future] = None
+_report_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4)
+def _load_report_html(path: str, mtime_ns: int) -> bytes:
+    """Read a report and point its figure links at the API, cached per file version.
+
+    The modification time is part of the cache key, so a regenerated report is
+    picked up on the next request.
+    """
+    with open(path, "rb") as f:
+        html_content = f.read()
+
+    # Fix image paths to be relative to the API endpoint
+    return html_content.replace(b'src="figures/', b'src="/api/v1/reports/eda/figures/')
+
+
+@lru_cache(maxsize=4)
+def _load_report_html_gzip(path: str, mtime_ns: int) -> bytes:
+    """Gzip-compressed report, compressed once per file version rather than per request."""
+    return gzip.compress(_load_report_html(path, mtime_ns), compresslevel=6)
+
+
+def _submit_report_generation() -> Future:
+    """Start EDA report generation in the worker process, or join the running one."""
+    global _report_pool, _report_future
+    with _report_lock:
+        if _report_future is not None and not _report_future.done():
+            return _report_future
+        if _report_pool is None:
+            _report_pool = ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            )
+        _report_future = _report_pool.submit(_generate_eda_report_from_s3)
+        return _report_future
+
+
+def shutdown_report_pool() -> None:
+    """Stop the report worker process, abandoning any queued generation."""
+    global _report_pool, _report_future
+    with _report_lock:
+        if _report_pool is not None:
+            _report_pool.shutdown(wait=False, cancel_futures=True)
+            _report_pool = None
+        _report_future = None
+
+
+def _source_fingerprint(s3_key: str, local_path: str) -> Optional[str]:
+    """Identify the processed data version without downloading it.
+
+    Uses the S3 object's ETag when reachable, otherwise the local file's
+    modification time and size. Returns None when neither is available.
+    """
+    try:
+        from src.infrastructure.s3 import get_s3_client
+        from src.config.settings import settings
+
+        head = get_s3_client().head_object(Bucket=settings.s3_bucket, Key=s3_key)
+        return f"s3:{head['ETag']}:{head['ContentLength']}"
+    except Exception as e:
+        logger.debug("Could not read S3 object metadata", s3_key=s3_key, error=str(e))
+
+    try:
+        stat_result = os.stat(local_path)
+    except OSError:
+        return None
+    return f"local:{stat_result.st_mtime_ns}:{stat_result.st_size}"
+
+
+def _reports_are_current(fingerprint: Optional[str]) -> bool:
+    """Whether the local reports were generated from data with this fingerprint."""
+    if fingerprint is None:
+        return False
+    if not all(
+        os.path.exists(os.path.join(REPORTS_DIR, name))
+        for name in ("eda_report.html", "eda_report.json")
+    ):
+        return False
+    try:
+        with open(EDA_SOURCE_FINGERPRINT_PATH, "r", encoding="utf-8") as f:
+            return f.read() == fingerprint
+    except OSError:
+        return False
+
 
 def _generate_eda_report_from_s3() -> bool:
     """Generate EDA report from S3 data.
     
     Reads processed data from S3, generates the EDA report, and saves it to S3.
     This allows generating reports completely in the cloud without local files.
+    Generation is skipped when the local reports were already built from the
+    same version of the processed data.
     
     Returns:
         True if report was generated successfully, False otherwise
@@ -26,26 +142,22 @@ def _generate_eda_report_from_s3() -> bool:
         logger.info("Generating EDA report from S3 data")
         
         # Import here to avoid circular dependencies
-        import pandas as pd
-        import json
-        import matplotlib
-        matplotlib.use('Agg')  # Non-interactive backend
-        import matplotlib.pyplot as plt
-        import seaborn as sns
         from datetime import datetime
         
         from src.data.ingestion import load_from_s3, load_from_local
         from src.data.validation import get_data_quality_report
         from src.config.settings import settings
-        
-        # Set style
-        sns.set_style("whitegrid")
-        plt.rcParams['figure.figsize'] = (12, 6)
+        from src.infrastructure.serialization import write_json_report
         
         # Try to load from S3 first, then local
         processed_data_path = f"{settings.s3_prefix}/processed/ratings.parquet"
         local_data_path = "data/processed/ratings.parquet"
         
+        fingerprint = _source_fingerprint(processed_data_path, local_data_path)
+        if _reports_are_current(fingerprint):
+            logger.info("EDA report is up to date, skipping generation", fingerprint=fingerprint)
+            return True
+        
         try:
             logger.info("Loading processed data from S3", s3_key=processed_data_path)
             df = load_from_s3(processed_data_path)
@@ -59,12 +171,23 @@ def _generate_eda_report_from_s3() -> bool:
         
         logger.info("Data loaded successfully", rows=len(df))
         
+        # ID columns are counted several times below; as categoricals, value_counts
+        # and nunique work on integer codes instead of hashing every ID string
+        df["user_id"] = df["user_id"].astype("category")
+        df["product_id"] = df["product_id"].astype("category")
+        
         # Create reports directory
-        reports_dir = "data/reports"
+        reports_dir = REPORTS_DIR
         os.makedirs(reports_dir, exist_ok=True)
         figures_dir = os.path.join(reports_dir, "figures")
         os.makedirs(figures_dir, exist_ok=True)
         
+        # Aggregates shared by the JSON and HTML reports are computed once
+        n_users = df["user_id"].nunique()
+        n_products = df["product_id"].nunique()
+        top_users = df["user_id"].value_counts().head(10)
+        top_products = df["product_id"].value_counts().head(10)
+
         # Generate JSON report
         logger.info("Generating EDA JSON report")
         report = {
@@ -72,26 +195,25 @@ def _generate_eda_report_from_s3() -> bool:
             "data_quality": get_data_quality_report(df, data_type="transactions"),
             "summary": {
                 "total_rows": len(df),
-                "unique_users": df["user_id"].nunique(),
-                "unique_products": df["product_id"].nunique(),
+                "unique_users": n_users,
+                "unique_products": n_products,
                 "date_range": {
                     "min": str(df["timestamp"].min()) if "timestamp" in df.columns else None,
                     "max": str(df["timestamp"].max()) if "timestamp" in df.columns else None,
                 },
             },
             "rating_distribution": df["rating"].value_counts().to_dict() if "rating" in df.columns else {},
-            "top_users": df["user_id"].value_counts().head(10).to_dict(),
-            "top_products": df["product_id"].value_counts().head(10).to_dict(),
+            "top_users": top_users.to_dict(),
+            "top_products": top_products.to_dict(),
         }
         
         json_path = os.path.join(reports_dir, "eda_report.json")
-        with open(json_path, "w") as f:
-            json.dump(report, f, indent=2, default=str)
+        write_json_report(json_path, report)
         logger.info("JSON report generated", path=json_path)
         
         # Generate HTML report (simplified version)
         logger.info("Generating EDA HTML report")
-        html_content = f"""
+        html_parts = [f"""
 <!DOCTYPE html>
 <html>
 <head>
@@ -118,35 +240,38 @@ def _generate_eda_report_from_s3() -> bool:
         <h2>Summary Statistics</h2>
         <div class="summary">
             <div class="summary-card"><h3>Total Rows</h3><p>{len(df):,}</p></div>
-            <div class="summary-card"><h3>Unique Users</h3><p>{df['user_id'].nunique():,}</p></div>
-            <div class="summary-card"><h3>Unique Products</h3><p>{df['product_id'].nunique():,}</p></div>
+            <div class="summary-card"><h3>Unique Users</h3><p>{n_users:,}</p></div>
+            <div class="summary-card"><h3>Unique Products</h3><p>{n_products:,}</p></div>
         </div>
         <h2>Top 10 Most Active Users</h2>
         <table>
             <tr><th>User ID</th><th>Interactions</th></tr>
-"""
+"""]
         
-        top_users = df["user_id"].value_counts().head(10)
-        for user_id, count in top_users.items():
-            html_content += f"<tr><td>{user_id}</td><td>{count:,}</td></tr>\n"
+        # Parts are collected in a list and joined once at the end
+        html_parts.extend(
+            f"<tr><td>{user_id}</td><td>{count:,}</td></tr>\n" for user_id, count in top_users.items()
+        )
         
-        html_content += """
+        html_parts.append("""
         </table>
         <h2>Top 10 Most Popular Products</h2>
         <table>
             <tr><th>Product ID</th><th>Interactions</th></tr>
-"""
+""")
         
-        top_products = df["product_id"].value_counts().head(10)
-        for product_id, count in top_products.items():
-            html_content += f"<tr><td>{product_id}</td><td>{count:,}</td></tr>\n"
+        html_parts.extend(
+            f"<tr><td>{product_id}</td><td>{count:,}</td></tr>\n"
+            for product_id, count in top_products.items()
+        )
         
-        html_content += """
+        html_parts.append("""
         </table>
     </div>
 </body>
 </html>
-"""
+""")
+        html_content = "".join(html_parts)
         
         html_path = os.path.join(reports_dir, "eda_report.html")
         with open(html_path, "w", encoding="utf-8") as f:
@@ -155,28 +280,35 @@ def _generate_eda_report_from_s3() -> bool:
         
         # Upload to S3
         try:
-            import boto3
-            s3_client = boto3.client(
-                "s3",
-                region_name=settings.aws_region,
-                aws_access_key_id=settings.aws_access_key_id,
-                aws_secret_access_key=settings.aws_secret_access_key,
-            )
-            
-            # Upload HTML
-            s3_key = f"{settings.s3_prefix}/reports/eda_report.html"
-            s3_client.upload_file(html_path, settings.s3_bucket, s3_key)
-            logger.info("Uploaded HTML report to S3", s3_key=s3_key)
-            
-            # Upload JSON
-            s3_key = f"{settings.s3_prefix}/reports/eda_report.json"
-            s3_client.upload_file(json_path, settings.s3_bucket, s3_key)
-            logger.info("Uploaded JSON report to S3", s3_key=s3_key)
+            from concurrent.futures import ThreadPoolExecutor
+            from src.infrastructure.s3 import get_s3_client, get_transfer_config
+
+            # The process-wide client is thread-safe, so both reports upload concurrently
+            s3_client = get_s3_client()
+
+            def upload_report(local_path: str, filename: str) -> None:
+                s3_key = f"{settings.s3_prefix}/reports/{filename}"
+                s3_client.upload_file(
+                    local_path, settings.s3_bucket, s3_key, Config=get_transfer_config()
+                )
+                logger.info("Uploaded report to S3", s3_key=s3_key)
+
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futures = [
+                    executor.submit(upload_report, html_path, "eda_report.html"),
+                    executor.submit(upload_report, json_path, "eda_report.json"),
+                ]
+                for future in futures:
+                    future.result()
         
         except Exception as e:
             logger.warning("Failed to upload reports to S3", error=str(e))
             # Continue anyway, report is generated locally
         
+        if fingerprint is not None:
+            with open(EDA_SOURCE_FINGERPRINT_PATH, "w", encoding="utf-8") as f:
+                f.write(fingerprint)
+        
         logger.info("EDA report generated successfully")
         return True
         
@@ -186,7 +318,7 @@ def _generate_eda_report_from_s3() -> bool:
 
 
 @router.get("/eda", response_class=HTMLResponse)
-async def get_eda_report(generate_if_missing: bool = True):
+async def get_eda_report(request: Request, generate_if_missing: bool = True):
     """Get EDA HTML report.
     
     Returns the Exploratory Data Analysis report in HTML format.
@@ -210,7 +342,7 @@ async def get_eda_report(generate_if_missing: bool = True):
         # If still doesn't exist and generate_if_missing is True, generate it
         if not report_path.exists() and generate_if_missing:
             logger.info("Report not found, generating automatically from S3 data")
-            success = _generate_eda_report_from_s3()
+            success = await asyncio.wrap_future(_submit_report_generation())
             if not success:
                 raise HTTPException(
                     status_code=500,
@@ -225,50 +357,59 @@ async def get_eda_report(generate_if_missing: bool = True):
             )
     
     try:
-        with open(report_path, "r", encoding="utf-8") as f:
-            html_content = f.read()
-        
-        # Fix image paths to be relative to the API endpoint
-        html_content = html_content.replace(
-            'src="figures/',
-            'src="/api/v1/reports/eda/figures/'
-        )
-        
-        return HTMLResponse(content=html_content)
+        mtime_ns = report_path.stat().st_mtime_ns
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            return HTMLResponse(
+                content=_load_report_html_gzip(str(report_path), mtime_ns),
+                headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+            )
+        html_content = _load_report_html(str(report_path), mtime_ns)
+        return HTMLResponse(content=html_content, headers={"Vary": "Accept-Encoding"})
     except Exception as e:
         logger.error("Error reading EDA report", error=str(e))
         raise HTTPException(status_code=500, detail=f"Error reading report: {str(e)}")
 
 
 @router.get("/eda/figures/{filename}")
-async def get_eda_figure(filename: str):
+async def get_eda_figure(filename: str, request: Request):
     """Get EDA report figure/image.
     
+    Responses carry an mtime-based ETag and a Cache-Control header, and a
+    matching If-None-Match is answered with 304 without opening the file.
+    
     Args:
         filename: Name of the figure file (e.g., rating_distribution.png)
     """
+    if not FIGURE_FILENAME_PATTERN.fullmatch(filename):
+        raise HTTPException(status_code=404, detail=f"Figure not found: {filename}")
+    
     figure_path = Path(f"data/reports/figures/{filename}")
     
-    if not figure_path.exists():
+    try:
+        stat_result = figure_path.stat()
+    except FileNotFoundError:
         logger.warning("Figure not found", path=str(figure_path))
         raise HTTPException(status_code=404, detail=f"Figure not found: {filename}")
     
+    etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+    headers = {"Cache-Control": FIGURE_CACHE_CONTROL, "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
     # Determine content type based on extension
-    content_type = "image/png"
-    if filename.endswith(".jpg") or filename.endswith(".jpeg"):
-        content_type = "image/jpeg"
-    elif filename.endswith(".svg"):
-        content_type = "image/svg+xml"
+    content_type = FIGURE_CONTENT_TYPES.get(figure_path.suffix.lower(), "application/octet-stream")
     
     return FileResponse(
         path=str(figure_path),
         media_type=content_type,
-        filename=filename
+        filename=filename,
+        headers=headers,
+        stat_result=stat_result,
     )
 
 
 @router.post("/eda/generate")
-async def generate_eda_report_endpoint(background_tasks: BackgroundTasks):
+async def generate_eda_report_endpoint():
     """Generate EDA report from S3 data.
     
     This endpoint triggers the generation of the EDA report by reading
@@ -278,8 +419,8 @@ async def generate_eda_report_endpoint(background_tasks: BackgroundTasks):
     """
     logger.info("EDA report generation requested")
     
-    # Run in background to avoid timeout
-    background_tasks.add_task(_generate_eda_report_from_s3)
+    # Runs in the report worker process; a generation already in progress is reused
+    _submit_report_generation()
     
     return JSONResponse(
         content={
@@ -302,8 +443,6 @@ async def get_eda_json(generate_if_missing: bool = True):
         generate_if_missing: If True, generates the report automatically if not found.
             Default: True
     """
-    import json
-    
     report_path = Path("data/reports/eda_report.json")
     
     if not report_path.exists():
@@ -317,7 +456,7 @@ async def get_eda_json(generate_if_missing: bool = True):
         # If still doesn't exist and generate_if_missing is True, generate it
         if not report_path.exists() and generate_if_missing:
             logger.info("JSON report not found, generating automatically from S3 data")
-            success = _generate_eda_report_from_s3()
+            success = await asyncio.wrap_future(_submit_report_generation())
             if not success:
                 raise HTTPException(
                     status_code=500,
@@ -331,9 +470,9 @@ async def get_eda_json(generate_if_missing: bool = True):
             )
     
     try:
-        with open(report_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data
+        # The report is already JSON on disk; serve its bytes as-is instead of
+        # parsing it and having the response encoder serialize it again
+        return Response(content=report_path.read_bytes(), media_type="application/json")
     except Exception as e:
         logger.error("Error reading EDA JSON report", error=str(e))
         raise HTTPException(status_code=500, detail=f"Error reading report: {str(e)}")
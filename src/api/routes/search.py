@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import APIRouter, HTTPException, Depends
 from typing import Optional
 
@@ -21,7 +23,10 @@ async def search(
     search_service: SearchService = Depends(get_search_service),
 ):
     try:
-        results, timing = search_service.search_with_metadata(
+        # Searches run in worker threads so concurrent requests can be batched
+        # into one FAISS call instead of queuing behind each other on the event loop
+        results, timing = await asyncio.to_thread(
+            search_service.search_with_metadata,
             query=request.query,
             top_k=request.top_k,
             filters=request.filters,
@@ -35,6 +40,6 @@ async def search(
         )
 
     except Exception as e:
-        logger.error("Search error", query=request.query, error=str(e))
+        logger.error("Search error", query=request.query, error=e)
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
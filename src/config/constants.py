@@ -6,6 +6,11 @@ class FAISSIndexType(str, Enum):
     INNER_PRODUCT = "InnerProduct"
 
 
+class EmbeddingQuantization(str, Enum):
+    INT8 = "int8"
+    FP16 = "fp16"
+
+
 class CacheType(str, Enum):
     MEMORY = "memory"
     REDIS = "redis"
@@ -26,3 +31,5 @@ EMBEDDING_MAX_RETRIES = 3
 
 COLD_START_THRESHOLD = 5
 
+RATINGS_COLUMNS = ["user_id", "product_id", "rating", "timestamp"]
+
@@ -28,6 +28,17 @@ class Settings(BaseSettings):
 
     # FAISS Configuration
     faiss_index_type: str = "InnerProduct"
+    # Optional faiss.index_factory string (e.g. "IVF4096,PQ64", "IVF{nlist},Flat" or
+    # "HNSW32,Flat") for approximate search on large catalogs; None keeps the exact
+    # flat index
+    faiss_index_factory: Optional[str] = None
+    # IVF lists scanned per query; None keeps FAISS's default of 1
+    faiss_nprobe: Optional[int] = None
+    # Store vectors in the flat index as "int8" or "fp16" scalar-quantized codes
+    # instead of float32; None keeps exact float32 vectors
+    faiss_quantization: Optional[str] = None
+    # Serve searches from a GPU copy of the index (needs a faiss-gpu build)
+    faiss_use_gpu: bool = False
 
     # API Configuration
     api_host: str = "0.0.0.0"
@@ -1,135 +1,317 @@
 from typing import Dict, List, Any
+import numpy as np
 import pandas as pd
-import json
 
 from src.infrastructure.logging import get_logger
+from src.infrastructure.serialization import read_json, write_json
 
 logger = get_logger(__name__)
 
+PRODUCT_METADATA_FIELDS = ["category", "name", "description"]
+STATS_FIELDS = ["total_interactions", "avg_rating", "min_rating", "max_rating"]
+
+
+def _load_ids(data: Dict[str, Any], ids_key: str, idx_to_id_key: str) -> List[str]:
+    # IDs are saved as a single list in index order; the ID -> idx map is rebuilt
+    # from it with dict(zip(...)) instead of being parsed and re-keyed
+    if ids_key in data:
+        return data[ids_key]
+
+    # Catalogs saved before the list layout hold a reverse map keyed "0".."n-1"
+    idx_to_id = data[idx_to_id_key]
+    ids = [""] * len(idx_to_id)
+    for idx, item_id in idx_to_id.items():
+        ids[int(idx)] = item_id
+    return ids
+
+
+def _compute_stats(df: pd.DataFrame, key: str, ids: List[Any]) -> Dict[str, np.ndarray]:
+    # One float64 column per statistic, row-aligned with the catalog's index map,
+    # instead of a dict of per-ID dicts built cell by cell
+    grouped = df.groupby(key).agg(
+        total_interactions=("rating", "count"),
+        avg_rating=("rating", "mean"),
+        min_rating=("rating", "min"),
+        max_rating=("rating", "max"),
+    ).reindex(ids)
+    return {field: grouped[field].to_numpy(dtype=np.float64) for field in STATS_FIELDS}
+
+
+def _stats_row(stats: Dict[str, np.ndarray], idx: int) -> Dict[str, float]:
+    if idx < 0:
+        return {}
+    return {field: float(stats[field][idx]) for field in STATS_FIELDS}
+
+
+def _stats_to_columns(stats: Dict[str, np.ndarray]) -> Dict[str, List[float]]:
+    # Saved as one list per statistic in index order, so loading parses a few flat
+    # float arrays rather than a nested object per ID
+    return {field: stats[field].tolist() for field in STATS_FIELDS}
+
+
+def _load_stats(data: Dict[str, Any], name: str, ids: List[Any]) -> Dict[str, np.ndarray]:
+    columns = data.get(f"{name}_columns")
+    if columns is not None:
+        # Missing values come back as null (orjson) and become NaN again here
+        return {field: np.asarray(columns[field], dtype=np.float64) for field in STATS_FIELDS}
+
+    # Catalogs saved before the columnar layout hold one record per ID
+    frame = pd.DataFrame.from_dict(data[name], orient="index", columns=STATS_FIELDS).reindex(ids)
+    return {field: frame[field].to_numpy(dtype=np.float64) for field in STATS_FIELDS}
+
+
+class ProductMetadataTable:
+    """Product metadata stored column-wise instead of as one dict per product.
+
+    Each field is dictionary-encoded: an int32 code per product pointing into an
+    array of distinct strings, so repeated values such as categories share a single
+    string object and a product row costs a few integers.
+    """
+
+    def __init__(self, product_ids: List[str], columns: Dict[str, Any]):
+        self.product_to_row: Dict[str, int] = dict(zip(product_ids, range(len(product_ids))))
+        self._codes: Dict[str, np.ndarray] = {}
+        self._values: Dict[str, np.ndarray] = {}
+        for field in PRODUCT_METADATA_FIELDS:
+            codes, values = pd.factorize(pd.Series(columns[field], dtype=object))
+            self._codes[field] = codes.astype(np.int32)
+            self._values[field] = np.asarray(values, dtype=object)
+
+    @classmethod
+    def from_records(cls, records: Dict[str, Dict[str, str]]) -> "ProductMetadataTable":
+        columns = {
+            field: [record.get(field, "") for record in records.values()]
+            for field in PRODUCT_METADATA_FIELDS
+        }
+        return cls(list(records), columns)
+
+    def get(self, product_id: str) -> Dict[str, str]:
+        row = self.product_to_row.get(product_id)
+        if row is None:
+            return {}
+        return {
+            field: self._values[field][self._codes[field][row]]
+            for field in PRODUCT_METADATA_FIELDS
+        }
+
+    def rows(self, product_ids: List[str]) -> np.ndarray:
+        """Row of each product in the table, -1 for unknown products."""
+        return np.fromiter(
+            (self.product_to_row.get(product_id, -1) for product_id in product_ids),
+            dtype=np.int64,
+            count=len(product_ids),
+        )
+
+    def columns_at(self, rows: np.ndarray) -> Dict[str, List[str]]:
+        """Every metadata field for the given rows; unknown rows (-1) get empty strings."""
+        known = rows >= 0
+        columns = {}
+        for field in PRODUCT_METADATA_FIELDS:
+            values = np.full(len(rows), "", dtype=object)
+            values[known] = self._values[field][self._codes[field][rows[known]]]
+            columns[field] = values.tolist()
+        return columns
+
+    def field_equals(self, rows: np.ndarray, field: str, value: Any) -> np.ndarray:
+        """Boolean mask of rows whose field equals value; unknown rows never match.
+
+        The value is looked up once among the distinct strings, after which the
+        comparison is on integer codes.
+        """
+        matches = np.flatnonzero(self._values[field] == value)
+        if len(matches) == 0:
+            return np.zeros(len(rows), dtype=bool)
+        known = rows >= 0
+        mask = np.zeros(len(rows), dtype=bool)
+        mask[known] = self._codes[field][rows[known]] == matches[0]
+        return mask
+
+    def to_records(self) -> Dict[str, Dict[str, str]]:
+        return {product_id: self.get(product_id) for product_id in self.product_to_row}
+
+    def __len__(self) -> int:
+        return len(self.product_to_row)
+
 
 class UserCatalog:
     def __init__(self, transactions_df: pd.DataFrame):
+        # Users are indexed in order of first appearance; the reverse map is a plain
+        # list, so idx -> user_id is positional indexing rather than a dict lookup
+        self.user_ids: List[str] = pd.factorize(transactions_df["user_id"])[1].tolist()
+        self.user_to_idx: Dict[str, int] = dict(zip(self.user_ids, range(len(self.user_ids))))
         self.user_stats = self._compute_user_stats(transactions_df)
-        self.user_to_idx: Dict[str, int] = {}
-        self.idx_to_user: Dict[int, str] = {}
 
-        unique_users = transactions_df["user_id"].unique()
-        for idx, user_id in enumerate(unique_users):
-            self.user_to_idx[user_id] = idx
-            self.idx_to_user[idx] = user_id
-
-    def _compute_user_stats(self, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
-        stats = df.groupby("user_id").agg(
-            total_interactions=("rating", "count"),
-            avg_rating=("rating", "mean"),
-            min_rating=("rating", "min"),
-            max_rating=("rating", "max"),
-        ).to_dict(orient="index")
-
-        return {str(k): {str(k2): float(v2) if isinstance(v2, (int, float)) else v2 for k2, v2 in v.items()} for k, v in stats.items()}
+    def _compute_user_stats(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        return _compute_stats(df, "user_id", self.user_ids)
 
     def get_user_stats(self, user_id: str) -> Dict[str, Any]:
-        return self.user_stats.get(user_id, {})
+        return _stats_row(self.user_stats, self.get_user_idx(user_id))
 
     def get_user_idx(self, user_id: str) -> int:
         return self.user_to_idx.get(user_id, -1)
 
     def get_user_id(self, user_idx: int) -> str:
-        return self.idx_to_user.get(user_idx, "")
+        return self.user_ids[user_idx] if 0 <= user_idx < len(self.user_ids) else ""
 
     def to_dict(self) -> Dict[str, Any]:
         return {
-            "user_stats": self.user_stats,
-            "user_to_idx": self.user_to_idx,
-            "idx_to_user": self.idx_to_user,
+            "user_stats_columns": _stats_to_columns(self.user_stats),
+            "user_ids": self.user_ids,
         }
 
     def save(self, file_path: str) -> None:
         logger.info("Saving user catalog", file_path=file_path)
-        with open(file_path, "w") as f:
-            json.dump(self.to_dict(), f, indent=2)
+        write_json(file_path, self.to_dict())
 
     @classmethod
     def load(cls, file_path: str) -> "UserCatalog":
         logger.info("Loading user catalog", file_path=file_path)
-        with open(file_path, "r") as f:
-            data = json.load(f)
+        data = read_json(file_path)
 
         catalog = cls.__new__(cls)
-        catalog.user_stats = data["user_stats"]
-        catalog.user_to_idx = {k: int(v) for k, v in data["user_to_idx"].items()}
-        catalog.idx_to_user = {int(k): v for k, v in data["idx_to_user"].items()}
+        catalog.user_ids = _load_ids(data, "user_ids", "idx_to_user")
+        catalog.user_to_idx = dict(zip(catalog.user_ids, range(len(catalog.user_ids))))
+        catalog.user_stats = _load_stats(data, "user_stats", catalog.user_ids)
         return catalog
 
 
 class ProductCatalog:
     def __init__(self, transactions_df: pd.DataFrame, products_df: pd.DataFrame):
+        self.product_ids: List[str] = pd.factorize(transactions_df["product_id"])[1].tolist()
+        self.product_to_idx: Dict[str, int] = dict(
+            zip(self.product_ids, range(len(self.product_ids)))
+        )
         self.product_stats = self._compute_product_stats(transactions_df)
         self.product_metadata = self._load_product_metadata(products_df)
-        self.product_to_idx: Dict[str, int] = {}
-        self.idx_to_product: Dict[int, str] = {}
-
-        unique_products = transactions_df["product_id"].unique()
-        for idx, product_id in enumerate(unique_products):
-            self.product_to_idx[product_id] = idx
-            self.idx_to_product[idx] = product_id
-
-    def _compute_product_stats(self, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
-        stats = df.groupby("product_id").agg(
-            total_interactions=("rating", "count"),
-            avg_rating=("rating", "mean"),
-            min_rating=("rating", "min"),
-            max_rating=("rating", "max"),
-        ).to_dict(orient="index")
-
-        return {str(k): {str(k2): float(v2) if isinstance(v2, (int, float)) else v2 for k2, v2 in v.items()} for k, v in stats.items()}
-
-    def _load_product_metadata(self, df: pd.DataFrame) -> Dict[str, Dict[str, str]]:
-        metadata = {}
-        for _, row in df.iterrows():
-            product_id = str(row["product_id"])
-            metadata[product_id] = {
-                "category": str(row.get("category", "")),
-                "name": str(row.get("name", "")),
-                "description": str(row.get("description", "")),
-            }
-        return metadata
+
+    def _compute_product_stats(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        return _compute_stats(df, "product_id", self.product_ids)
+
+    def _load_product_metadata(self, df: pd.DataFrame) -> ProductMetadataTable:
+        # Columns are stringified in bulk instead of boxing each row into a Series;
+        # missing columns become empty strings
+        metadata = pd.DataFrame(
+            {
+                field: df[field].astype(str) if field in df.columns else ""
+                for field in PRODUCT_METADATA_FIELDS
+            },
+            index=df.index,
+        )
+        metadata.index = df["product_id"].astype(str)
+        # Later rows win for repeated product IDs
+        metadata = metadata[~metadata.index.duplicated(keep="last")]
+        return ProductMetadataTable(
+            metadata.index.tolist(),
+            {field: metadata[field] for field in PRODUCT_METADATA_FIELDS},
+        )
 
     def get_product_stats(self, product_id: str) -> Dict[str, Any]:
-        return self.product_stats.get(product_id, {})
+        return _stats_row(self.product_stats, self.get_product_idx(product_id))
 
     def get_product_metadata(self, product_id: str) -> Dict[str, str]:
-        return self.product_metadata.get(product_id, {})
+        return self.product_metadata.get(product_id)
 
     def get_product_idx(self, product_id: str) -> int:
         return self.product_to_idx.get(product_id, -1)
 
     def get_product_id(self, product_idx: int) -> str:
-        return self.idx_to_product.get(product_idx, "")
+        return self.product_ids[product_idx] if 0 <= product_idx < len(self.product_ids) else ""
+
+    def get_product_indices(self, product_ids: List[str]) -> np.ndarray:
+        """Catalog index of each product, -1 for unknown products."""
+        return np.fromiter(
+            (self.product_to_idx.get(product_id, -1) for product_id in product_ids),
+            dtype=np.int64,
+            count=len(product_ids),
+        )
+
+    def describe_products(self, product_ids: List[str]) -> List[Dict[str, Any]]:
+        """Display metadata and headline stats for many products at once.
+
+        Equivalent to combining get_product_metadata() and get_product_stats() per
+        product, but gathered column-wise: unknown products get empty strings, a
+        0.0 rating and 0 interactions.
+        """
+        columns = self.product_metadata.columns_at(self.product_metadata.rows(product_ids))
+        product_indices = self.get_product_indices(product_ids)
+        known = product_indices >= 0
+        avg_rating = np.zeros(len(product_ids))
+        avg_rating[known] = self.product_stats["avg_rating"][product_indices[known]]
+        total_interactions = np.zeros(len(product_ids))
+        total_interactions[known] = self.product_stats["total_interactions"][product_indices[known]]
+
+        return [
+            {
+                "name": name,
+                "category": category,
+                "description": description,
+                "avg_rating": rating,
+                "total_interactions": interactions,
+            }
+            for name, category, description, rating, interactions in zip(
+                columns["name"],
+                columns["category"],
+                columns["description"],
+                avg_rating.tolist(),
+                np.nan_to_num(total_interactions).astype(np.int64).tolist(),
+            )
+        ]
+
+    def filter_mask(self, product_ids: List[str], filters: Dict[str, Any]) -> np.ndarray:
+        """Boolean mask of the products passing search filters.
+
+        Supports "category", "min_rating" and "min_interactions". Predicates are
+        evaluated on the metadata codes and stats columns for all products at once;
+        products without stats count as 0 rating and 0 interactions.
+        """
+        return self.filter_mask_at(
+            self.get_product_indices(product_ids), self.product_metadata.rows(product_ids), filters
+        )
+
+    def filter_mask_at(
+        self, product_indices: np.ndarray, metadata_rows: np.ndarray, filters: Dict[str, Any]
+    ) -> np.ndarray:
+        """filter_mask for products already resolved to catalog indices and metadata rows.
+
+        Callers filtering the same product list repeatedly resolve it once with
+        get_product_indices() and ProductMetadataTable.rows().
+        """
+        mask = np.ones(len(product_indices), dtype=bool)
+
+        if "category" in filters:
+            mask &= self.product_metadata.field_equals(metadata_rows, "category", filters["category"])
+
+        known = product_indices >= 0
+        for field, key in (("avg_rating", "min_rating"), ("total_interactions", "min_interactions")):
+            if key not in filters:
+                continue
+            values = np.zeros(len(product_indices))
+            values[known] = self.product_stats[field][product_indices[known]]
+            # Written as "not below" so NaN stats pass, as with a scalar comparison
+            mask &= ~(values < filters[key])
+
+        return mask
 
     def to_dict(self) -> Dict[str, Any]:
         return {
-            "product_stats": self.product_stats,
-            "product_metadata": self.product_metadata,
-            "product_to_idx": self.product_to_idx,
-            "idx_to_product": self.idx_to_product,
+            "product_stats_columns": _stats_to_columns(self.product_stats),
+            "product_metadata": self.product_metadata.to_records(),
+            "product_ids": self.product_ids,
         }
 
     def save(self, file_path: str) -> None:
         logger.info("Saving product catalog", file_path=file_path)
-        with open(file_path, "w") as f:
-            json.dump(self.to_dict(), f, indent=2)
+        write_json(file_path, self.to_dict())
 
     @classmethod
     def load(cls, file_path: str) -> "ProductCatalog":
         logger.info("Loading product catalog", file_path=file_path)
-        with open(file_path, "r") as f:
-            data = json.load(f)
+        data = read_json(file_path)
 
         catalog = cls.__new__(cls)
-        catalog.product_stats = data["product_stats"]
-        catalog.product_metadata = data["product_metadata"]
-        catalog.product_to_idx = {k: int(v) for k, v in data["product_to_idx"].items()}
-        catalog.idx_to_product = {int(k): v for k, v in data["idx_to_product"].items()}
+        catalog.product_ids = _load_ids(data, "product_ids", "idx_to_product")
+        catalog.product_to_idx = dict(zip(catalog.product_ids, range(len(catalog.product_ids))))
+        catalog.product_stats = _load_stats(data, "product_stats", catalog.product_ids)
+        catalog.product_metadata = ProductMetadataTable.from_records(data["product_metadata"])
         return catalog
 
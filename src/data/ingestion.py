@@ -1,14 +1,26 @@
-from typing import Optional
+from functools import lru_cache
+from typing import Iterator, List, Optional
 import pandas as pd
-import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
 
 from src.config.settings import settings
 from src.infrastructure.logging import get_logger
+from src.infrastructure.s3 import get_s3_client, get_transfer_config
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _get_arrow_s3_filesystem():
+    from pyarrow import fs
+
+    return fs.S3FileSystem(
+        region=settings.aws_region,
+        access_key=settings.aws_access_key_id,
+        secret_key=settings.aws_secret_access_key,
+    )
+
+
 def load_from_s3(s3_key: str, bucket: Optional[str] = None) -> pd.DataFrame:
     bucket = bucket or settings.s3_bucket
     logger.info("Loading data from S3", bucket=bucket, key=s3_key)
@@ -16,31 +28,37 @@ def load_from_s3(s3_key: str, bucket: Optional[str] = None) -> pd.DataFrame:
     try:
         import os
         
-        s3_client = boto3.client(
-            "s3",
-            region_name=settings.aws_region,
-            aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key,
-        )
-
-        obj = s3_client.get_object(Bucket=bucket, Key=s3_key)
-        
         file_ext = os.path.splitext(s3_key)[1].lower()
         
         if file_ext == ".parquet":
-            from io import BytesIO
-            buffer = BytesIO(obj["Body"].read())
-            df = pd.read_parquet(buffer)
+            # Arrow fetches row groups with parallel ranged GETs and decodes them as
+            # they arrive, instead of buffering the whole object before parsing
+            import pyarrow.parquet as pq
+
+            table = pq.read_table(
+                f"{bucket}/{s3_key}",
+                filesystem=_get_arrow_s3_filesystem(),
+                use_threads=True,
+                pre_buffer=True,
+            )
+            df = table.to_pandas(self_destruct=True, split_blocks=True)
+            del table
             logger.info("Data loaded successfully", rows=len(df), format="parquet")
             return df
         elif file_ext == ".csv":
-            df = pd.read_csv(obj["Body"], chunksize=1000)
-            chunks = []
-            for chunk in df:
-                chunks.append(chunk)
-            result_df = pd.concat(chunks, ignore_index=True)
-            logger.info("Data loaded successfully", rows=len(result_df), format="csv")
-            return result_df
+            from io import BytesIO
+
+            # The CSV parser needs the whole body, so it is downloaded in parallel
+            # ranges rather than read from a single GET stream
+            buffer = BytesIO()
+            get_s3_client().download_fileobj(
+                bucket, s3_key, buffer, Config=get_transfer_config()
+            )
+            buffer.seek(0)
+            df = pd.read_csv(buffer)
+            del buffer
+            logger.info("Data loaded successfully", rows=len(df), format="csv")
+            return df
         else:
             raise ValueError(f"Unsupported file format: {file_ext}. Supported: .csv, .parquet")
 
@@ -55,8 +73,12 @@ def load_from_s3(s3_key: str, bucket: Optional[str] = None) -> pd.DataFrame:
         raise
 
 
-def load_from_local(file_path: str) -> pd.DataFrame:
-    logger.info("Loading data from local file", file_path=file_path)
+def load_from_local(
+    file_path: str,
+    columns: Optional[List[str]] = None,
+    dtype_backend: Optional[str] = None,
+) -> pd.DataFrame:
+    logger.info("Loading data from local file", file_path=file_path, columns=columns)
 
     try:
         import os
@@ -67,17 +89,25 @@ def load_from_local(file_path: str) -> pd.DataFrame:
         file_ext = os.path.splitext(file_path)[1].lower()
         
         if file_ext == ".parquet":
-            df = pd.read_parquet(file_path)
+            # Column projection is pushed down to the parquet reader, so unused
+            # columns are never read from disk.
+            read_kwargs = {"dtype_backend": dtype_backend} if dtype_backend else {}
+            df = pd.read_parquet(file_path, columns=columns, **read_kwargs)
             logger.info("Data loaded successfully", rows=len(df), format="parquet")
             return df
         elif file_ext == ".csv":
-            df = pd.read_csv(file_path, chunksize=1000)
-            chunks = []
-            for chunk in df:
-                chunks.append(chunk)
-            result_df = pd.concat(chunks, ignore_index=True)
-            logger.info("Data loaded successfully", rows=len(result_df), format="csv")
-            return result_df
+            if dtype_backend == "pyarrow":
+                # Arrow's multithreaded CSV reader builds Arrow-backed columns directly,
+                # without materializing Python string objects
+                df = pd.read_csv(file_path, usecols=columns, engine="pyarrow", dtype_backend="pyarrow")
+                logger.info("Data loaded successfully", rows=len(df), format="csv")
+                return df
+            read_kwargs = {"dtype_backend": dtype_backend} if dtype_backend else {}
+            # A single read builds the frame directly, without a concat copy of
+            # 1000-row chunks
+            df = pd.read_csv(file_path, usecols=columns, **read_kwargs)
+            logger.info("Data loaded successfully", rows=len(df), format="csv")
+            return df
         else:
             raise ValueError(f"Unsupported file format: {file_ext}. Supported formats: .csv, .parquet")
 
@@ -89,17 +119,25 @@ def load_from_local(file_path: str) -> pd.DataFrame:
         raise
 
 
+def iter_local_csv_batches(file_path: str, batch_size: int) -> Iterator[pd.DataFrame]:
+    logger.info("Streaming data from local file", file_path=file_path, batch_size=batch_size)
+
+    import os
+
+    if not os.path.exists(file_path):
+        logger.error("File not found", file_path=file_path)
+        raise FileNotFoundError(f"File not found: {file_path}")
+
+    with pd.read_csv(file_path, chunksize=batch_size) as reader:
+        yield from reader
+
+
 def save_to_s3(df: pd.DataFrame, s3_key: str, bucket: Optional[str] = None) -> None:
     bucket = bucket or settings.s3_bucket
     logger.info("Saving data to S3", bucket=bucket, key=s3_key, rows=len(df))
 
     try:
-        s3_client = boto3.client(
-            "s3",
-            region_name=settings.aws_region,
-            aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key,
-        )
+        s3_client = get_s3_client()
 
         from io import BytesIO
         buffer = BytesIO()
@@ -1,4 +1,5 @@
 from typing import Tuple
+import numpy as np
 import pandas as pd
 
 from src.config.constants import TRAIN_SPLIT, VAL_SPLIT, TEST_SPLIT
@@ -18,17 +19,24 @@ def temporal_split(
     if abs(train_ratio + val_ratio + test_ratio - 1.0) > 1e-6:
         raise ValueError("Split ratios must sum to 1.0")
 
-    df = df.copy()
-    df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
-    df = df.sort_values("timestamp").reset_index(drop=True)
+    # Only the row order is sorted; each split then gathers its own rows once,
+    # instead of copying the input, sorting it into another frame and copying
+    # every slice again
+    timestamps = pd.to_datetime(df["timestamp"], errors="coerce")
+    order = timestamps.reset_index(drop=True).sort_values(kind="stable").index.to_numpy()
 
     total_rows = len(df)
     train_end = int(total_rows * train_ratio)
     val_end = train_end + int(total_rows * val_ratio)
 
-    train_df = df.iloc[:train_end].copy()
-    val_df = df.iloc[train_end:val_end].copy()
-    test_df = df.iloc[val_end:].copy()
+    splits = []
+    for start, positions in zip((0, train_end, val_end), np.split(order, [train_end, val_end])):
+        split_df = df.take(positions)
+        split_df["timestamp"] = timestamps.array.take(positions)
+        # Row labels continue across the splits, as if the sorted frame were sliced
+        split_df.index = pd.RangeIndex(start, start + len(positions))
+        splits.append(split_df)
+    train_df, val_df, test_df = splits
 
     logger.info(
         "Temporal split complete",
@@ -40,6 +48,13 @@ def temporal_split(
     return train_df, val_df, test_df
 
 
+def _cold_start_ids(ids: pd.Series, known: pd.Index) -> np.ndarray:
+    # One hash lookup per unique ID against the training index; unlike
+    # Index.difference the result is not sorted, since only its size is used
+    unique_ids = ids.unique()
+    return np.asarray(unique_ids)[known.get_indexer(unique_ids) == -1]
+
+
 def validate_split(
     train_df: pd.DataFrame,
     val_df: pd.DataFrame,
@@ -47,29 +62,23 @@ def validate_split(
 ) -> bool:
     logger.info("Validating split")
 
-    train_users = set(train_df["user_id"].unique())
-    train_products = set(train_df["product_id"].unique())
-
-    val_users = set(val_df["user_id"].unique())
-    val_products = set(val_df["product_id"].unique())
-
-    test_users = set(test_df["user_id"].unique())
-    test_products = set(test_df["product_id"].unique())
+    train_users = pd.Index(train_df["user_id"].unique())
+    train_products = pd.Index(train_df["product_id"].unique())
 
-    val_cold_start_users = val_users - train_users
-    val_cold_start_products = val_products - train_products
+    val_cold_start_users = _cold_start_ids(val_df["user_id"], train_users)
+    val_cold_start_products = _cold_start_ids(val_df["product_id"], train_products)
 
-    test_cold_start_users = test_users - train_users
-    test_cold_start_products = test_products - train_products
+    test_cold_start_users = _cold_start_ids(test_df["user_id"], train_users)
+    test_cold_start_products = _cold_start_ids(test_df["product_id"], train_products)
 
-    if val_cold_start_users or val_cold_start_products:
+    if len(val_cold_start_users) or len(val_cold_start_products):
         logger.warning(
             "Cold start in validation set",
             cold_start_users=len(val_cold_start_users),
             cold_start_products=len(val_cold_start_products),
         )
 
-    if test_cold_start_users or test_cold_start_products:
+    if len(test_cold_start_users) or len(test_cold_start_products):
         logger.warning(
             "Cold start in test set",
             cold_start_users=len(test_cold_start_users),
@@ -1,33 +1,33 @@
-from typing import Dict, Tuple
+from typing import Dict, Iterable, Tuple
 import pandas as pd
-from datetime import datetime
-import pytz
 
 from src.config.constants import RATING_MIN, RATING_MAX
+from src.data.validation import validate_transactions
 from src.infrastructure.logging import get_logger
 
 logger = get_logger(__name__)
 
+DEDUP_COLUMNS = ["user_id", "product_id", "timestamp"]
+# remove_duplicates strategy -> drop_duplicates keep; unknown strategies keep the first row
+DEDUP_KEEP = {"keep_last": "last", "keep_first": "first"}
+
 
 def normalize_timestamps(df: pd.DataFrame, timezone: str = "UTC") -> pd.DataFrame:
     logger.info("Normalizing timestamps", timezone=timezone)
 
-    tz = pytz.timezone(timezone)
-    df = df.copy()
-
-    def parse_timestamp(ts: str) -> datetime:
-        try:
-            dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-            if dt.tzinfo is None:
-                dt = pytz.UTC.localize(dt)
-            return dt.astimezone(tz)
-        except Exception as e:
-            logger.warning("Error parsing timestamp", timestamp=ts, error=str(e))
-            return None
+    # The whole column is parsed in one pass; naive timestamps are taken as UTC and
+    # unparseable ones become NaT and are dropped
+    timestamps = pd.to_datetime(df["timestamp"], errors="coerce", utc=True, format="ISO8601")
+    invalid = timestamps.isna()
+    if invalid.any():
+        logger.warning(
+            "Error parsing timestamps",
+            invalid_count=int(invalid.sum()),
+            sample_timestamps=df.loc[invalid, "timestamp"].head(5).tolist(),
+        )
 
-    df["timestamp"] = df["timestamp"].apply(parse_timestamp)
-    df = df.dropna(subset=["timestamp"])
-    df["timestamp"] = df["timestamp"].dt.strftime("%Y-%m-%dT%H:%M:%S%z")
+    df = df.loc[~invalid].copy()
+    df["timestamp"] = timestamps[~invalid].dt.tz_convert(timezone).dt.strftime("%Y-%m-%dT%H:%M:%S%z")
 
     logger.info("Timestamps normalized", valid_timestamps=len(df))
     return df
@@ -36,12 +36,9 @@ def normalize_timestamps(df: pd.DataFrame, timezone: str = "UTC") -> pd.DataFram
 def remove_duplicates(df: pd.DataFrame, strategy: str = "keep_last") -> pd.DataFrame:
     logger.info("Removing duplicates", strategy=strategy, initial_rows=len(df))
 
-    if strategy == "keep_last":
-        df = df.drop_duplicates(subset=["user_id", "product_id", "timestamp"], keep="last")
-    elif strategy == "keep_first":
-        df = df.drop_duplicates(subset=["user_id", "product_id", "timestamp"], keep="first")
-    else:
-        df = df.drop_duplicates(subset=["user_id", "product_id", "timestamp"])
+    # pandas factorizes each key column and hashes the combined int64 group codes,
+    # so there is no per-row tuple hashing to replace here
+    df = df.drop_duplicates(subset=DEDUP_COLUMNS, keep=DEDUP_KEEP.get(strategy, "first"))
 
     logger.info("Duplicates removed", final_rows=len(df))
     return df
@@ -64,18 +61,22 @@ def filter_valid_ratings(df: pd.DataFrame) -> pd.DataFrame:
 def encode_ids(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Dict[str, int]]]:
     logger.info("Encoding user and product IDs")
 
-    user_ids = df["user_id"].unique()
-    product_ids = df["product_id"].unique()
+    # Codes come straight from factorize (first-appearance order, like unique())
+    # instead of mapping every row through a Python dict
+    user_codes, user_ids = pd.factorize(df["user_id"])
+    product_codes, product_ids = pd.factorize(df["product_id"])
+    user_ids = list(user_ids)
+    product_ids = list(product_ids)
 
-    user_to_idx = {user_id: idx for idx, user_id in enumerate(user_ids)}
-    idx_to_user = {idx: user_id for user_id, idx in user_to_idx.items()}
+    user_to_idx = dict(zip(user_ids, range(len(user_ids))))
+    idx_to_user = dict(enumerate(user_ids))
 
-    product_to_idx = {product_id: idx for idx, product_id in enumerate(product_ids)}
-    idx_to_product = {idx: product_id for product_id, idx in product_to_idx.items()}
+    product_to_idx = dict(zip(product_ids, range(len(product_ids))))
+    idx_to_product = dict(enumerate(product_ids))
 
     df = df.copy()
-    df["user_idx"] = df["user_id"].map(user_to_idx)
-    df["product_idx"] = df["product_id"].map(product_to_idx)
+    df["user_idx"] = user_codes
+    df["product_idx"] = product_codes
 
     mappings = {
         "user_to_idx": user_to_idx,
@@ -88,13 +89,61 @@ def encode_ids(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Dict[str, int]
     return df, mappings
 
 
+def _deduplicate_and_filter_ratings(df: pd.DataFrame) -> pd.DataFrame:
+    # Same result as remove_duplicates followed by filter_valid_ratings, but both
+    # steps become one boolean mask and only the surviving rows are materialized
+    duplicated = df.duplicated(subset=DEDUP_COLUMNS, keep="last")
+    valid_rating = (df["rating"] >= RATING_MIN) & (df["rating"] <= RATING_MAX)
+    keep = ~duplicated & valid_rating
+
+    logger.info(
+        "Duplicates removed and ratings filtered",
+        duplicates=int(duplicated.sum()),
+        invalid_ratings=int((~duplicated & ~valid_rating).sum()),
+        final_rows=int(keep.sum()),
+    )
+    return df.loc[keep].copy()
+
+
 def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     logger.info("Starting data cleaning", initial_rows=len(df))
 
     df = normalize_timestamps(df)
-    df = remove_duplicates(df)
-    df = filter_valid_ratings(df)
+    df = _deduplicate_and_filter_ratings(df)
 
     logger.info("Data cleaning complete", final_rows=len(df))
     return df
 
+
+def validate_and_clean_batches(batches: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Validate and clean transactions batch by batch.
+    
+    Validation and timestamp normalization only look at one row at a time, so
+    they run on each batch while it is still in cache and only surviving rows
+    are kept. Deduplication and rating filtering need the whole data set and
+    run once on the concatenated result, in the same order as clean_data, so
+    the output matches clean_data(validate_transactions(df)).
+    
+    Args:
+        batches: Iterable of raw transaction DataFrames
+    
+    Returns:
+        Validated and cleaned transactions with a fresh RangeIndex.
+    """
+    cleaned_batches = []
+    for batch in batches:
+        batch = validate_transactions(batch)
+        if not batch.empty:
+            batch = normalize_timestamps(batch)
+        if not batch.empty:
+            cleaned_batches.append(batch)
+
+    if not cleaned_batches:
+        logger.warning("No valid transactions found")
+        return pd.DataFrame(columns=["user_id", "product_id", "rating", "timestamp"])
+
+    df = pd.concat(cleaned_batches, ignore_index=True)
+    df = _deduplicate_and_filter_ratings(df).reset_index(drop=True)
+
+    logger.info("Data cleaning complete", final_rows=len(df))
+    return df
@@ -0,0 +1,128 @@
+import gzip
+import os
+import shutil
+from typing import AbstractSet, Iterable, Optional, Set, Tuple
+
+
+def list_artifact_names(directory: str) -> Set[str]:
+    """Return the names of the entries in an artifacts directory.
+
+    Callers that check several artifacts take one os.scandir pass and test
+    membership in the returned set instead of stat-ing each path.
+
+    Args:
+        directory: Directory to scan
+
+    Returns:
+        Set of entry names; empty if the directory does not exist.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+
+def _latest_name(names: Iterable[str], prefix: str, suffix: str) -> Optional[str]:
+    return max(
+        (name for name in names if name.startswith(prefix) and name.endswith(suffix)),
+        default=None,
+    )
+
+
+def find_latest_artifact(
+    directory: str, prefix: str, suffix: str, names: Optional[AbstractSet[str]] = None
+) -> Optional[str]:
+    """Return the path of the newest versioned artifact in a directory.
+
+    Artifact names embed a sortable version (e.g. faiss_index_20240115.pkl), so the
+    lexicographically largest matching name is the latest one. A single
+    os.scandir pass is used instead of glob's pattern matching.
+
+    Args:
+        directory: Directory to scan
+        prefix: Required file name prefix (e.g. "faiss_index_")
+        suffix: Required file name suffix (e.g. ".pkl")
+        names: Entry names from list_artifact_names(), to reuse an earlier scan
+
+    Returns:
+        Path to the latest matching file, or None if there is none.
+    """
+    if names is None:
+        names = list_artifact_names(directory)
+    latest_name = _latest_name(names, prefix, suffix)
+    return os.path.join(directory, latest_name) if latest_name else None
+
+
+# FAISS indices are written natively as .faiss; .pkl is the legacy pickled format
+FAISS_INDEX_PREFIX = "faiss_index_"
+FAISS_INDEX_SUFFIX = ".faiss"
+LEGACY_FAISS_INDEX_SUFFIX = ".pkl"
+
+
+def find_latest_index(directory: str, names: Optional[AbstractSet[str]] = None) -> Optional[str]:
+    """Return the newest FAISS index in a directory, preferring the native format.
+
+    Legacy pickled indices are only considered when no .faiss index exists, so
+    directories holding artifacts from before the format change keep working.
+    Both formats are resolved from a single directory scan.
+
+    Args:
+        directory: Directory to scan
+        names: Entry names from list_artifact_names(), to reuse an earlier scan
+
+    Returns:
+        Path to the latest index file, or None if there is none.
+    """
+    if names is None:
+        names = list_artifact_names(directory)
+    latest_name = _latest_name(names, FAISS_INDEX_PREFIX, FAISS_INDEX_SUFFIX) or _latest_name(
+        names, FAISS_INDEX_PREFIX, LEGACY_FAISS_INDEX_SUFFIX
+    )
+    return os.path.join(directory, latest_name) if latest_name else None
+
+
+def index_sidecar_paths(index_path: str) -> Tuple[str, str]:
+    """Return the metadata JSON and embeddings .npy paths stored next to a .faiss index.
+
+    Works on local paths and S3 keys alike (e.g. faiss_index_20240115.faiss ->
+    faiss_index_20240115_metadata.json, faiss_index_20240115_embeddings.npy).
+
+    Args:
+        index_path: Path or key of the .faiss index file
+
+    Returns:
+        Tuple of (metadata_path, embeddings_path).
+    """
+    base = os.path.splitext(index_path)[0]
+    return f"{base}_metadata.json", f"{base}_embeddings.npy"
+
+
+# JSON catalogs are stored in S3 gzip-compressed under the same key plus this suffix
+CATALOG_ARTIFACTS = ("user_catalog.json", "product_catalog.json")
+COMPRESSED_CATALOG_SUFFIX = ".gz"
+
+
+def compress_catalog(path: str) -> bytes:
+    """Return the gzip-compressed contents of a JSON catalog for upload.
+
+    Args:
+        path: Path to the catalog JSON file
+
+    Returns:
+        Compressed bytes.
+    """
+    with open(path, "rb") as f:
+        return gzip.compress(f.read(), compresslevel=6)
+
+
+def decompress_catalog(compressed_path: str, path: str) -> None:
+    """Stream a downloaded .gz catalog into its JSON file and remove the archive.
+
+    Args:
+        compressed_path: Path of the downloaded .gz file
+        path: Destination JSON path
+    """
+    with gzip.open(compressed_path, "rb") as src, open(path, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(compressed_path)
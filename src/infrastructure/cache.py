@@ -1,27 +1,53 @@
 from typing import Any, Optional
+import base64
 import hashlib
 import json
+import threading
 import time
+from collections import OrderedDict
 from functools import wraps
 
 import diskcache
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
 from src.config.settings import settings
 from src.infrastructure.logging import get_logger
 from src.infrastructure.metrics import cache_hits_total, cache_misses_total
 
 logger = get_logger(__name__)
 
+# Bytes values are wrapped as {"__b64__": ...} when a JSON-backed cache stores them
+_BYTES_KEY = "__b64__"
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return {_BYTES_KEY: base64.b64encode(value).decode("ascii")}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _from_json(value: Any) -> Any:
+    if isinstance(value, dict) and len(value) == 1 and _BYTES_KEY in value:
+        return base64.b64decode(value[_BYTES_KEY])
+    return value
+
 
 class Cache:
     def __init__(self, cache_type: str = "memory", redis_url: Optional[str] = None):
         self.cache_type = cache_type
+        # diskcache pickles values itself; only redis stores strings and needs JSON
+        self._use_json = False
         if cache_type == "disk":
             self._cache = diskcache.Cache("data/cache")
         elif cache_type == "redis" and redis_url:
             try:
                 import redis
                 self._cache = redis.from_url(redis_url, decode_responses=True)
+                self._use_json = True
             except ImportError:
                 logger.warning("Redis not available, falling back to disk cache")
                 self._cache = diskcache.Cache("data/cache")
@@ -30,8 +56,13 @@ class Cache:
 
     def _make_key(self, prefix: str, *args, **kwargs) -> str:
         key_data = {"args": args, "kwargs": kwargs}
-        key_str = json.dumps(key_data, sort_keys=True)
-        key_hash = hashlib.md5(key_str.encode()).hexdigest()
+        if orjson is not None:
+            key_bytes = orjson.dumps(key_data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        else:
+            key_bytes = json.dumps(key_data, sort_keys=True).encode()
+        # Keys are shared through disk/redis caches, so they need a stable digest rather
+        # than hash(); BLAKE2b is faster than MD5 on 64-bit CPUs and ships with hashlib
+        key_hash = hashlib.blake2b(key_bytes, digest_size=16).hexdigest()
         return f"{prefix}:{key_hash}"
 
     def get(self, key: str) -> Optional[Any]:
@@ -39,8 +70,8 @@ class Cache:
             value = self._cache.get(key)
             if value is not None:
                 cache_hits_total.labels(cache_type=self.cache_type, operation="get").inc()
-                if isinstance(value, str):
-                    return json.loads(value)
+                if self._use_json:
+                    return _from_json(orjson.loads(value) if orjson is not None else json.loads(value))
                 return value
             cache_misses_total.labels(cache_type=self.cache_type, operation="get").inc()
             return None
@@ -50,8 +81,11 @@ class Cache:
 
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         try:
-            if isinstance(value, (dict, list)):
-                value = json.dumps(value)
+            if self._use_json:
+                if orjson is not None:
+                    value = orjson.dumps(value, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+                else:
+                    value = json.dumps(value, default=_json_default)
             if ttl:
                 self._cache.set(key, value, expire=ttl)
             else:
@@ -78,6 +112,44 @@ class Cache:
             return False
 
 
+class LocalCache:
+    """Small in-process LRU cache with a per-entry TTL.
+
+    Meant as a first tier in front of the shared cache for hot keys. Values are
+    kept as-is, never serialized, so callers must not mutate what they get back.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        cache_hits_total.labels(cache_type="local", operation="get").inc()
+        return value
+
+    def set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
 cache = Cache(
     cache_type=settings.cache_type,
     redis_url=settings.redis_url,
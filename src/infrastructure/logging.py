@@ -6,19 +6,56 @@ from structlog.types import Processor
 
 from src.config.settings import settings
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _drop_event(logger: Any, method_name: str, event_dict: dict) -> dict:
+    raise structlog.DropEvent
+
+
+def _json_renderer() -> Processor:
+    if orjson is not None:
+        # orjson renders straight to bytes; unlike json.dumps it rejects non-str
+        # dict keys (e.g. value_counts() dicts) unless told to stringify them
+        return structlog.processors.JSONRenderer(
+            serializer=orjson.dumps, option=orjson.OPT_NON_STR_KEYS
+        )
+    return structlog.processors.JSONRenderer()
+
 
 def setup_logging() -> None:
+    if settings.log_level.upper() == "OFF":
+        # Every method below CRITICAL is already a no-op on the filtering logger;
+        # the rare critical call is dropped before any rendering
+        structlog.configure(
+            processors=[_drop_event],
+            wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL),
+            context_class=dict,
+            logger_factory=structlog.PrintLoggerFactory(),
+            cache_logger_on_first_use=True,
+        )
+        return
+
+    # No call site passes stack_info, so StackInfoRenderer is left out of the chain;
+    # calls below the configured level are dropped by the filtering bound logger
+    # before any processor runs
     processors: list[Processor] = [
         structlog.contextvars.merge_contextvars,
         structlog.processors.add_log_level,
-        structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
     ]
 
+    logger_factory = structlog.PrintLoggerFactory()
     if settings.environment == "development":
         processors.append(structlog.dev.ConsoleRenderer())
     else:
-        processors.append(structlog.processors.JSONRenderer())
+        processors.append(_json_renderer())
+        if orjson is not None:
+            # orjson's bytes output is written without a decode
+            logger_factory = structlog.BytesLoggerFactory()
 
     log_level = getattr(logging, settings.log_level.upper(), logging.INFO)
 
@@ -26,7 +63,7 @@ def setup_logging() -> None:
         processors=processors,
         wrapper_class=structlog.make_filtering_bound_logger(log_level),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
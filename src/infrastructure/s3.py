@@ -0,0 +1,92 @@
+from functools import lru_cache
+from typing import Optional
+
+from src.config.settings import settings
+from src.infrastructure.artifacts import COMPRESSED_CATALOG_SUFFIX, decompress_catalog
+
+# Files transferred concurrently by the artifact upload/download thread pools
+MAX_TRANSFER_WORKERS = 8
+# Parallel part transfers per file for the multi-GB model and index artifacts
+TRANSFER_MAX_CONCURRENCY = 16
+# Every concurrent file transfer can hold TRANSFER_MAX_CONCURRENCY connections,
+# so the shared pool is sized for all of them at once
+MAX_POOL_CONNECTIONS = MAX_TRANSFER_WORKERS * TRANSFER_MAX_CONCURRENCY
+
+
+@lru_cache(maxsize=1)
+def get_transfer_config():
+    """Return the shared TransferConfig for large S3 uploads and downloads.
+
+    Objects above the threshold are transferred as parallel multipart PUTs or
+    ranged GETs.
+    """
+    from boto3.s3.transfer import TransferConfig
+
+    return TransferConfig(
+        multipart_threshold=8 * 1024 * 1024,
+        multipart_chunksize=16 * 1024 * 1024,
+        max_concurrency=TRANSFER_MAX_CONCURRENCY,
+        use_threads=True,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_s3_client():
+    """Return a process-wide S3 client so credentials and connections are reused.
+
+    boto3 clients are thread-safe, so every worker thread shares this client and
+    its connection pool. boto3 is imported on first use, so modules importing
+    this one stay cheap to load.
+    """
+    import boto3
+    from botocore.config import Config
+
+    return boto3.client(
+        "s3",
+        region_name=settings.aws_region,
+        aws_access_key_id=settings.aws_access_key_id,
+        aws_secret_access_key=settings.aws_secret_access_key,
+        config=Config(max_pool_connections=MAX_POOL_CONNECTIONS),
+    )
+
+
+def find_latest_key(s3_client, prefix: str, *suffixes: str) -> Optional[str]:
+    """Return the lexicographically largest key under a prefix with a preferred suffix.
+
+    Versioned keys sort by name, so a single paginated listing is enough; pages
+    are followed so prefixes with more than 1000 historical versions are still
+    resolved correctly. Suffixes are in order of preference: the latest key for
+    the first suffix with any match is returned, all from the same listing.
+    """
+    paginator = s3_client.get_paginator("list_objects_v2")
+    latest_keys = dict.fromkeys(suffixes)
+    for page in paginator.paginate(Bucket=settings.s3_bucket, Prefix=prefix):
+        for obj in page.get("Contents", []):
+            key = obj["Key"]
+            for suffix, latest_key in latest_keys.items():
+                if key.endswith(suffix) and (latest_key is None or key > latest_key):
+                    latest_keys[suffix] = key
+    return next((key for key in latest_keys.values() if key is not None), None)
+
+
+def download_compressed_catalog(s3_client, s3_key: str, local_path: str) -> bool:
+    """Download the gzip-compressed copy of a catalog, if one exists.
+
+    Returns:
+        True if the compressed catalog was downloaded and unpacked to local_path,
+        False if only the uncompressed object exists.
+    """
+    from botocore.exceptions import ClientError
+
+    compressed_path = local_path + COMPRESSED_CATALOG_SUFFIX
+    try:
+        s3_client.download_file(
+            settings.s3_bucket, s3_key + COMPRESSED_CATALOG_SUFFIX, compressed_path
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+            return False
+        raise
+
+    decompress_catalog(compressed_path, local_path)
+    return True
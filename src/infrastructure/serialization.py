@@ -0,0 +1,119 @@
+import json
+import mmap
+import os
+from typing import Any
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _json_default(value: Any) -> Any:
+    # numpy values become the matching JSON numbers/arrays, as with orjson's
+    # OPT_SERIALIZE_NUMPY, so both encoders write the same document
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def _nan_to_none(value: Any) -> Any:
+    # NaN/Infinity are not valid JSON; orjson writes them as null, so the
+    # stdlib fallback does the same before encoding
+    if isinstance(value, dict):
+        return {key: _nan_to_none(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_nan_to_none(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return _nan_to_none(value.tolist())
+    if isinstance(value, (float, np.floating)) and not np.isfinite(value):
+        return None
+    return value
+
+
+def write_json_report(path: str, report: Any) -> None:
+    """Write a report as indented JSON.
+
+    Uses orjson when it is installed (native numpy scalars/arrays and datetimes,
+    C-level encoding) and falls back to the stdlib encoder otherwise, which
+    writes numpy values as the same numbers and lists. NaN and Infinity are
+    written as null by both, so the file is standard JSON that can be served
+    as-is. Values neither encoder understands are written as their str().
+
+    Args:
+        path: Output file path
+        report: JSON-serializable report
+    """
+    if orjson is not None:
+        payload = orjson.dumps(
+            report,
+            default=_json_default,
+            option=orjson.OPT_INDENT_2
+            | orjson.OPT_SERIALIZE_NUMPY
+            | orjson.OPT_NON_STR_KEYS,
+        )
+        with open(path, "wb") as f:
+            f.write(payload)
+        return
+
+    with open(path, "w") as f:
+        json.dump(_nan_to_none(report), f, indent=2, default=_json_default)
+
+
+def write_json(path: str, data: Any) -> None:
+    """Write compact JSON, using orjson when it is installed.
+
+    Non-string keys (e.g. int index maps) are written as strings and numpy
+    values as plain numbers and lists, with either encoder.
+
+    Args:
+        path: Output file path
+        data: JSON-serializable data
+    """
+    if orjson is not None:
+        payload = orjson.dumps(
+            data,
+            default=_json_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+        with open(path, "wb") as f:
+            f.write(payload)
+        return
+
+    with open(path, "w") as f:
+        json.dump(data, f, default=_json_default)
+
+
+def read_json(path: str) -> Any:
+    """Read a JSON file, using orjson's C parser when it is installed.
+
+    With orjson the file is memory-mapped and parsed straight from the mapping,
+    so large catalogs are paged in by the OS instead of first being copied
+    into a bytes object. Files orjson rejects only because they hold NaN or
+    Infinity (written by the stdlib encoder, e.g. catalogs saved without orjson)
+    are re-read with the stdlib parser.
+
+    Args:
+        path: Input file path
+
+    Returns:
+        Parsed JSON data.
+    """
+    if orjson is not None:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # mmap cannot map an empty file; let orjson raise its decode error
+                return orjson.loads(b"")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    try:
+                        return orjson.loads(view)
+                    except orjson.JSONDecodeError:
+                        pass
+
+    with open(path, "r") as f:
+        return json.load(f)
@@ -1,4 +1,4 @@
-from typing import List, Tuple, Set
+from typing import Dict, List, Tuple, Set
 import pandas as pd
 import numpy as np
 
@@ -13,21 +13,32 @@ class PopularityBaseline:
         self.popularity_scores = self._compute_popularity()
 
     def _compute_popularity(self) -> pd.Series:
-        product_popularity = self.transactions_df.groupby("product_id")["rating"].agg(
-            ["count", "mean"]
-        )
-        product_popularity["score"] = (
-            product_popularity["count"] * product_popularity["mean"]
-        )
-        return product_popularity["score"].sort_values(ascending=False)
+        # count * mean is the sum of the ratings, so the score is a weighted
+        # bincount over product codes rather than a groupby aggregation
+        codes, product_ids = pd.factorize(self.transactions_df["product_id"])
+        ratings = self.transactions_df["rating"].to_numpy(dtype=np.float64)
+        rated = (codes >= 0) & ~np.isnan(ratings)
+
+        n_products = len(product_ids)
+        counts = np.bincount(codes[rated], minlength=n_products)
+        sums = np.bincount(codes[rated], weights=ratings[rated], minlength=n_products)
+        # Products without any rating have no mean, as in the groupby version
+        scores = np.where(counts > 0, sums, np.nan)
+
+        order = np.argsort(-scores, kind="stable")
+        return pd.Series(scores[order], index=np.asarray(product_ids)[order], name="score")
 
     def recommend(self, top_k: int = 10, exclude_seen: Set[str] = None) -> List[Tuple[str, float]]:
         exclude_seen = exclude_seen or set()
-        recommendations = [
-            (product_id, float(score))
-            for product_id, score in self.popularity_scores.items()
-            if product_id not in exclude_seen
-        ][:top_k]
+        recommendations = []
+        for product_id, score in zip(
+            self.popularity_scores.index.tolist(), self.popularity_scores.tolist()
+        ):
+            if product_id in exclude_seen:
+                continue
+            recommendations.append((product_id, score))
+            if len(recommendations) >= top_k:
+                break
         return recommendations
 
 
@@ -36,13 +47,29 @@ class UserPopularityBaseline:
         self.transactions_df = transactions_df
         self.user_popularity = self._compute_user_popularity()
 
-    def _compute_user_popularity(self) -> dict:
-        user_popularity = {}
-        for user_id, user_df in self.transactions_df.groupby("user_id"):
-            product_scores = user_df.groupby("product_id")["rating"].agg(["count", "mean"])
-            product_scores["score"] = product_scores["count"] * product_scores["mean"]
-            user_popularity[user_id] = product_scores["score"].sort_values(ascending=False)
-        return user_popularity
+    def _compute_user_popularity(self) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        # One groupby over (user, product) pairs and one sort replace a groupby per
+        # user; each user then owns a slice of the sorted product and score arrays
+        product_scores = self.transactions_df.groupby(
+            ["user_id", "product_id"], sort=False, observed=True
+        )["rating"].agg(["count", "mean"])
+        product_scores["score"] = product_scores["count"] * product_scores["mean"]
+        ranked = product_scores["score"].reset_index().sort_values(
+            ["user_id", "score", "product_id"], ascending=[True, False, True]
+        )
+        if ranked.empty:
+            return {}
+
+        user_ids = ranked["user_id"].to_numpy()
+        product_ids = ranked["product_id"].to_numpy()
+        scores = ranked["score"].to_numpy(dtype=np.float64)
+
+        starts = np.flatnonzero(np.r_[True, user_ids[1:] != user_ids[:-1]])
+        ends = np.r_[starts[1:], len(user_ids)]
+        return {
+            user_ids[start]: (product_ids[start:end], scores[start:end])
+            for start, end in zip(starts.tolist(), ends.tolist())
+        }
 
     def recommend(
         self, user_id: str, top_k: int = 10, exclude_seen: Set[str] = None
@@ -51,10 +78,13 @@ class UserPopularityBaseline:
         if user_id not in self.user_popularity:
             return []
 
-        recommendations = [
-            (product_id, float(score))
-            for product_id, score in self.user_popularity[user_id].items()
-            if product_id not in exclude_seen
-        ][:top_k]
+        product_ids, scores = self.user_popularity[user_id]
+        recommendations = []
+        for product_id, score in zip(product_ids.tolist(), scores.tolist()):
+            if product_id in exclude_seen:
+                continue
+            recommendations.append((product_id, score))
+            if len(recommendations) >= top_k:
+                break
         return recommendations
 
@@ -1,4 +1,4 @@
-from typing import List, Tuple, Set, Optional
+from typing import Dict, List, Tuple, Set, Optional
 import numpy as np
 import pandas as pd
 import joblib
@@ -9,6 +9,10 @@ from src.infrastructure.logging import get_logger
 
 logger = get_logger(__name__)
 
+# recommend_batch scores this many users at a time, bounding the dense
+# users-by-items score block it holds in memory
+RECOMMEND_BATCH_BLOCK_USERS = 256
+
 
 class CollaborativeFilter:
     def __init__(
@@ -27,28 +31,37 @@ class CollaborativeFilter:
         self.idx_to_user: dict = {}
         self.product_to_idx: dict = {}
         self.idx_to_product: dict = {}
+        # idx -> product_id as an array, so result indices map to IDs with one take
+        self.product_ids: np.ndarray = np.array([], dtype=object)
 
     def _prepare_matrix(self, df: pd.DataFrame) -> csr_matrix:
-        unique_users = df["user_id"].unique()
-        unique_products = df["product_id"].unique()
-
-        self.user_to_idx = {user_id: idx for idx, user_id in enumerate(unique_users)}
-        self.idx_to_user = {idx: user_id for user_id, idx in self.user_to_idx.items()}
-
-        self.product_to_idx = {product_id: idx for idx, product_id in enumerate(unique_products)}
-        self.idx_to_product = {idx: product_id for product_id, idx in self.product_to_idx.items()}
-
-        user_indices = df["user_id"].map(self.user_to_idx).values
-        product_indices = df["product_id"].map(self.product_to_idx).values
-
+        # factorize numbers IDs in order of first appearance (the same order as
+        # unique()) and returns the row/column codes directly, so there is no
+        # per-row dict lookup through map(); categorical columns use their codes
+        user_indices, unique_users = pd.factorize(df["user_id"])
+        product_indices, unique_products = pd.factorize(df["product_id"])
+        unique_users = list(unique_users)
+        unique_products = list(unique_products)
+
+        self.user_to_idx = dict(zip(unique_users, range(len(unique_users))))
+        self.idx_to_user = dict(enumerate(unique_users))
+
+        self.product_to_idx = dict(zip(unique_products, range(len(unique_products))))
+        self.idx_to_product = dict(enumerate(unique_products))
+        self.product_ids = np.asarray(unique_products, dtype=object)
+
+        # implicit trains in float32, so the matrix is built in float32 up front
+        # instead of as float64 that ALS would convert (and copy) again
         if "rating" in df.columns:
-            ratings = df["rating"].values
-            weights = ratings * self.alpha
+            weights = df["rating"].to_numpy(dtype=np.float32) * np.float32(self.alpha)
         else:
-            weights = np.ones(len(df)) * self.alpha
+            weights = np.full(len(df), self.alpha, dtype=np.float32)
 
+        # SciPy converts COO triplets to CSR with a linear counting pass and sums
+        # repeated (user, product) pairs, which ALS needs as one entry; pre-sorting
+        # the triplets here would add an O(n log n) sort without saving that work
         matrix = csr_matrix(
-            (weights, (user_indices, product_indices)),
+            (weights, (user_indices.astype(np.int32), product_indices.astype(np.int32))),
             shape=(len(unique_users), len(unique_products)),
         )
 
@@ -62,6 +75,7 @@ class CollaborativeFilter:
             factors=self.factors,
             iterations=self.iterations,
             regularization=self.regularization,
+            dtype=np.float32,
             random_state=42,
         )
 
@@ -81,20 +95,62 @@ class CollaborativeFilter:
         exclude_seen = exclude_seen or set()
         user_idx = self.user_to_idx[user_id]
 
+        # Seen products are excluded inside implicit's top-k selection, so exactly
+        # top_k items are requested instead of over-fetching and filtering here
+        filter_items = np.fromiter(
+            (self.product_to_idx[p] for p in exclude_seen if p in self.product_to_idx),
+            dtype=np.int32,
+        )
         product_indices, scores = self.model.recommend(
             user_idx,
             self.model.user_factors[user_idx],
-            N=top_k + len(exclude_seen),
+            N=top_k,
             filter_already_liked_items=False,
+            filter_items=filter_items if len(filter_items) else None,
         )
 
-        recommendations = []
-        for product_idx, score in zip(product_indices, scores):
-            product_id = self.idx_to_product.get(product_idx)
-            if product_id and product_id not in exclude_seen:
-                recommendations.append((product_id, float(score)))
-            if len(recommendations) >= top_k:
-                break
+        found = product_indices >= 0
+        return list(zip(self.product_ids[product_indices[found]].tolist(), scores[found].tolist()))
+
+    def recommend_batch(
+        self, user_ids: List[str], top_k: int = 10
+    ) -> Dict[str, List[Tuple[str, float]]]:
+        """Recommend for many users with one user-by-item score matrix product per block.
+
+        Users are scored RECOMMEND_BATCH_BLOCK_USERS at a time, so memory stays at
+        one block of scores however many users are passed. Users not present in
+        the training data get an empty list.
+        """
+        if self.model is None:
+            raise ValueError("Model not trained. Call fit() first.")
+
+        known_users = [user_id for user_id in user_ids if user_id in self.user_to_idx]
+        recommendations: Dict[str, List[Tuple[str, float]]] = {user_id: [] for user_id in user_ids}
+        if not known_users:
+            return recommendations
+
+        user_indices = np.fromiter(
+            (self.user_to_idx[user_id] for user_id in known_users), dtype=np.int64, count=len(known_users)
+        )
+        item_factors_t = np.asarray(self.model.item_factors).T
+        n = min(top_k, item_factors_t.shape[1])
+        if n == 0:
+            return recommendations
+
+        for start in range(0, len(known_users), RECOMMEND_BATCH_BLOCK_USERS):
+            stop = start + RECOMMEND_BATCH_BLOCK_USERS
+            block_users = known_users[start:stop]
+            scores = self.model.user_factors[user_indices[start:stop]] @ item_factors_t
+
+            top_indices = np.argpartition(-scores, n - 1, axis=1)[:, :n]
+            top_scores = np.take_along_axis(scores, top_indices, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            top_indices = np.take_along_axis(top_indices, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+            top_ids = self.product_ids[top_indices].tolist()
+            for user_id, product_ids, user_scores in zip(block_users, top_ids, top_scores.tolist()):
+                recommendations[user_id] = list(zip(product_ids, user_scores))
 
         return recommendations
 
@@ -109,29 +165,25 @@ class CollaborativeFilter:
         product_idx = self.product_to_idx[product_id]
         similar_indices, scores = self.model.similar_items(product_idx, N=top_k + 1)
 
-        recommendations = []
-        for similar_idx, score in zip(similar_indices, scores):
-            if similar_idx == product_idx:
-                continue
-            similar_product_id = self.idx_to_product.get(similar_idx)
-            if similar_product_id:
-                recommendations.append((similar_product_id, float(score)))
-            if len(recommendations) >= top_k:
-                break
-
-        return recommendations
+        # The queried product is masked out and the rest mapped to IDs in one take
+        keep = (similar_indices != product_idx) & (similar_indices >= 0)
+        similar_ids = self.product_ids[similar_indices[keep]][:top_k]
+        return list(zip(similar_ids.tolist(), scores[keep][:top_k].tolist()))
 
     def save(self, file_path: str) -> None:
         logger.info("Saving collaborative filter", file_path=file_path)
         if self.model is None:
             raise ValueError("Model not trained. Call fit() first.")
 
+        # Factors are stored as plain arrays and IDs as index-ordered lists, rather
+        # than pickling the implicit model object and four ID dicts; joblib writes
+        # the arrays raw so load() can memory-map them
+        model = self.model.to_cpu() if hasattr(self.model, "to_cpu") else self.model
         model_data = {
-            "model": self.model,
-            "user_to_idx": self.user_to_idx,
-            "idx_to_user": self.idx_to_user,
-            "product_to_idx": self.product_to_idx,
-            "idx_to_product": self.idx_to_product,
+            "user_factors": np.asarray(model.user_factors),
+            "item_factors": np.asarray(model.item_factors),
+            "user_ids": list(self.idx_to_user.values()),
+            "product_ids": list(self.idx_to_product.values()),
             "factors": self.factors,
             "iterations": self.iterations,
             "regularization": self.regularization,
@@ -144,7 +196,7 @@ class CollaborativeFilter:
     @classmethod
     def load(cls, file_path: str) -> "CollaborativeFilter":
         logger.info("Loading collaborative filter", file_path=file_path)
-        model_data = joblib.load(file_path)
+        model_data = joblib.load(file_path, mmap_mode="r")
 
         instance = cls(
             factors=model_data["factors"],
@@ -153,11 +205,34 @@ class CollaborativeFilter:
             alpha=model_data["alpha"],
         )
 
-        instance.model = model_data["model"]
-        instance.user_to_idx = model_data["user_to_idx"]
-        instance.idx_to_user = model_data["idx_to_user"]
-        instance.product_to_idx = model_data["product_to_idx"]
-        instance.idx_to_product = model_data["idx_to_product"]
+        if "model" in model_data:
+            # Files saved before the array layout pickle the model and all four maps
+            instance.model = model_data["model"]
+            instance.user_to_idx = model_data["user_to_idx"]
+            instance.idx_to_user = model_data["idx_to_user"]
+            instance.product_to_idx = model_data["product_to_idx"]
+            instance.idx_to_product = model_data["idx_to_product"]
+            instance.product_ids = np.asarray(list(instance.idx_to_product.values()), dtype=object)
+        else:
+            from implicit.cpu.als import AlternatingLeastSquares as CPUAlternatingLeastSquares
+
+            model = CPUAlternatingLeastSquares(
+                factors=instance.factors,
+                iterations=instance.iterations,
+                regularization=instance.regularization,
+                random_state=42,
+            )
+            model.user_factors = model_data["user_factors"]
+            model.item_factors = model_data["item_factors"]
+            instance.model = model
+
+            user_ids = model_data["user_ids"]
+            product_ids = model_data["product_ids"]
+            instance.user_to_idx = dict(zip(user_ids, range(len(user_ids))))
+            instance.idx_to_user = dict(enumerate(user_ids))
+            instance.product_to_idx = dict(zip(product_ids, range(len(product_ids))))
+            instance.idx_to_product = dict(enumerate(product_ids))
+            instance.product_ids = np.asarray(product_ids, dtype=object)
 
         logger.info("Collaborative filter loaded")
         return instance
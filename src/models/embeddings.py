@@ -1,5 +1,13 @@
-from typing import List, Dict, Optional
+import hashlib
+import mmap
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Union
 import numpy as np
+import pandas as pd
 from openai import OpenAI
 from tenacity import retry, stop_after_attempt, wait_exponential
 from tqdm import tqdm
@@ -10,6 +18,88 @@ from src.infrastructure.metrics import openai_api_calls_total
 
 logger = get_logger(__name__)
 
+# Embedding requests are network-bound, so several batches are kept in flight at once
+MAX_EMBEDDING_WORKERS = 16
+# OpenAI's default embeddings rate limit; concurrent batches are paced to stay below it
+EMBEDDING_REQUESTS_PER_MINUTE = 3000
+# Default location of the persistent EmbeddingCache used by the pipeline scripts
+EMBEDDING_CACHE_PATH = "data/cache/embeddings.sqlite"
+
+
+class _RequestPacer:
+    """Space request starts evenly so concurrent workers stay under a per-minute limit."""
+
+    def __init__(self, requests_per_minute: int):
+        self._interval = 60.0 / requests_per_minute
+        self._lock = threading.Lock()
+        self._next_start = time.monotonic()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self._interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class EmbeddingCache:
+    """Persistent store of embedding vectors keyed by model and product text.
+    
+    Vectors live in a SQLite table keyed by a 16-byte BLAKE2b digest of the
+    model id, embedding dimension and text, so an unchanged product text is
+    never sent to the API twice, even across runs. Vectors are stored as
+    float32 bytes.
+    
+    Args:
+        file_path: Path of the SQLite database; created if missing.
+    
+    Example:
+        >>> cache = EmbeddingCache("data/cache/embeddings.sqlite")
+        >>> embeddings = generate_embeddings(products, cache=cache)
+    """
+
+    # Keys per SELECT; stays below SQLite's default limit on bound parameters
+    _LOOKUP_CHUNK = 500
+
+    def __init__(self, file_path: str):
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file_path = file_path
+        self._connection = sqlite3.connect(file_path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+        )
+
+    @staticmethod
+    def make_key(text: str, model_id: str, dimension: int) -> bytes:
+        return hashlib.blake2b(f"{model_id}\x00{dimension}\x00{text}".encode(), digest_size=16).digest()
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """Return the stored float32 vectors for whichever keys are present."""
+        found = {}
+        for start in range(0, len(keys), self._LOOKUP_CHUNK):
+            chunk = keys[start : start + self._LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._connection.execute(
+                f"SELECT key, vec FROM embeddings WHERE key IN ({placeholders})", chunk
+            )
+            for key, vec in rows:
+                found[key] = np.frombuffer(vec, dtype=np.float32)
+        return found
+
+    def put_many(self, keys: List[bytes], vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)",
+                ((key, vector.tobytes()) for key, vector in zip(keys, vectors)),
+            )
+
+    def close(self) -> None:
+        self._connection.close()
+
 
 def prepare_product_text(product: Dict[str, str]) -> str:
     """Prepare product text for embedding generation.
@@ -48,6 +138,42 @@ def prepare_product_text(product: Dict[str, str]) -> str:
     return text
 
 
+def prepare_product_texts(products_df: pd.DataFrame) -> List[str]:
+    """Prepare embedding texts for a whole product DataFrame at once.
+    
+    Column-wise equivalent of prepare_product_text: the name, description and
+    "Category: ..." parts are concatenated with vectorized string operations
+    instead of building one dictionary per row. Missing columns and null values
+    are treated as empty strings.
+    
+    Args:
+        products_df: DataFrame with optional name, description and category columns
+    
+    Returns:
+        List with one combined text string per row, in row order.
+    
+    Example:
+        >>> df = pd.DataFrame({"name": ["Laptop"], "category": ["Electronics"]})
+        >>> prepare_product_texts(df)
+        ['Laptop Category: Electronics']
+    """
+    def column(name: str) -> pd.Series:
+        if name not in products_df.columns:
+            return pd.Series("", index=products_df.index, dtype=object)
+        return products_df[name].fillna("").astype(str)
+
+    description = column("description")
+    category = column("category")
+
+    text = (
+        column("name")
+        + description.where(description == "", " " + description)
+        + category.where(category == "", " Category: " + category)
+    ).str.strip()
+
+    return text.mask(text == "", "Product").tolist()
+
+
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
 def get_embedding(client: OpenAI, text: str) -> List[float]:
     """Get embedding vector for a text using OpenAI API.
@@ -85,15 +211,65 @@ def get_embedding(client: OpenAI, text: str) -> List[float]:
         raise
 
 
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+def get_embeddings_batch(client: OpenAI, texts: List[str]) -> List[List[float]]:
+    """Get embedding vectors for several texts with a single OpenAI API call.
+    
+    The embeddings endpoint accepts a list of inputs and returns one vector per
+    input in the same order, so a batch costs one round-trip instead of one per
+    text. Retries and metrics work as in get_embedding.
+    
+    Args:
+        client: OpenAI client instance
+        texts: Texts to generate embeddings for
+    
+    Returns:
+        List of embedding vectors, one per input text, in input order
+    
+    Raises:
+        Exception: If the request fails after retries or returns the wrong
+            number of vectors
+    
+    Example:
+        >>> client = OpenAI(api_key="...")
+        >>> embeddings = get_embeddings_batch(client, ["laptop", "mouse"])
+        >>> len(embeddings)
+        2
+    """
+    try:
+        response = client.embeddings.create(
+            model=settings.openai_model_id,
+            input=texts,
+            dimensions=settings.openai_embedding_dimension,
+        )
+        if len(response.data) != len(texts):
+            raise ValueError(
+                f"Expected {len(texts)} embeddings, got {len(response.data)}"
+            )
+        openai_api_calls_total.labels(operation="embedding", status="success").inc()
+        return [item.embedding for item in response.data]
+    except Exception as e:
+        openai_api_calls_total.labels(operation="embedding", status="error").inc()
+        logger.error("Error getting embeddings batch", batch_size=len(texts), error=str(e))
+        raise
+
+
 def generate_embeddings(
-    products: List[Dict[str, str]],
+    products: Union[List[Dict[str, str]], pd.DataFrame],
     batch_size: int = 100,
     client: Optional[OpenAI] = None,
+    max_workers: int = MAX_EMBEDDING_WORKERS,
+    requests_per_minute: Optional[int] = EMBEDDING_REQUESTS_PER_MINUTE,
+    cache: Optional[EmbeddingCache] = None,
 ) -> np.ndarray:
     """Generate embeddings for a list of products in batches.
     
     Processes products in batches to optimize API usage and handle rate limits.
-    Uses progress bar to show generation progress.
+    Duplicate texts are only embedded once. Each batch is embedded with a single
+    API request, batches are issued concurrently from a thread pool, and results
+    keep the input order. If a batch request fails, its texts are retried one by
+    one. With a cache, texts already embedded by the same model are read from it
+    and only the rest are requested. Uses progress bar to show generation progress.
     
     Args:
         products: List of product dictionaries, each containing:
@@ -101,8 +277,17 @@ def generate_embeddings(
             - name: Product name
             - description: Product description (optional)
             - category: Product category (optional)
+            A DataFrame with the same columns is also accepted; its texts are
+            then built column-wise with prepare_product_texts.
         batch_size: Number of products to process per batch. Defaults to 100.
         client: Optional OpenAI client. If None, creates a new client.
+        max_workers: Maximum number of concurrent batch requests.
+            Defaults to MAX_EMBEDDING_WORKERS.
+        requests_per_minute: Batch requests are started no faster than this
+            rate across all workers. None disables pacing. Defaults to
+            EMBEDDING_REQUESTS_PER_MINUTE.
+        cache: Optional EmbeddingCache. Cached texts skip the API and newly
+            embedded ones are added to it; failed (zero) vectors are not cached.
     
     Returns:
         NumPy array of shape (n_products, embedding_dimension) containing
@@ -122,39 +307,111 @@ def generate_embeddings(
     if client is None:
         client = OpenAI(api_key=settings.openai_api_key)
 
-    embeddings = []
-    product_texts = [prepare_product_text(product) for product in products]
+    if isinstance(products, pd.DataFrame):
+        product_texts = prepare_product_texts(products)
+    else:
+        product_texts = [prepare_product_text(product) for product in products]
+
+    def embed_text(text: str) -> List[float]:
+        try:
+            return get_embedding(client, text)
+        except Exception as e:
+            logger.error("Failed to get embedding", text=text[:50], error=str(e))
+            return [0.0] * settings.openai_embedding_dimension
+
+    # Identical texts (shared titles, placeholder descriptions) are embedded once
+    # and scattered back to every product that uses them
+    text_codes, unique_texts = pd.factorize(pd.Series(product_texts, dtype=object))
+    unique_texts = unique_texts.tolist()
+    if len(unique_texts) < len(product_texts):
+        logger.info(
+            "Deduplicated product texts",
+            total_texts=len(product_texts),
+            unique_texts=len(unique_texts),
+            dedup_ratio=round(1 - len(unique_texts) / len(product_texts), 4),
+        )
+
+    pacer = _RequestPacer(requests_per_minute) if requests_per_minute else None
+
+    def embed_batch(batch_texts: List[str]) -> List[List[float]]:
+        if pacer is not None:
+            pacer.wait()
+        try:
+            return get_embeddings_batch(client, batch_texts)
+        except Exception as e:
+            # One bad input fails the whole request, so the texts are retried
+            # individually and only the failing ones become zero vectors
+            logger.warning(
+                "Batch embedding failed, retrying texts individually",
+                batch_size=len(batch_texts),
+                error=str(e),
+            )
+            return [embed_text(text) for text in batch_texts]
+
+    # Each batch is written straight into a preallocated float32 matrix instead of
+    # collecting every vector in one large list of lists first
+    embeddings = np.empty((len(unique_texts), settings.openai_embedding_dimension), dtype=np.float32)
 
-    for i in tqdm(range(0, len(product_texts), batch_size), desc="Generating embeddings"):
-        batch_texts = product_texts[i : i + batch_size]
-        batch_embeddings = []
+    pending_rows = np.arange(len(unique_texts))
+    if cache is not None:
+        cache_keys = [
+            EmbeddingCache.make_key(text, settings.openai_model_id, settings.openai_embedding_dimension)
+            for text in unique_texts
+        ]
+        cached = cache.get_many(cache_keys)
+        is_cached = np.fromiter((key in cached for key in cache_keys), dtype=bool, count=len(cache_keys))
+        for row in np.flatnonzero(is_cached):
+            embeddings[row] = cached[cache_keys[row]]
+        pending_rows = np.flatnonzero(~is_cached)
+        logger.info("Embedding cache lookup", cached=int(is_cached.sum()), pending=len(pending_rows))
 
-        for text in batch_texts:
-            try:
-                embedding = get_embedding(client, text)
-                batch_embeddings.append(embedding)
-            except Exception as e:
-                logger.error("Failed to get embedding", text=text[:50], error=str(e))
-                batch_embeddings.append([0.0] * settings.openai_embedding_dimension)
+    pending_texts = [unique_texts[row] for row in pending_rows]
+    batch_starts = range(0, len(pending_texts), batch_size)
+    batches = [pending_texts[start : start + batch_size] for start in batch_starts]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for start, batch_embeddings in zip(
+            batch_starts,
+            tqdm(executor.map(embed_batch, batches), total=len(batches), desc="Generating embeddings"),
+        ):
+            embeddings[pending_rows[start : start + len(batch_embeddings)]] = batch_embeddings
 
-        embeddings.extend(batch_embeddings)
+    if cache is not None and len(pending_rows):
+        new_rows = pending_rows[embeddings[pending_rows].any(axis=1)]
+        cache.put_many([cache_keys[row] for row in new_rows], embeddings[new_rows])
 
-    embeddings_array = np.array(embeddings, dtype=np.float32)
+    embeddings_array = embeddings[text_codes]
     logger.info("Embeddings generated", shape=embeddings_array.shape)
 
     return embeddings_array
 
 
-def save_embeddings(embeddings: np.ndarray, file_path: str, metadata: Optional[Dict] = None) -> None:
+def save_embeddings(
+    embeddings: np.ndarray,
+    file_path: str,
+    metadata: Optional[Dict] = None,
+    dtype: np.dtype = np.float16,
+    compressed: bool = False,
+) -> str:
     """Save embeddings to disk in NumPy format.
     
     Saves embeddings array as .npy file and optionally saves metadata as JSON.
+    Embeddings are stored as float16 by default, which halves the bytes read on
+    every index build and upload; OpenAI embeddings tolerate the rounding.
+    With compressed=True a zip-deflated .npz archive is written instead, which
+    is smaller to ship but cannot be memory-mapped on load.
     
     Args:
         embeddings: NumPy array of embeddings with shape (n_samples, dimension)
         file_path: Path to save the .npy file
         metadata: Optional dictionary with metadata (e.g., model_id, date, product_ids).
-            If provided, saves to a .json file with the same base name.
+            If provided, saves to a .json file with the same base name, adding the
+            stored dtype, shape and file name.
+        dtype: Storage dtype. Defaults to float16.
+        compressed: Write a compressed .npz archive next to file_path instead of
+            the .npy file. Defaults to False.
+    
+    Returns:
+        Path of the written embeddings file.
     
     Example:
         >>> embeddings = np.random.rand(100, 1536).astype(np.float32)
@@ -163,25 +420,76 @@ def save_embeddings(embeddings: np.ndarray, file_path: str, metadata: Optional[D
     """
     logger.info("Saving embeddings", file_path=file_path, shape=embeddings.shape)
 
-    np.save(file_path, embeddings)
+    embeddings = embeddings.astype(dtype, copy=False)
+    base_path = os.path.splitext(file_path)[0]
+    if compressed:
+        file_path = f"{base_path}.npz"
+        np.savez_compressed(file_path, embeddings=embeddings)
+    else:
+        np.save(file_path, embeddings, allow_pickle=False)
 
     if metadata:
         import json
-        metadata_path = file_path.replace(".npy", "_metadata.json")
+        metadata_path = f"{base_path}_metadata.json"
         with open(metadata_path, "w") as f:
-            json.dump(metadata, f, indent=2)
+            json.dump(
+                {
+                    **metadata,
+                    "dtype": embeddings.dtype.name,
+                    "shape": list(embeddings.shape),
+                    "file": os.path.basename(file_path),
+                },
+                f,
+                indent=2,
+            )
+
+    logger.info("Embeddings saved", file_path=file_path, dtype=embeddings.dtype.name)
+    return file_path
 
-    logger.info("Embeddings saved")
 
+def _map_npy_sequential(file_path: str) -> Optional[np.ndarray]:
+    """Map a .npy file read-only and advise the kernel to read it ahead.
+
+    Index builds read the matrix front to back. np.memmap does not expose its
+    mapping, so the file is mapped here and the array viewed over it. Returns
+    None for header versions this does not parse, so the caller can use np.load.
+    """
+    with open(file_path, "rb") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        elif version == (2, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        else:
+            return None
+        if dtype.hasobject:
+            return None
+        offset = f.tell()
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
-def load_embeddings(file_path: str) -> np.ndarray:
+    mapping.madvise(mmap.MADV_SEQUENTIAL)
+    # The array holds a reference to the mapping, which outlives the closed file
+    return np.ndarray(
+        shape, dtype=dtype, buffer=mapping, offset=offset, order="F" if fortran_order else "C"
+    )
+
+
+def load_embeddings(file_path: str, mmap_mode: Optional[str] = "r") -> np.ndarray:
     """Load embeddings from disk.
     
+    .npy files are memory-mapped read-only by default, so rows are only read (and upcast
+    by consumers such as FAISSVectorStore.add_embeddings) when they are used.
+    Compressed .npz archives written by save_embeddings are decompressed into
+    memory.
+    
     Args:
-        file_path: Path to the .npy file containing embeddings
+        file_path: Path to the .npy or .npz file containing embeddings
+        mmap_mode: Memory-map mode passed to np.load for .npy files, or None to
+            read the whole file into memory. Defaults to read-only mapping.
     
     Returns:
-        NumPy array of embeddings with shape (n_samples, dimension)
+        NumPy array of embeddings with shape (n_samples, dimension), in the
+        dtype they were stored with
     
     Example:
         >>> embeddings = load_embeddings("embeddings.npy")
@@ -189,7 +497,14 @@ def load_embeddings(file_path: str) -> np.ndarray:
         (100, 1536)
     """
     logger.info("Loading embeddings", file_path=file_path)
-    embeddings = np.load(file_path)
-    logger.info("Embeddings loaded", shape=embeddings.shape)
+    if file_path.endswith(".npz"):
+        with np.load(file_path) as archive:
+            embeddings = archive["embeddings"]
+    else:
+        embeddings = None
+        if mmap_mode == "r" and hasattr(mmap, "MADV_SEQUENTIAL"):
+            embeddings = _map_npy_sequential(file_path)
+        if embeddings is None:
+            embeddings = np.load(file_path, mmap_mode=mmap_mode)
+    logger.info("Embeddings loaded", shape=embeddings.shape, dtype=embeddings.dtype.name)
     return embeddings
-
@@ -1,74 +1,105 @@
-from typing import List, Tuple, Dict, Any, Callable
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from typing import AbstractSet, Collection, FrozenSet, List, Tuple, Dict, Any, Callable, Optional
 import numpy as np
 import pandas as pd
+from tqdm import tqdm
 
 from src.infrastructure.logging import get_logger
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=32)
+def _rank_discounts(k: int) -> Tuple[float, ...]:
+    """DCG discounts 1 / log2(rank + 1) for ranks 1..k as plain floats."""
+    return tuple((1.0 / np.log2(np.arange(k) + 2)).tolist())
+
+
 class RecommenderEvaluator:
     def __init__(self, test_df: pd.DataFrame):
         self.test_df = test_df
         self.user_ground_truth = self._build_ground_truth()
 
-    def _build_ground_truth(self) -> Dict[str, List[str]]:
-        ground_truth = {}
-        for user_id, user_df in self.test_df.groupby("user_id"):
-            relevant_items = user_df[user_df["rating"] >= 4]["product_id"].tolist()
-            ground_truth[user_id] = relevant_items
+        # _idcg_lut[n - 1] is the ideal DCG of n relevant items at the top
+        max_relevant = max((len(items) for items in self.user_ground_truth.values()), default=0)
+        self._idcg_lut = np.cumsum(1.0 / np.log2(np.arange(max_relevant) + 2))
+
+    def _build_ground_truth(self) -> Dict[str, FrozenSet[str]]:
+        """Map every test user to the frozenset of items they rated >= 4.
+
+        Users without relevant items keep an empty set so they are still scored.
+        """
+        relevant = self.test_df.loc[self.test_df["rating"] >= 4]
+        ground_truth = dict.fromkeys(np.sort(self.test_df["user_id"].unique()), frozenset())
+        ground_truth.update(relevant.groupby("user_id")["product_id"].agg(frozenset).to_dict())
         return ground_truth
 
+    @staticmethod
+    def _as_set(ground_truth: Collection[str]) -> AbstractSet[str]:
+        return ground_truth if isinstance(ground_truth, AbstractSet) else frozenset(ground_truth)
+
+    def _idcg(self, n_relevant: int) -> float:
+        if n_relevant <= 0:
+            return 0.0
+        if n_relevant <= len(self._idcg_lut):
+            return float(self._idcg_lut[n_relevant - 1])
+        return float(np.sum(1.0 / np.log2(np.arange(n_relevant) + 2)))
+
     def precision_at_k(
-        self, recommendations: List[str], ground_truth: List[str], k: int
+        self, recommendations: List[str], ground_truth: Collection[str], k: int
     ) -> float:
         if k == 0:
             return 0.0
 
         top_k = recommendations[:k]
-        relevant = set(ground_truth)
+        relevant = self._as_set(ground_truth)
         hits = sum(1 for item in top_k if item in relevant)
         return hits / k
 
     def recall_at_k(
-        self, recommendations: List[str], ground_truth: List[str], k: int
+        self, recommendations: List[str], ground_truth: Collection[str], k: int
     ) -> float:
         if len(ground_truth) == 0:
             return 0.0
 
         top_k = recommendations[:k]
-        relevant = set(ground_truth)
+        relevant = self._as_set(ground_truth)
         hits = sum(1 for item in top_k if item in relevant)
         return hits / len(ground_truth)
 
     def ndcg_at_k(
-        self, recommendations: List[str], ground_truth: List[str], k: int
+        self, recommendations: List[str], ground_truth: Collection[str], k: int
     ) -> float:
         if len(ground_truth) == 0:
             return 0.0
 
         top_k = recommendations[:k]
-        relevant = set(ground_truth)
+        relevant = self._as_set(ground_truth)
 
+        # Discounts come from a cached table instead of one NumPy scalar call per hit
+        discounts = _rank_discounts(len(top_k))
         dcg = 0.0
         for i, item in enumerate(top_k):
             if item in relevant:
-                dcg += 1.0 / np.log2(i + 2)
+                dcg += discounts[i]
 
-        idcg = sum(1.0 / np.log2(i + 2) for i in range(min(len(ground_truth), k)))
+        idcg = self._idcg(min(len(ground_truth), k))
         if idcg == 0:
             return 0.0
 
         return dcg / idcg
 
     def map_at_k(
-        self, recommendations: List[str], ground_truth: List[str], k: int
+        self, recommendations: List[str], ground_truth: Collection[str], k: int
     ) -> float:
         if len(ground_truth) == 0:
             return 0.0
 
         top_k = recommendations[:k]
-        relevant = set(ground_truth)
+        relevant = self._as_set(ground_truth)
 
         if not relevant:
             return 0.0
@@ -94,42 +125,109 @@ class RecommenderEvaluator:
         self,
         recommender_func: Callable[[str, int], List[Tuple[str, float]]],
         k_values: List[int] = [5, 10, 20],
+        max_workers: Optional[int] = None,
     ) -> Dict[str, Any]:
+        """Score recommender_func against the test set.
+
+        Users are independent, so recommender_func is called for them
+        concurrently from a thread pool of max_workers threads (os.cpu_count()
+        by default); it must therefore be safe to call from several threads.
+        """
         logger.info("Starting evaluation", k_values=k_values)
 
-        results = {}
-        for k in k_values:
-            results[f"precision@{k}"] = []
-            results[f"recall@{k}"] = []
-            results[f"ndcg@{k}"] = []
-            results[f"map@{k}"] = []
+        # One call per user at the largest k; smaller k values are prefix slices.
+        max_k = max(k_values)
 
-        for user_id, ground_truth in self.user_ground_truth.items():
+        def recommend_items(user_id: str) -> List[str]:
             try:
-                recommendations_with_scores = recommender_func(user_id, top_k=max(k_values))
-                recommendations = [item_id for item_id, _ in recommendations_with_scores]
-
-                for k in k_values:
-                    results[f"precision@{k}"].append(
-                        self.precision_at_k(recommendations, ground_truth, k)
-                    )
-                    results[f"recall@{k}"].append(
-                        self.recall_at_k(recommendations, ground_truth, k)
-                    )
-                    results[f"ndcg@{k}"].append(
-                        self.ndcg_at_k(recommendations, ground_truth, k)
-                    )
-                    results[f"map@{k}"].append(
-                        self.map_at_k(recommendations, ground_truth, k)
-                    )
-
+                recommendations_with_scores = recommender_func(user_id, top_k=max_k)
+                return [item_id for item_id, _ in recommendations_with_scores]
             except Exception as e:
                 logger.warning("Error evaluating user", user_id=user_id, error=str(e))
-                for k in k_values:
-                    results[f"precision@{k}"].append(0.0)
-                    results[f"recall@{k}"].append(0.0)
-                    results[f"ndcg@{k}"].append(0.0)
-                    results[f"map@{k}"].append(0.0)
+                return []
+
+        user_ids = list(self.user_ground_truth)
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            all_recommendations = dict(
+                zip(
+                    user_ids,
+                    tqdm(executor.map(recommend_items, user_ids), total=len(user_ids), desc="Evaluating users"),
+                )
+            )
+
+        return self.evaluate_recommendations(all_recommendations, k_values=k_values)
+
+    def _hit_matrix(
+        self, user_ids: List[str], all_recommendations: Dict[str, List[str]], max_k: int
+    ) -> np.ndarray:
+        """Boolean (n_users, max_k) matrix marking which ranked items are relevant."""
+        truncated = [all_recommendations.get(user_id, [])[:max_k] for user_id in user_ids]
+        lengths = np.fromiter((len(items) for items in truncated), dtype=np.int64, count=len(truncated))
+        hits = np.zeros((len(user_ids), max_k), dtype=bool)
+        if lengths.sum() == 0:
+            return hits
+
+        # (user row, item) pairs of the recommendations are matched against the
+        # relevant pairs in one hashed isin, rather than one set lookup per item
+        rows = np.arange(len(user_ids))
+        rec_rows = np.repeat(rows, lengths)
+        rec_positions = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        rec_pairs = pd.MultiIndex.from_arrays([rec_rows, list(chain.from_iterable(truncated))])
+
+        ground_truths = [self.user_ground_truth[user_id] for user_id in user_ids]
+        gt_sizes = np.fromiter((len(items) for items in ground_truths), dtype=np.int64, count=len(ground_truths))
+        relevant_pairs = pd.MultiIndex.from_arrays(
+            [np.repeat(rows, gt_sizes), list(chain.from_iterable(ground_truths))]
+        )
+
+        is_hit = rec_pairs.isin(relevant_pairs)
+        hits[rec_rows[is_hit], rec_positions[is_hit]] = True
+        return hits
+
+    def evaluate_recommendations(
+        self,
+        all_recommendations: Dict[str, List[str]],
+        k_values: List[int] = [5, 10, 20],
+    ) -> Dict[str, Any]:
+        """Score precomputed ranked recommendation lists against the test set.
+
+        Users missing from all_recommendations are scored as empty lists. All
+        metrics are derived from one hit matrix over the top max(k_values)
+        positions, matching the per-user metric methods.
+        """
+        user_ids = list(self.user_ground_truth)
+        max_k = max(k_values)
+        hits = self._hit_matrix(user_ids, all_recommendations, max_k)
+
+        gt_sizes = np.fromiter(
+            (len(self.user_ground_truth[user_id]) for user_id in user_ids),
+            dtype=np.float64,
+            count=len(user_ids),
+        )
+        has_ground_truth = gt_sizes > 0
+        safe_sizes = np.where(has_ground_truth, gt_sizes, 1.0)
+        discounts = 1.0 / np.log2(np.arange(max_k) + 2)
+        idcg_lut = np.concatenate([[0.0], self._idcg_lut])
+
+        results = {}
+        for k in k_values:
+            hits_k = hits[:, :k]
+            n_hits = hits_k.sum(axis=1)
+
+            precision = n_hits / k if k > 0 else np.zeros(len(user_ids))
+            recall = np.where(has_ground_truth, n_hits / safe_sizes, 0.0)
+
+            dcg = hits_k @ discounts[:k]
+            idcg = idcg_lut[np.minimum(gt_sizes, k).astype(np.int64)]
+            ndcg = np.where(idcg > 0, dcg / np.where(idcg > 0, idcg, 1.0), 0.0)
+
+            precision_at_hits = np.cumsum(hits_k, axis=1) / np.arange(1, k + 1) * hits_k
+            average_precision = np.where(has_ground_truth, precision_at_hits.sum(axis=1) / safe_sizes, 0.0)
+
+            results[f"precision@{k}"] = precision
+            results[f"recall@{k}"] = recall
+            results[f"ndcg@{k}"] = ndcg
+            results[f"map@{k}"] = average_precision
 
         summary = {}
         for metric, values in results.items():
@@ -141,4 +239,3 @@ class RecommenderEvaluator:
 
         logger.info("Evaluation complete", summary=summary)
         return summary
-
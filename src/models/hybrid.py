@@ -1,4 +1,5 @@
-from typing import List, Tuple, Set, Optional
+from itertools import chain
+from typing import Callable, Dict, List, Tuple, Set, Optional
 import numpy as np
 
 from src.models.collaborative import CollaborativeFilter
@@ -26,37 +27,70 @@ class HybridRecommender:
         collaborative_scores: List[Tuple[str, float]],
         semantic_scores: List[Tuple[str, float]],
     ) -> List[Tuple[str, float]]:
-        collaborative_dict = {product_id: score for product_id, score in collaborative_scores}
-        semantic_dict = {product_id: score for product_id, score in semantic_scores}
+        product_ids, collab_positions, semantic_positions = self._align_products(
+            collaborative_scores, semantic_scores
+        )
 
-        all_products = set(collaborative_dict.keys()) | set(semantic_dict.keys())
+        # Products missing from a list score 0.0 there before normalization
+        collab_values = np.zeros(len(product_ids))
+        collab_values[collab_positions] = [score for _, score in collaborative_scores]
+        semantic_values = np.zeros(len(product_ids))
+        semantic_values[semantic_positions] = [score for _, score in semantic_scores]
 
-        fused_scores = []
-        for product_id in all_products:
-            collab_score = collaborative_dict.get(product_id, 0.0)
-            semantic_score = semantic_dict.get(product_id, 0.0)
+        normalized_collab = self._score_normalizer(collaborative_scores)(collab_values)
+        normalized_semantic = self._score_normalizer(semantic_scores)(semantic_values)
 
-            normalized_collab = self._normalize_score(collab_score, collaborative_scores)
-            normalized_semantic = self._normalize_score(semantic_score, semantic_scores)
+        fused = self.alpha * normalized_semantic + (1 - self.alpha) * normalized_collab
+        return self._ranked(product_ids, np.broadcast_to(fused, (len(product_ids),)))
 
-            fused_score = self.alpha * normalized_semantic + (1 - self.alpha) * normalized_collab
-            fused_scores.append((product_id, fused_score))
+    @staticmethod
+    def _align_products(
+        collaborative_scores: List[Tuple[str, float]],
+        semantic_scores: List[Tuple[str, float]],
+    ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Index the union of candidate products and locate each list's entries in it."""
+        positions: Dict[str, int] = {}
+        for product_id, _ in chain(collaborative_scores, semantic_scores):
+            positions.setdefault(product_id, len(positions))
+
+        collab_positions = np.fromiter(
+            (positions[product_id] for product_id, _ in collaborative_scores),
+            dtype=np.intp,
+            count=len(collaborative_scores),
+        )
+        semantic_positions = np.fromiter(
+            (positions[product_id] for product_id, _ in semantic_scores),
+            dtype=np.intp,
+            count=len(semantic_scores),
+        )
+        return list(positions), collab_positions, semantic_positions
 
-        fused_scores.sort(key=lambda x: x[1], reverse=True)
-        return fused_scores
+    @staticmethod
+    def _ranked(product_ids: List[str], scores: np.ndarray) -> List[Tuple[str, float]]:
+        order = np.argsort(-scores, kind="stable")
+        return list(zip(np.asarray(product_ids, dtype=object)[order].tolist(), scores[order].tolist()))
 
     def _normalize_score(self, score: float, scores: List[Tuple[str, float]]) -> float:
+        return self._score_normalizer(scores)(score)
+
+    @staticmethod
+    def _score_normalizer(scores: List[Tuple[str, float]]) -> Callable[[float], float]:
+        """Min-max normalizer over the scores' range, as applied by _normalize_score.
+
+        The returned function accepts a single score or an array of scores.
+        """
         if not scores:
-            return 0.0
+            return lambda score: 0.0
 
-        score_values = [s for _, s in scores]
-        min_score = min(score_values)
-        max_score = max(score_values)
+        score_values = np.fromiter((s for _, s in scores), dtype=np.float64, count=len(scores))
+        min_score = float(score_values.min())
+        max_score = float(score_values.max())
 
         if max_score == min_score:
-            return 0.5
+            return lambda score: 0.5
 
-        return (score - min_score) / (max_score - min_score)
+        score_range = max_score - min_score
+        return lambda score: (score - min_score) / score_range
 
     def _reciprocal_rank_fusion(
         self,
@@ -64,26 +98,17 @@ class HybridRecommender:
         semantic_scores: List[Tuple[str, float]],
         k: int = 60,
     ) -> List[Tuple[str, float]]:
-        collaborative_ranks = {
-            product_id: 1.0 / (k + rank)
-            for rank, (product_id, _) in enumerate(collaborative_scores)
-        }
-        semantic_ranks = {
-            product_id: 1.0 / (k + rank)
-            for rank, (product_id, _) in enumerate(semantic_scores)
-        }
-
-        all_products = set(collaborative_ranks.keys()) | set(semantic_ranks.keys())
-
-        fused_scores = []
-        for product_id in all_products:
-            rrf_score = collaborative_ranks.get(product_id, 0.0) + semantic_ranks.get(
-                product_id, 0.0
-            )
-            fused_scores.append((product_id, rrf_score))
-
-        fused_scores.sort(key=lambda x: x[1], reverse=True)
-        return fused_scores
+        product_ids, collab_positions, semantic_positions = self._align_products(
+            collaborative_scores, semantic_scores
+        )
+
+        collab_ranks = np.zeros(len(product_ids))
+        collab_ranks[collab_positions] = 1.0 / (k + np.arange(len(collab_positions)))
+        semantic_ranks = np.zeros(len(product_ids))
+        semantic_ranks[semantic_positions] = 1.0 / (k + np.arange(len(semantic_positions)))
+        rrf_scores = collab_ranks + semantic_ranks
+
+        return self._ranked(product_ids, rrf_scores)
 
     def recommend(
         self,
@@ -113,12 +138,7 @@ class HybridRecommender:
         if not semantic_scores:
             semantic_scores = self.vector_store.get_popular_items(top_k=50)
 
-        if self.fusion_strategy == "weighted_sum":
-            fused_scores = self._weighted_sum_fusion(collaborative_scores, semantic_scores)
-        elif self.fusion_strategy == "rrf":
-            fused_scores = self._reciprocal_rank_fusion(collaborative_scores, semantic_scores)
-        else:
-            raise ValueError(f"Unknown fusion strategy: {self.fusion_strategy}")
+        fused_scores = self._fuse(collaborative_scores, semantic_scores)
 
         recommendations = [
             (product_id, score)
@@ -128,39 +148,92 @@ class HybridRecommender:
 
         return recommendations
 
+    def recommend_batch(
+        self,
+        user_ids: List[str],
+        user_histories: Optional[Dict[str, List[str]]] = None,
+        top_k: int = 10,
+    ) -> Dict[str, List[Tuple[str, float]]]:
+        """Recommend for many users, batching the collaborative and FAISS lookups.
+
+        Produces the same rankings as calling recommend() per user without
+        exclude_seen; collaborative scores come from one matrix product and all
+        history-based semantic queries go through one FAISS search.
+        """
+        user_histories = user_histories or {}
+
+        collaborative_by_user = self.collaborative_model.recommend_batch(user_ids, top_k=50)
+
+        query_users = []
+        query_embeddings = []
+        for user_id in user_ids:
+            history_embeddings = [
+                embedding
+                for embedding in (
+                    self.vector_store.get_embedding(product_id)
+                    for product_id in user_histories.get(user_id, [])[:10]
+                )
+                if embedding is not None
+            ]
+            if history_embeddings:
+                query_users.append(user_id)
+                query_embeddings.append(np.mean(history_embeddings, axis=0))
+
+        semantic_by_user = {}
+        if query_embeddings:
+            batch_results = self.vector_store.search_batch(np.vstack(query_embeddings), top_k=50)
+            semantic_by_user = dict(zip(query_users, batch_results))
+
+        popular_items = None
+        recommendations = {}
+        for user_id in user_ids:
+            semantic_scores = semantic_by_user.get(user_id)
+            if not semantic_scores:
+                if popular_items is None:
+                    popular_items = self.vector_store.get_popular_items(top_k=50)
+                semantic_scores = popular_items
+
+            fused_scores = self._fuse(collaborative_by_user[user_id], semantic_scores)
+            recommendations[user_id] = fused_scores[:top_k]
+
+        return recommendations
+
+    def _fuse(
+        self,
+        collaborative_scores: List[Tuple[str, float]],
+        semantic_scores: List[Tuple[str, float]],
+    ) -> List[Tuple[str, float]]:
+        if self.fusion_strategy == "weighted_sum":
+            return self._weighted_sum_fusion(collaborative_scores, semantic_scores)
+        elif self.fusion_strategy == "rrf":
+            return self._reciprocal_rank_fusion(collaborative_scores, semantic_scores)
+        else:
+            raise ValueError(f"Unknown fusion strategy: {self.fusion_strategy}")
+
     def diversify(
         self, recommendations: List[Tuple[str, float]], diversity_weight: float = 0.3
     ) -> List[Tuple[str, float]]:
         if len(recommendations) <= 1:
             return recommendations
 
-        diversified = [recommendations[0]]
-        remaining = recommendations[1:]
+        scores = np.array([score for _, score in recommendations], dtype=np.float64)
+        distances = self.vector_store.distance_matrix([item_id for item_id, _ in recommendations])
 
-        while remaining and len(diversified) < len(recommendations):
-            best_item = None
-            best_score = float("-inf")
-
-            for item_id, item_score in remaining:
-                min_distance = min(
-                    [
-                        self.vector_store.distance(item_id, div_id)
-                        for div_id, _ in diversified
-                    ],
-                    default=1.0,
-                )
-
-                diversified_score = (
-                    (1 - diversity_weight) * item_score + diversity_weight * min_distance
-                )
+        # Each remaining item's distance to its nearest diversified item only
+        # changes by the latest pick, so it is updated incrementally instead of
+        # recomputed against every diversified item on every round
+        picked = [0]
+        remaining = np.arange(1, len(recommendations))
+        min_distances = distances[remaining, 0]
 
-                if diversified_score > best_score:
-                    best_score = diversified_score
-                    best_item = (item_id, item_score)
+        while remaining.size:
+            mmr_scores = (1 - diversity_weight) * scores[remaining] + diversity_weight * min_distances
+            best = int(np.argmax(mmr_scores))
+            best_index = int(remaining[best])
+            picked.append(best_index)
 
-            if best_item:
-                diversified.append(best_item)
-                remaining.remove(best_item)
+            remaining = np.delete(remaining, best)
+            min_distances = np.minimum(np.delete(min_distances, best), distances[remaining, best_index])
 
-        return diversified
+        return [recommendations[i] for i in picked]
 
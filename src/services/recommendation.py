@@ -1,14 +1,20 @@
-from typing import List, Tuple, Optional, Set
+from typing import Dict, List, Tuple, Optional, Set
 import time
 
 from src.models.hybrid import HybridRecommender
 from src.data.catalog import UserCatalog, ProductCatalog
 from src.infrastructure.logging import get_logger
 from src.infrastructure.metrics import model_inference_duration_seconds
-from src.infrastructure.cache import cache
+from src.infrastructure.cache import LocalCache, cache
 
 logger = get_logger(__name__)
 
+RATINGS_PATH = "data/processed/ratings.parquet"
+
+# Hot users are answered from process memory before going to the shared cache
+LOCAL_CACHE_SIZE = 10_000
+LOCAL_CACHE_TTL_SECONDS = 60
+
 
 class RecommendationService:
     def __init__(
@@ -16,25 +22,27 @@ class RecommendationService:
         hybrid_recommender: HybridRecommender,
         user_catalog: UserCatalog,
         product_catalog: ProductCatalog,
+        ratings_path: str = RATINGS_PATH,
     ):
         self.hybrid_recommender = hybrid_recommender
         self.user_catalog = user_catalog
         self.product_catalog = product_catalog
+        self._user_history_index = self._build_user_history_index(ratings_path)
+        self._local_cache = LocalCache(maxsize=LOCAL_CACHE_SIZE, ttl=LOCAL_CACHE_TTL_SECONDS)
 
-    def _get_user_history(self, user_id: str) -> List[str]:
-        user_stats = self.user_catalog.get_user_stats(user_id)
-        if not user_stats:
-            return []
-        
+    @staticmethod
+    def _build_user_history_index(ratings_path: str) -> Dict[str, List[str]]:
+        """Read the ratings once and group each user's products, in file order."""
         try:
             from src.data.ingestion import load_from_local
-            import pandas as pd
-            df = load_from_local("data/processed/ratings.parquet")
-            user_transactions = df[df["user_id"] == user_id]
-            return user_transactions["product_id"].tolist()
+            df = load_from_local(ratings_path, columns=["user_id", "product_id"])
+            return df.groupby("user_id", sort=False)["product_id"].agg(list).to_dict()
         except Exception as e:
-            logger.warning("Could not load user history", user_id=user_id, error=str(e))
-            return []
+            logger.warning("Could not load user history", file_path=ratings_path, error=str(e))
+            return {}
+
+    def _get_user_history(self, user_id: str) -> List[str]:
+        return self._user_history_index.get(user_id, [])
 
     def get_recommendations(
         self,
@@ -45,10 +53,15 @@ class RecommendationService:
     ) -> List[Tuple[str, float]]:
         start_time = time.time()
 
-        cache_key = f"recommendations:{user_id}:{top_k}:{exclude_seen}"
+        cache_key = f"recommendations:{user_id}:{top_k}:{exclude_seen}:{diversify}"
+        cached_result = self._local_cache.get(cache_key)
+        if cached_result is not None:
+            return cached_result
+
         cached_result = cache.get(cache_key)
         if cached_result is not None:
             logger.debug("Cache hit", user_id=user_id)
+            self._local_cache.set(cache_key, cached_result)
             return cached_result
 
         if user_id not in self.user_catalog.user_to_idx:
@@ -76,6 +89,7 @@ class RecommendationService:
         )
 
         cache.set(cache_key, recommendations, ttl=300)
+        self._local_cache.set(cache_key, recommendations)
 
         logger.info(
             "Recommendations generated",
@@ -97,22 +111,11 @@ class RecommendationService:
             user_id=user_id, top_k=top_k, exclude_seen=exclude_seen, diversify=diversify
         )
 
-        results = []
-        for product_id, score in recommendations:
-            metadata = self.product_catalog.get_product_metadata(product_id)
-            stats = self.product_catalog.get_product_stats(product_id)
-
-            results.append(
-                {
-                    "product_id": product_id,
-                    "score": score,
-                    "name": metadata.get("name", ""),
-                    "category": metadata.get("category", ""),
-                    "description": metadata.get("description", ""),
-                    "avg_rating": stats.get("avg_rating", 0.0),
-                    "total_interactions": stats.get("total_interactions", 0),
-                }
-            )
-
-        return results
+        product_infos = self.product_catalog.describe_products(
+            [product_id for product_id, _ in recommendations]
+        )
+        return [
+            {"product_id": product_id, "score": score, **info}
+            for (product_id, score), info in zip(recommendations, product_infos)
+        ]
 
@@ -1,10 +1,12 @@
 from typing import List, Tuple, Optional, Dict, Any
+import threading
 import time
+import faiss
 import numpy as np
 from openai import OpenAI
 
 from src.services.vector_store import FAISSVectorStore
-from src.models.embeddings import get_embedding
+from src.models.embeddings import EmbeddingCache, get_embedding
 from src.data.catalog import ProductCatalog
 from src.config.settings import settings
 from src.infrastructure.logging import get_logger
@@ -16,6 +18,80 @@ from src.infrastructure.cache import cache
 
 logger = get_logger(__name__)
 
+# Concurrent searches arriving within this window share one FAISS call
+SEARCH_BATCH_WINDOW_SECONDS = 0.005
+
+
+class _PendingSearch:
+    __slots__ = ("query_embedding", "top_k", "done", "results", "error")
+
+    def __init__(self, query_embedding: np.ndarray, top_k: int):
+        self.query_embedding = query_embedding
+        self.top_k = top_k
+        self.done = threading.Event()
+        self.results: Tuple[np.ndarray, np.ndarray] = (np.empty(0, dtype=object), np.empty(0, dtype=np.float32))
+        self.error: Optional[BaseException] = None
+
+
+class _SearchBatcher:
+    """Coalesce concurrent vector searches into one search_batch call.
+
+    The first query of a window becomes its leader. If other searches are already
+    in flight it waits window_seconds for more to arrive, then searches all of
+    them with a single FAISS call at the largest top_k, so under load the index is
+    scanned once per window rather than once per query. A search arriving while
+    nothing else is in flight runs at once, without the window's delay. Results are
+    (product_ids, scores) array pairs, as from search_batch_arrays().
+    """
+
+    def __init__(self, vector_store: FAISSVectorStore, window_seconds: float = SEARCH_BATCH_WINDOW_SECONDS):
+        self.vector_store = vector_store
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._pending: List[_PendingSearch] = []
+        # Searches submitted and not yet returned, including any whose batch is running
+        self._in_flight = 0
+
+    def search(self, query_embedding: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        item = _PendingSearch(np.asarray(query_embedding, dtype=np.float32).reshape(-1), top_k)
+        with self._lock:
+            self._in_flight += 1
+            self._pending.append(item)
+            is_leader = len(self._pending) == 1
+            concurrent = self._in_flight > 1
+
+        try:
+            if is_leader:
+                if concurrent:
+                    time.sleep(self.window_seconds)
+                with self._lock:
+                    batch, self._pending = self._pending, []
+                self._run(batch)
+            else:
+                item.done.wait()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+        if item.error is not None:
+            raise item.error
+        return item.results
+
+    def _run(self, batch: List[_PendingSearch]) -> None:
+        try:
+            queries = np.vstack([item.query_embedding for item in batch])
+            batch_results = self.vector_store.search_batch_arrays(
+                queries, top_k=max(item.top_k for item in batch)
+            )
+            for item, (product_ids, scores) in zip(batch, batch_results):
+                item.results = (product_ids[: item.top_k], scores[: item.top_k])
+        except Exception as e:
+            for item in batch:
+                item.error = e
+        finally:
+            for item in batch:
+                item.done.set()
+
 
 class SearchService:
     def __init__(
@@ -24,17 +100,51 @@ class SearchService:
         self.vector_store = vector_store
         self.product_catalog = product_catalog
         self.openai_client = openai_client or OpenAI(api_key=settings.openai_api_key)
+        self._batcher = _SearchBatcher(vector_store)
+        # Catalog positions of every stored vector, resolved once so filters become
+        # a mask over the whole index instead of per-result lookups
+        self._vector_product_indices = product_catalog.get_product_indices(vector_store.product_ids)
+        self._vector_metadata_rows = product_catalog.product_metadata.rows(vector_store.product_ids)
+        # FAISS loads its AVX2/AVX512 build when the CPU supports it; logged so a
+        # deployment that fell back to the generic kernels is visible
+        logger.info(
+            "FAISS search kernels",
+            compile_options=faiss.get_compile_options() if hasattr(faiss, "get_compile_options") else None,
+            dimension=vector_store.dimension,
+        )
+        # Per-thread query vector reused across cache hits. A thread runs one search
+        # at a time and the batcher stacks queries into its own matrix, so the
+        # buffer is free again by the time the thread's next query arrives
+        self._query_buffers = threading.local()
+
+    def _query_buffer(self, dimension: int) -> np.ndarray:
+        buffer = getattr(self._query_buffers, "array", None)
+        if buffer is None or buffer.shape[0] != dimension:
+            buffer = np.empty(dimension, dtype=np.float32)
+            self._query_buffers.array = buffer
+        return buffer
 
     def _get_query_embedding(self, query: str) -> np.ndarray:
-        cache_key = f"query_embedding:{hash(query)}"
+        # hash() is salted per process, so workers sharing a cache need a stable
+        # digest; it covers the model and dimension, as in EmbeddingCache, so a model
+        # change never serves vectors of the old one
+        query_hash = EmbeddingCache.make_key(
+            query, settings.openai_model_id, settings.openai_embedding_dimension
+        ).hex()
+        cache_key = f"query_embedding:{query_hash}"
         cached_embedding = cache.get(cache_key)
-        if cached_embedding is not None:
-            return np.array(cached_embedding)
+        if isinstance(cached_embedding, (bytes, bytearray)):
+            # Copied into this thread's reusable buffer, which search may normalize
+            # in place, instead of allocating a fresh array per cache hit
+            cached_array = np.frombuffer(cached_embedding, dtype=np.float32)
+            buffer = self._query_buffer(len(cached_array))
+            np.copyto(buffer, cached_array)
+            return buffer
 
         embedding = get_embedding(self.openai_client, query)
         embedding_array = np.array(embedding, dtype=np.float32)
 
-        cache.set(cache_key, embedding_array.tolist(), ttl=3600)
+        cache.set(cache_key, embedding_array.tobytes(), ttl=3600)
 
         return embedding_array
 
@@ -44,65 +154,53 @@ class SearchService:
         top_k: int = 10,
         filters: Optional[Dict[str, Any]] = None,
     ) -> Tuple[List[Tuple[str, float]], Dict[str, float]]:
-        start_time = time.time()
+        (product_ids, scores), timing = self._search_arrays(query, top_k=top_k, filters=filters)
+        return list(zip(product_ids.tolist(), scores.tolist())), timing
 
-        embedding_start = time.time()
+    def _search_arrays(
+        self,
+        query: str,
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Tuple[np.ndarray, np.ndarray], Dict[str, float]]:
+        # Three monotonic readings bound both phases, converted to ms once at the end
+        start_ns = time.perf_counter_ns()
         query_embedding = self._get_query_embedding(query)
-        embedding_time = time.time() - embedding_start
-
-        search_start = time.time()
-        results = self.vector_store.search(query_embedding, top_k=top_k * 2 if filters else top_k)
-        search_time = time.time() - search_start
+        embedding_done_ns = time.perf_counter_ns()
 
         if filters:
-            results = self._apply_filters(results, filters)
-            results = results[:top_k]
-
-        total_time = time.time() - start_time
+            # Only products passing the filters are scored by FAISS, so no results
+            # are lost to filtering after the fact
+            allowed = self.product_catalog.filter_mask_at(
+                self._vector_product_indices, self._vector_metadata_rows, filters
+            )
+            results = self.vector_store.search_arrays(query_embedding, top_k=top_k, allowed=allowed)
+        else:
+            results = self._batcher.search(query_embedding, top_k=top_k)
+        end_ns = time.perf_counter_ns()
 
+        total_time_ns = end_ns - start_ns
         model_inference_duration_seconds.labels(model_type="vector_search", operation="search").observe(
-            total_time
+            total_time_ns / 1e9
         )
 
+        timing = {
+            "query_embedding_time_ms": (embedding_done_ns - start_ns) / 1e6,
+            "search_time_ms": (end_ns - embedding_done_ns) / 1e6,
+            "total_time_ms": total_time_ns / 1e6,
+        }
+        # Below the configured level the filtering logger drops this call before
+        # any processor runs
         logger.info(
             "Search completed",
             query=query[:50],
-            results_count=len(results),
-            embedding_time_ms=embedding_time * 1000,
-            search_time_ms=search_time * 1000,
-            total_time_ms=total_time * 1000,
+            results_count=len(results[0]),
+            embedding_time_ms=timing["query_embedding_time_ms"],
+            search_time_ms=timing["search_time_ms"],
+            total_time_ms=timing["total_time_ms"],
         )
 
-        return results, {
-            "query_embedding_time_ms": embedding_time * 1000,
-            "search_time_ms": search_time * 1000,
-            "total_time_ms": total_time * 1000,
-        }
-
-    def _apply_filters(
-        self, results: List[Tuple[str, float]], filters: Dict[str, Any]
-    ) -> List[Tuple[str, float]]:
-        filtered_results = []
-
-        for product_id, score in results:
-            metadata = self.product_catalog.get_product_metadata(product_id)
-            stats = self.product_catalog.get_product_stats(product_id)
-
-            if "category" in filters:
-                if metadata.get("category") != filters["category"]:
-                    continue
-
-            if "min_rating" in filters:
-                if stats.get("avg_rating", 0.0) < filters["min_rating"]:
-                    continue
-
-            if "min_interactions" in filters:
-                if stats.get("total_interactions", 0) < filters["min_interactions"]:
-                    continue
-
-            filtered_results.append((product_id, score))
-
-        return filtered_results
+        return results, timing
 
     def search_with_metadata(
         self,
@@ -110,24 +208,16 @@ class SearchService:
         top_k: int = 10,
         filters: Optional[Dict[str, Any]] = None,
     ) -> Tuple[List[dict], Dict[str, float]]:
-        results, timing = self.search(query, top_k=top_k, filters=filters)
-
-        results_with_metadata = []
-        for product_id, score in results:
-            metadata = self.product_catalog.get_product_metadata(product_id)
-            stats = self.product_catalog.get_product_stats(product_id)
-
-            results_with_metadata.append(
-                {
-                    "product_id": product_id,
-                    "score": score,
-                    "name": metadata.get("name", ""),
-                    "category": metadata.get("category", ""),
-                    "description": metadata.get("description", ""),
-                    "avg_rating": stats.get("avg_rating", 0.0),
-                    "total_interactions": stats.get("total_interactions", 0),
-                }
-            )
+        (product_ids, scores), timing = self._search_arrays(query, top_k=top_k, filters=filters)
+
+        # The result arrays go straight into the response dicts; no intermediate
+        # (product_id, score) tuples are built
+        product_ids = product_ids.tolist()
+        product_infos = self.product_catalog.describe_products(product_ids)
+        results_with_metadata = [
+            {"product_id": product_id, "score": score, **info}
+            for product_id, score, info in zip(product_ids, scores.tolist(), product_infos)
+        ]
 
         return results_with_metadata, timing
 
@@ -1,14 +1,46 @@
+import json
+import math
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple, Optional, Dict
 import numpy as np
 import faiss
-import pickle
 
 from src.config.settings import settings
-from src.config.constants import FAISSIndexType
+from src.config.constants import EmbeddingQuantization, FAISSIndexType
+from src.infrastructure.artifacts import FAISS_INDEX_SUFFIX, index_sidecar_paths
 from src.infrastructure.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Trainable (IVF/PQ) indices are trained on at most this many sampled vectors
+MAX_TRAINING_SAMPLES = 100_000
+# add_embeddings normalizes batches larger than this in row blocks of this size,
+# one per worker thread
+NORMALIZE_BLOCK_ROWS = 4096
+# FAISS k-means needs at least k training points and warns below 39 per centroid,
+# so a "{nlist}" placeholder never gets more lists than this allows
+MIN_POINTS_PER_CENTROID = 39
+
+
+def _normalize_rows(embeddings: np.ndarray) -> None:
+    """L2-normalize a C-contiguous float32 matrix in place, in parallel row blocks.
+
+    faiss.normalize_L2 releases the GIL, so blocks run concurrently even where
+    FAISS's own OpenMP pool is limited to one thread (as in the API process).
+    """
+    if len(embeddings) <= NORMALIZE_BLOCK_ROWS:
+        faiss.normalize_L2(embeddings)
+        return
+
+    blocks = [
+        embeddings[start : start + NORMALIZE_BLOCK_ROWS]
+        for start in range(0, len(embeddings), NORMALIZE_BLOCK_ROWS)
+    ]
+    with ThreadPoolExecutor(max_workers=min(len(blocks), os.cpu_count() or 1)) as executor:
+        list(executor.map(faiss.normalize_L2, blocks))
+
 
 class FAISSVectorStore:
     """FAISS-based vector store for efficient similarity search.
@@ -19,40 +51,101 @@ class FAISSVectorStore:
     Attributes:
         dimension: Dimension of embedding vectors
         index_type: Type of FAISS index ("L2" or "InnerProduct")
+        index_factory: Optional faiss.index_factory string for approximate indices
+        nprobe: Number of IVF lists scanned per query, or None for FAISS's default
+        quantization: Scalar quantization of the flat index ("int8" or "fp16"), or None
         index: FAISS index instance
         product_ids: List of product IDs in the same order as vectors in the index
-        embeddings_map: Dictionary mapping product_id to embedding vector
     """
     
-    def __init__(self, dimension: int, index_type: str = "InnerProduct"):
+    def __init__(
+        self,
+        dimension: int,
+        index_type: str = "InnerProduct",
+        index_factory: Optional[str] = None,
+        nprobe: Optional[int] = None,
+        quantization: Optional[str] = None,
+    ):
         """Initialize FAISS vector store.
         
         Args:
             dimension: Dimension of embedding vectors (e.g., 1536 for text-embedding-3-large)
             index_type: Type of similarity metric. "InnerProduct" for cosine similarity
                 (after L2 normalization) or "L2" for Euclidean distance.
+            index_factory: Optional faiss.index_factory description (e.g. "IVF4096,PQ64"
+                or "HNSW32,Flat"). A "{nlist}" placeholder is filled with 4 * sqrt(N)
+                for the first batch of N vectors, capped so every list gets at least
+                MIN_POINTS_PER_CENTROID training vectors (and at least one list).
+                If None, an exact flat index is used.
+            nprobe: Number of inverted lists an IVF index scans per query; trades
+                recall for latency. Ignored for other index types.
+            quantization: "int8" or "fp16" to store the vectors of the default flat
+                index as scalar-quantized codes (a quarter or half of the float32
+                size), which FAISS scores with SIMD without decoding. int8 is trained
+                on the first batch and typically loses well under 1% recall@10 on
+                text embeddings. Ignored when index_factory is set ("SQ8"/"SQfp16"
+                there select the same encodings).
         """
         self.dimension = dimension
         self.index_type = index_type
+        self.index_factory = index_factory
+        self.nprobe = nprobe
+        self.quantization = quantization
         self.index: Optional[faiss.Index] = None
         self.product_ids: List[str] = []
-        self.embeddings_map: Dict[str, np.ndarray] = {}
-
-    def _create_index(self) -> faiss.Index:
+        # product_id -> row of its vector. Rows index _embeddings when a separate
+        # copy is kept, otherwise the index itself, which then stores exact vectors
+        self._embedding_rows: Dict[str, int] = {}
+        self._embeddings: Optional[np.ndarray] = None
+        # product_ids as an object array for np.take, rebuilt when product_ids grows
+        self._product_ids_array: Optional[np.ndarray] = None
+        # Set by to_gpu(): the host index keeps serving reconstruction, filtered
+        # searches and save() while self.index points at the GPU copy
+        self._cpu_index: Optional[faiss.Index] = None
+        self._gpu_resources = None
+
+    def _create_index(self, n_vectors: int) -> faiss.Index:
         if self.index_type == FAISSIndexType.L2:
-            index = faiss.IndexFlatL2(self.dimension)
+            metric = faiss.METRIC_L2
         elif self.index_type == FAISSIndexType.INNER_PRODUCT:
-            index = faiss.IndexFlatIP(self.dimension)
+            metric = faiss.METRIC_INNER_PRODUCT
         else:
             raise ValueError(f"Unknown index type: {self.index_type}")
 
-        return index
+        if self.index_factory:
+            if "{nlist}" in self.index_factory:
+                nlist = min(int(4 * math.sqrt(n_vectors)), n_vectors // MIN_POINTS_PER_CENTROID)
+                nlist = max(1, nlist)
+                self.index_factory = self.index_factory.format(nlist=nlist)
+            return faiss.index_factory(self.dimension, self.index_factory, metric)
+        if self.quantization:
+            quantizer_types = {
+                EmbeddingQuantization.INT8: faiss.ScalarQuantizer.QT_8bit,
+                EmbeddingQuantization.FP16: faiss.ScalarQuantizer.QT_fp16,
+            }
+            if self.quantization not in quantizer_types:
+                raise ValueError(f"Unknown quantization: {self.quantization}")
+            return faiss.IndexScalarQuantizer(
+                self.dimension, quantizer_types[self.quantization], metric
+            )
+        if metric == faiss.METRIC_L2:
+            return faiss.IndexFlatL2(self.dimension)
+        return faiss.IndexFlatIP(self.dimension)
+
+    def _apply_search_parameters(self) -> None:
+        if self.nprobe is None or self.index is None:
+            return
+        try:
+            faiss.extract_index_ivf(self.index).nprobe = self.nprobe
+        except RuntimeError:
+            logger.warning("nprobe only applies to IVF indices", index_factory=self.index_factory)
 
     def add_embeddings(self, product_ids: List[str], embeddings: np.ndarray) -> None:
         """Add embeddings to the vector store.
         
         Adds product embeddings to the FAISS index. If index doesn't exist, creates it.
-        For InnerProduct index type, normalizes embeddings to unit length.
+        For InnerProduct index type, normalizes embeddings to unit length. Untrained
+        indices (IVF/PQ factories) are first trained on a sample of the batch.
         
         Args:
             product_ids: List of product IDs corresponding to each embedding
@@ -78,17 +171,43 @@ class FAISSVectorStore:
             )
             self.dimension = actual_dimension
 
+        if self._cpu_index is not None:
+            raise ValueError("Vector store was moved to the GPU; add embeddings before calling to_gpu()")
+
         if self.index is None:
-            self.index = self._create_index()
+            self.index = self._create_index(len(embeddings))
+            self._apply_search_parameters()
 
+        # FAISS works on C-contiguous float32. InnerProduct normalizes in place, so it
+        # also needs an owned, writable array; stored embeddings may be float16 and
+        # read-only memory-mapped, in which case they are copied here. L2 indices
+        # read a matching memory-mapped array directly.
         if self.index_type == FAISSIndexType.INNER_PRODUCT:
-            faiss.normalize_L2(embeddings)
-
-        self.index.add(embeddings.astype(np.float32))
+            embeddings = np.require(embeddings, dtype=np.float32, requirements=["C", "W", "O"])
+            _normalize_rows(embeddings)
+        else:
+            embeddings = np.require(embeddings, dtype=np.float32, requirements=["C"])
+
+        if not self.index.is_trained:
+            training_set = embeddings
+            if len(embeddings) > MAX_TRAINING_SAMPLES:
+                rng = np.random.default_rng(0)
+                sample = rng.choice(len(embeddings), MAX_TRAINING_SAMPLES, replace=False)
+                training_set = embeddings[np.sort(sample)]
+            logger.info("Training index", factory=self.index_factory, samples=len(training_set))
+            self.index.train(training_set)
+
+        start = len(self.product_ids)
+        self.index.add(embeddings)
         self.product_ids.extend(product_ids)
-
-        for product_id, embedding in zip(product_ids, embeddings):
-            self.embeddings_map[product_id] = embedding
+        self._embedding_rows.update(zip(product_ids, range(start, start + len(product_ids))))
+        # Flat and scalar-quantized indices reconstruct every vector themselves, so
+        # a second float32 copy is only kept for PQ or clustered indices (or a
+        # loaded sidecar); for quantized stores it would outweigh the codes
+        if self._embeddings is not None:
+            self._embeddings = np.concatenate([self._embeddings, embeddings])
+        elif not self._index_stores_vectors():
+            self._embeddings = embeddings
 
         try:
             total_vectors = self.index.ntotal if hasattr(self.index, 'ntotal') else len(self.product_ids)
@@ -97,7 +216,12 @@ class FAISSVectorStore:
         logger.info("Embeddings added", total_vectors=total_vectors)
 
     def search(
-        self, query_embedding: np.ndarray, top_k: int = 10, threshold: Optional[float] = None
+        self,
+        query_embedding: np.ndarray,
+        top_k: int = 10,
+        threshold: Optional[float] = None,
+        allowed: Optional[np.ndarray] = None,
+        normalized: bool = False,
     ) -> List[Tuple[str, float]]:
         """Search for similar products using a query embedding.
         
@@ -108,6 +232,12 @@ class FAISSVectorStore:
             top_k: Number of top results to return
             threshold: Optional similarity threshold. For InnerProduct, filters results below threshold.
                 For L2, filters results above threshold.
+            allowed: Optional boolean mask over the stored vectors (product_ids order).
+                Only allowed vectors are scored, so filtered searches still return
+                up to top_k results without over-fetching.
+            normalized: Set when the query is already unit length to skip
+                normalization for InnerProduct indices. Otherwise a writable
+                float32 query is normalized in place.
         
         Returns:
             List of tuples (product_id, similarity_score) sorted by similarity (descending).
@@ -123,6 +253,28 @@ class FAISSVectorStore:
             >>> len(results)
             5
         """
+        product_ids, scores = self.search_arrays(
+            query_embedding, top_k=top_k, threshold=threshold, allowed=allowed, normalized=normalized
+        )
+        return list(zip(product_ids.tolist(), scores.tolist()))
+
+    def search_arrays(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int = 10,
+        threshold: Optional[float] = None,
+        allowed: Optional[np.ndarray] = None,
+        normalized: bool = False,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Like search(), but returns parallel arrays instead of (product_id, score) tuples.
+
+        Callers that post-process results (filtering, joining metadata) can work on
+        the arrays and only build Python objects for what they return.
+
+        Returns:
+            (product_ids, scores): an object array of product IDs and a float32 array
+            of scores, sorted by similarity. Both are empty if the index is empty.
+        """
         try:
             index_size = self.index.ntotal if hasattr(self.index, 'ntotal') else len(self.product_ids)
         except (AttributeError, TypeError):
@@ -130,8 +282,11 @@ class FAISSVectorStore:
         
         if self.index is None or index_size == 0:
             logger.warning("Index is empty")
-            return []
+            return self._empty_arrays()
 
+        # Converted once up front: FAISS needs C-contiguous float32, and the
+        # in-place normalization needs it writable. Matching arrays are used as-is.
+        query_embedding = np.require(query_embedding, dtype=np.float32, requirements=["C", "W"])
         if query_embedding.ndim == 1:
             query_embedding = query_embedding.reshape(1, -1)
 
@@ -140,41 +295,177 @@ class FAISSVectorStore:
                 f"Query dimension mismatch: expected {self.dimension}, got {query_embedding.shape[1]}"
             )
 
-        if self.index_type == FAISSIndexType.INNER_PRODUCT:
+        if self.index_type == FAISSIndexType.INNER_PRODUCT and not normalized:
             faiss.normalize_L2(query_embedding)
 
-        query_embedding = query_embedding.astype(np.float32)
-
         try:
             max_k = self.index.ntotal if hasattr(self.index, 'ntotal') else len(self.product_ids)
         except (AttributeError, TypeError):
             max_k = len(self.product_ids)
-        distances, indices = self.index.search(query_embedding, min(top_k, max_k))
+        distances, indices = self._search_index(query_embedding, min(top_k, max_k), allowed)
 
-        results = []
-        for dist, idx in zip(distances[0], indices[0]):
-            if idx < 0:
-                continue
+        return self._to_arrays(distances[0], indices[0], threshold)
 
-            if threshold is not None:
-                if self.index_type == FAISSIndexType.L2 and dist > threshold:
-                    continue
-                if self.index_type == FAISSIndexType.INNER_PRODUCT and dist < threshold:
-                    continue
+    def to_gpu(self, device: int = 0) -> bool:
+        """Serve searches from a copy of the index on a GPU.
 
-            product_id = self.product_ids[idx]
-            score = float(dist)
-            results.append((product_id, score))
+        Meant to run once at service start, after the index is built or loaded:
+        unfiltered and batched searches then run on the GPU, while the host index
+        is kept for reconstruction, allowed-mask searches and save(). Without a
+        faiss-gpu build or a visible GPU the store stays on the CPU.
 
-        return results
+        Args:
+            device: GPU device number
+
+        Returns:
+            True if the index was moved to the GPU.
+        """
+        if self.index is None or self._cpu_index is not None:
+            return False
+        if not hasattr(faiss, "StandardGpuResources") or faiss.get_num_gpus() == 0:
+            logger.warning("No FAISS GPU support available, searching on CPU")
+            return False
+
+        self._gpu_resources = faiss.StandardGpuResources()
+        self._cpu_index = self.index
+        self.index = faiss.index_cpu_to_gpu(self._gpu_resources, device, self._cpu_index)
+        logger.info("Moved FAISS index to GPU", device=device, total_vectors=self.index.ntotal)
+        return True
+
+    def _host_index(self) -> Optional[faiss.Index]:
+        return self._cpu_index if self._cpu_index is not None else self.index
+
+    def _search_index(
+        self, queries: np.ndarray, k: int, allowed: Optional[np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if allowed is None:
+            return self.index.search(queries, k)
+
+        # FAISS reads the mask as a little-endian bitmap and skips every vector
+        # outside it while scanning; the packed array must outlive the search
+        bitmap = np.packbits(np.asarray(allowed, dtype=bool), bitorder="little")
+        selector = faiss.IDSelectorBitmap(len(allowed), faiss.swig_ptr(bitmap))
+        index = self._host_index()
+        try:
+            ivf_index = faiss.extract_index_ivf(index)
+        except RuntimeError:
+            ivf_index = None
+        if ivf_index is not None:
+            params = faiss.SearchParametersIVF()
+            params.nprobe = ivf_index.nprobe
+        else:
+            params = faiss.SearchParameters()
+        params.sel = selector
+        return index.search(queries, k, params=params)
+
+    def search_batch(
+        self,
+        query_embeddings: np.ndarray,
+        top_k: int = 10,
+        threshold: Optional[float] = None,
+        normalized: bool = False,
+    ) -> List[List[Tuple[str, float]]]:
+        """Search for several query embeddings with a single FAISS call.
+        
+        Args:
+            query_embeddings: Query matrix of shape (n_queries, dimension)
+            top_k: Number of top results to return per query
+            threshold: Optional similarity threshold, applied as in search()
+            normalized: Set when the rows are already unit length, as in search()
+        
+        Returns:
+            One result list per query row, in the same format as search().
+        """
+        return [
+            list(zip(product_ids.tolist(), scores.tolist()))
+            for product_ids, scores in self.search_batch_arrays(
+                query_embeddings, top_k=top_k, threshold=threshold, normalized=normalized
+            )
+        ]
+
+    def search_batch_arrays(
+        self,
+        query_embeddings: np.ndarray,
+        top_k: int = 10,
+        threshold: Optional[float] = None,
+        normalized: bool = False,
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Like search_batch(), but with one (product_ids, scores) array pair per query row."""
+        if self.index is None or self.index.ntotal == 0:
+            logger.warning("Index is empty")
+            return [self._empty_arrays() for _ in range(len(query_embeddings))]
+
+        if query_embeddings.shape[1] != self.dimension:
+            raise ValueError(
+                f"Query dimension mismatch: expected {self.dimension}, got {query_embeddings.shape[1]}"
+            )
+
+        query_embeddings = np.require(query_embeddings, dtype=np.float32, requirements=["C", "W"])
+        if self.index_type == FAISSIndexType.INNER_PRODUCT and not normalized:
+            faiss.normalize_L2(query_embeddings)
+
+        distances, indices = self.index.search(query_embeddings, min(top_k, self.index.ntotal))
+
+        return [
+            self._to_arrays(row_distances, row_indices, threshold)
+            for row_distances, row_indices in zip(distances, indices)
+        ]
+
+    def _to_arrays(
+        self, distances: np.ndarray, indices: np.ndarray, threshold: Optional[float]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # Missing results (-1) and the threshold are applied as one mask, and the
+        # surviving rows are gathered with np.take instead of per-result lookups
+        valid = indices >= 0
+        if threshold is not None:
+            if self.index_type == FAISSIndexType.L2:
+                valid &= distances <= threshold
+            elif self.index_type == FAISSIndexType.INNER_PRODUCT:
+                valid &= distances >= threshold
+
+        return np.take(self._product_id_array(), indices[valid]), distances[valid]
+
+    def _product_id_array(self) -> np.ndarray:
+        # product_ids only grows (add_embeddings) or is replaced wholesale (load),
+        # so a length check is enough to know the cached array is current
+        if self._product_ids_array is None or len(self._product_ids_array) != len(self.product_ids):
+            self._product_ids_array = np.array(self.product_ids, dtype=object)
+        return self._product_ids_array
+
+    def _empty_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        return np.empty(0, dtype=object), np.empty(0, dtype=np.float32)
 
     def search_by_vector(
-        self, query_embedding: np.ndarray, top_k: int = 10
+        self, query_embedding: np.ndarray, top_k: int = 10, normalized: bool = False
     ) -> List[Tuple[str, float]]:
-        return self.search(query_embedding, top_k=top_k)
+        return self.search(query_embedding, top_k=top_k, normalized=normalized)
+
+    @property
+    def normalized(self) -> bool:
+        """Whether every stored vector is unit length.
+
+        InnerProduct stores normalize vectors once in add_embeddings, so their
+        stored vectors (get_embedding(), the index, saved sidecars) are unit length
+        and cosine distance is just 1 - a @ b; distances() and distance_matrix()
+        rely on this and never renormalize. Queries built from stored vectors can
+        be passed to search() with normalized=True.
+        """
+        return self.index_type == FAISSIndexType.INNER_PRODUCT
+
+    def _index_stores_vectors(self) -> bool:
+        # IndexScalarQuantizer decodes its int8/fp16 codes in reconstruct(), close
+        # enough to the originals for distances and diversification
+        return isinstance(self._host_index(), (faiss.IndexFlat, faiss.IndexScalarQuantizer))
 
     def get_embedding(self, product_id: str) -> Optional[np.ndarray]:
-        return self.embeddings_map.get(product_id)
+        row = self._embedding_rows.get(product_id)
+        if row is None:
+            return None
+        if self._embeddings is not None:
+            return self._embeddings[row]
+        if self._index_stores_vectors():
+            return self._host_index().reconstruct(row)
+        return None
 
     def get_popular_items(self, top_k: int = 10) -> List[Tuple[str, float]]:
         if not self.product_ids:
@@ -183,59 +474,160 @@ class FAISSVectorStore:
         return [(product_id, 1.0) for product_id in self.product_ids[:top_k]]
 
     def distance(self, product_id1: str, product_id2: str) -> float:
-        emb1 = self.get_embedding(product_id1)
-        emb2 = self.get_embedding(product_id2)
+        return float(self.distances(product_id1, [product_id2])[0])
 
-        if emb1 is None or emb2 is None:
-            return 1.0
+    def distances(self, product_id: str, other_product_ids: List[str]) -> np.ndarray:
+        """Compute distances from one product to many with a single matrix-vector product.
+        
+        Uses 1 - inner product for InnerProduct stores and Euclidean distance
+        for L2 stores.
+        
+        Args:
+            product_id: Product to measure from
+            other_product_ids: Products to measure to
+        
+        Returns:
+            Array of len(other_product_ids) distances. Pairs involving a product
+            without an embedding have distance 1.0.
+        """
+        result = np.ones(len(other_product_ids))
+        query = self.get_embedding(product_id)
+        if query is None:
+            return result
+
+        others = [self.get_embedding(other_id) for other_id in other_product_ids]
+        present = np.fromiter((e is not None for e in others), dtype=bool, count=len(others))
+        if not present.any():
+            return result
+
+        matrix = np.stack([e for e in others if e is not None]).astype(np.float64, copy=False)
+        query = np.asarray(query, dtype=np.float64)
+        if self.normalized:
+            result[present] = 1.0 - matrix @ query
+        else:
+            result[present] = np.linalg.norm(matrix - query, axis=1)
+        return result
 
-        if self.index_type == FAISSIndexType.INNER_PRODUCT:
-            return 1.0 - np.dot(emb1, emb2)
+    def distance_matrix(self, product_ids: List[str]) -> np.ndarray:
+        """Compute pairwise distances between products, as distance() would.
+        
+        Embeddings are gathered once and compared with a single matrix product
+        instead of one lookup and one vector operation per pair.
+        
+        Args:
+            product_ids: Products to compare
+        
+        Returns:
+            Array of shape (len(product_ids), len(product_ids)). Pairs involving a
+            product without an embedding have distance 1.0.
+        """
+        embeddings = [self.get_embedding(product_id) for product_id in product_ids]
+        present = np.fromiter((e is not None for e in embeddings), dtype=bool, count=len(embeddings))
+        distances = np.ones((len(product_ids), len(product_ids)))
+        if not present.any():
+            return distances
+
+        matrix = np.stack([e for e in embeddings if e is not None]).astype(np.float64, copy=False)
+        gram = matrix @ matrix.T
+        if self.normalized:
+            block = 1.0 - gram
         else:
-            return np.linalg.norm(emb1 - emb2)
+            squared_norms = np.diag(gram)
+            block = np.sqrt(np.maximum(squared_norms[:, None] + squared_norms[None, :] - 2.0 * gram, 0.0))
+        distances[np.ix_(present, present)] = block
+        return distances
 
     def save(self, file_path: str) -> None:
+        """Persist the vector store.
+
+        .faiss paths are written with faiss.write_index, with product IDs and
+        settings in a JSON sidecar and the stored vectors in an .npy sidecar, so
+        load() can memory-map both. Any other path (e.g. .pkl) uses the legacy
+        pickle format, which load() has to deserialize onto the heap; it is kept
+        only for compatibility and logs a warning.
+
+        Args:
+            file_path: Destination path
+        """
         logger.info("Saving vector store", file_path=file_path)
         if self.index is None:
             raise ValueError("Index is empty")
 
+        if not file_path.endswith(FAISS_INDEX_SUFFIX):
+            logger.warning(
+                "Saving vector store in the legacy pickle format",
+                file_path=file_path,
+                preferred_suffix=FAISS_INDEX_SUFFIX,
+            )
+            self._save_pickle(file_path)
+            logger.info("Vector store saved")
+            return
+
+        metadata_path, embeddings_path = index_sidecar_paths(file_path)
+        faiss.write_index(self._host_index(), file_path)
+
+        metadata = {
+            "product_ids": self.product_ids,
+            "dimension": self.dimension,
+            "index_type": self.index_type,
+            "index_factory": self.index_factory,
+            "nprobe": self.nprobe,
+            "quantization": self.quantization,
+        }
+        with open(metadata_path, "w") as f:
+            json.dump(metadata, f)
+
+        np.save(embeddings_path, self._stored_embeddings())
+
+        logger.info("Vector store saved")
+
+    def _stored_embeddings(self) -> np.ndarray:
+        """All stored vectors in product_ids order, read in bulk where possible."""
+        if not self.product_ids:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        if self._embeddings is not None and len(self._embeddings) == len(self.product_ids):
+            return self._embeddings
+        if self._embeddings is None and self._index_stores_vectors():
+            index = self._host_index()
+            return index.reconstruct_n(0, index.ntotal)
+        return np.stack([self.get_embedding(pid) for pid in self.product_ids])
+
+    def _save_pickle(self, file_path: str) -> None:
         data = {
-            "index": self.index,
+            "index": self._host_index(),
             "product_ids": self.product_ids,
-            "embeddings_map": self.embeddings_map,
+            "embeddings_map": {pid: self.get_embedding(pid) for pid in self.product_ids},
             "dimension": self.dimension,
             "index_type": self.index_type,
+            "index_factory": self.index_factory,
+            "nprobe": self.nprobe,
+            "quantization": self.quantization,
         }
 
         with open(file_path, "wb") as f:
             pickle.dump(data, f)
 
-        logger.info("Vector store saved")
-
     @classmethod
     def load(cls, file_path: str) -> "FAISSVectorStore":
-        logger.info("Loading vector store", file_path=file_path)
+        """Load a vector store written by save().
 
-        with open(file_path, "rb") as f:
-            data = pickle.load(f)
+        Native .faiss indices are memory-mapped read-only where the index type
+        supports it, so the index is not copied onto the heap; legacy .pkl files
+        are unpickled.
 
-        logger.info(
-            "Loaded pickle data",
-            keys=list(data.keys()),
-            product_ids_count=len(data.get("product_ids", [])),
-            has_index="index" in data,
-        )
+        Args:
+            file_path: Path to a .faiss or legacy .pkl file
 
-        instance = cls(dimension=data["dimension"], index_type=data["index_type"])
-        instance.index = data["index"]
-        instance.product_ids = data.get("product_ids", [])
-        instance.embeddings_map = data.get("embeddings_map", {})
-        
-        logger.info(
-            "Assigned to instance",
-            product_ids_count=len(instance.product_ids),
-            embeddings_map_count=len(instance.embeddings_map),
-        )
+        Returns:
+            Loaded FAISSVectorStore.
+        """
+        logger.info("Loading vector store", file_path=file_path)
+
+        if file_path.endswith(FAISS_INDEX_SUFFIX):
+            instance = cls._load_native(file_path)
+        else:
+            instance = cls._load_pickle(file_path)
+        instance._apply_search_parameters()
 
         try:
             if hasattr(instance.index, 'ntotal'):
@@ -254,3 +646,72 @@ class FAISSVectorStore:
         )
         return instance
 
+    @classmethod
+    def _load_native(cls, file_path: str) -> "FAISSVectorStore":
+        metadata_path, embeddings_path = index_sidecar_paths(file_path)
+        with open(metadata_path, "r") as f:
+            metadata = json.load(f)
+
+        instance = cls(
+            dimension=metadata["dimension"],
+            index_type=metadata["index_type"],
+            index_factory=metadata.get("index_factory"),
+            nprobe=metadata.get("nprobe"),
+            quantization=metadata.get("quantization"),
+        )
+        io_flags = faiss.IO_FLAG_MMAP | getattr(faiss, "IO_FLAG_READ_ONLY", 0)
+        instance.index = faiss.read_index(file_path, io_flags)
+        instance.product_ids = metadata.get("product_ids", [])
+
+        if instance._index_stores_vectors():
+            # The index reconstructs its own vectors, so the .npy sidecar is
+            # not mapped and its pages never compete with the index's for memory
+            instance._embedding_rows = dict(
+                zip(instance.product_ids, range(instance.index.ntotal))
+            )
+        elif os.path.exists(embeddings_path):
+            instance._embeddings = np.load(embeddings_path, mmap_mode="r")
+            instance._embedding_rows = dict(
+                zip(instance.product_ids, range(len(instance._embeddings)))
+            )
+
+        return instance
+
+    @classmethod
+    def _load_pickle(cls, file_path: str) -> "FAISSVectorStore":
+        with open(file_path, "rb") as f:
+            data = pickle.load(f)
+
+        logger.info(
+            "Loaded pickle data",
+            keys=list(data.keys()),
+            product_ids_count=len(data.get("product_ids", [])),
+            has_index="index" in data,
+        )
+
+        instance = cls(
+            dimension=data["dimension"],
+            index_type=data["index_type"],
+            index_factory=data.get("index_factory"),
+            nprobe=data.get("nprobe"),
+            quantization=data.get("quantization"),
+        )
+        instance.index = data["index"]
+        instance.product_ids = data.get("product_ids", [])
+        embeddings_map = data.get("embeddings_map", {})
+        if embeddings_map and all(pid in embeddings_map for pid in instance.product_ids):
+            # Row-aligned with product_ids, like stores built by add_embeddings
+            instance._embeddings = np.stack([embeddings_map[pid] for pid in instance.product_ids])
+            instance._embedding_rows = dict(
+                zip(instance.product_ids, range(len(instance.product_ids)))
+            )
+        elif embeddings_map:
+            instance._embeddings = np.stack(list(embeddings_map.values()))
+            instance._embedding_rows = dict(zip(embeddings_map, range(len(embeddings_map))))
+        
+        logger.info(
+            "Assigned to instance",
+            product_ids_count=len(instance.product_ids),
+            embeddings_map_count=len(embeddings_map),
+        )
+        return instance
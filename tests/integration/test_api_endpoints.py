@@ -142,3 +142,12 @@ def test_openapi_json_endpoint(client):
     assert "openapi" in data
     assert "info" in data
 
+
+
+def test_eda_figure_rejects_unsafe_filename(client):
+    """Test figure endpoint rejects names outside the allowlist."""
+    response = client.get("/api/v1/reports/eda/figures/..%2F..%2Fsettings.py")
+    assert response.status_code == 404
+    
+    response = client.get("/api/v1/reports/eda/figures/report.html")
+    assert response.status_code == 404
@@ -0,0 +1,73 @@
+"""Unit tests for artifact discovery."""
+import os
+
+from src.infrastructure.artifacts import (
+    compress_catalog,
+    decompress_catalog,
+    find_latest_artifact,
+    find_latest_index,
+    index_sidecar_paths,
+    list_artifact_names,
+)
+
+
+def test_find_latest_artifact(tmp_path):
+    """Test the newest matching version is selected and other files are ignored."""
+    for name in ["faiss_index_20240101.pkl", "faiss_index_20240301.pkl", "faiss_index_20240201.pkl",
+                 "faiss_index_20250101.npy", "embeddings_20260101.pkl"]:
+        (tmp_path / name).touch()
+
+    latest = find_latest_artifact(str(tmp_path), "faiss_index_", ".pkl")
+    assert latest == os.path.join(str(tmp_path), "faiss_index_20240301.pkl")
+
+
+def test_find_latest_artifact_missing(tmp_path):
+    """Test None is returned for an empty or missing directory."""
+    assert find_latest_artifact(str(tmp_path), "faiss_index_", ".pkl") is None
+    assert find_latest_artifact(str(tmp_path / "missing"), "faiss_index_", ".pkl") is None
+
+
+def test_find_latest_index_prefers_native_format(tmp_path):
+    """Test .faiss indices win over legacy .pkl ones, which remain a fallback."""
+    (tmp_path / "faiss_index_20240301.pkl").touch()
+    assert find_latest_index(str(tmp_path)) == os.path.join(str(tmp_path), "faiss_index_20240301.pkl")
+
+    (tmp_path / "faiss_index_20240101.faiss").touch()
+    assert find_latest_index(str(tmp_path)) == os.path.join(str(tmp_path), "faiss_index_20240101.faiss")
+
+
+def test_index_sidecar_paths():
+    """Test sidecar names are derived from the index path."""
+    assert index_sidecar_paths("indices/faiss_index_20240101.faiss") == (
+        "indices/faiss_index_20240101_metadata.json",
+        "indices/faiss_index_20240101_embeddings.npy",
+    )
+
+
+def test_catalog_compression_round_trip(tmp_path):
+    """Test a compressed catalog unpacks to the original JSON and the archive is removed."""
+    catalog = tmp_path / "user_catalog.json"
+    catalog.write_text('{"user_to_idx": {"U1": 0}}')
+
+    compressed = tmp_path / "download.json.gz"
+    compressed.write_bytes(compress_catalog(str(catalog)))
+    restored = tmp_path / "restored.json"
+    decompress_catalog(str(compressed), str(restored))
+
+    assert restored.read_text() == catalog.read_text()
+    assert not compressed.exists()
+
+
+def test_list_artifact_names_reused_for_lookups(tmp_path):
+    """Test one scan's names answer latest-artifact lookups without rescanning."""
+    for name in ["embeddings_20240101.npy", "faiss_index_20240101.faiss"]:
+        (tmp_path / name).touch()
+
+    names = list_artifact_names(str(tmp_path))
+    assert names == {"embeddings_20240101.npy", "faiss_index_20240101.faiss"}
+    assert list_artifact_names(str(tmp_path / "missing")) == set()
+
+    (tmp_path / "faiss_index_20250101.faiss").touch()
+    assert find_latest_index(str(tmp_path), names=names) == os.path.join(
+        str(tmp_path), "faiss_index_20240101.faiss"
+    )
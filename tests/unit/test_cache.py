@@ -0,0 +1,40 @@
+"""Unit tests for the in-process cache tier."""
+from src.infrastructure.cache import LocalCache
+
+
+def test_local_cache_evicts_least_recently_used():
+    """The oldest untouched key is dropped once maxsize is exceeded."""
+    local_cache = LocalCache(maxsize=2, ttl=60)
+    local_cache.set("a", 1)
+    local_cache.set("b", 2)
+    assert local_cache.get("a") == 1
+
+    local_cache.set("c", 3)
+
+    assert local_cache.get("b") is None
+    assert local_cache.get("a") == 1
+    assert local_cache.get("c") == 3
+
+
+def test_local_cache_expires_entries(monkeypatch):
+    """Entries are not returned after their TTL."""
+    now = [100.0]
+    monkeypatch.setattr("src.infrastructure.cache.time.monotonic", lambda: now[0])
+    local_cache = LocalCache(maxsize=10, ttl=60)
+    local_cache.set("key", ["P001"])
+
+    now[0] += 59
+    assert local_cache.get("key") == ["P001"]
+
+    now[0] += 2
+    assert local_cache.get("key") is None
+
+
+def test_json_cache_round_trips_bytes():
+    """Bytes survive the JSON encoding used for redis-backed caches."""
+    from src.infrastructure.cache import _from_json, _json_default
+    import json
+
+    blob = bytes(range(256))
+    encoded = json.dumps({"value": blob}, default=_json_default)
+    assert _from_json(json.loads(encoded)["value"]) == blob
@@ -0,0 +1,133 @@
+"""Unit tests for user and product catalogs."""
+import pandas as pd
+
+from src.data.catalog import UserCatalog, ProductCatalog
+
+
+def _transactions():
+    return pd.DataFrame({
+        "user_id": ["U002", "U001", "U002"],
+        "product_id": ["P010", "P020", "P020"],
+        "rating": [4.0, 5.0, 3.0],
+    })
+
+
+def test_catalog_index_maps_round_trip(tmp_path):
+    """Index maps follow first appearance and survive save/load."""
+    catalog = UserCatalog(_transactions())
+    assert catalog.get_user_idx("U002") == 0
+    assert catalog.get_user_id(1) == "U001"
+    assert catalog.get_user_id(5) == ""
+
+    path = str(tmp_path / "user_catalog.json")
+    catalog.save(path)
+    loaded = UserCatalog.load(path)
+    assert loaded.get_user_idx("U001") == 1
+    assert loaded.get_user_id(0) == "U002"
+
+
+def test_product_metadata():
+    """Metadata is keyed by product ID and missing columns become empty strings."""
+    products_df = pd.DataFrame({
+        "product_id": ["P010", "P020"],
+        "name": ["Lamp", "Desk"],
+        "category": ["home", "office"],
+    })
+    catalog = ProductCatalog(_transactions(), products_df)
+
+    assert catalog.get_product_metadata("P020") == {"category": "office", "name": "Desk", "description": ""}
+    assert catalog.get_product_id(catalog.get_product_idx("P010")) == "P010"
+
+
+def test_product_metadata_survives_save_load(tmp_path):
+    """Columnar metadata is written as per-product records and read back."""
+    products_df = pd.DataFrame({
+        "product_id": ["P010", "P020", "P010"],
+        "name": ["Lamp", "Desk", "Floor lamp"],
+        "category": ["home", "office", "home"],
+        "description": ["", "", "Tall"],
+    })
+    catalog = ProductCatalog(_transactions(), products_df)
+    assert len(catalog.product_metadata) == 2
+
+    path = str(tmp_path / "product_catalog.json")
+    catalog.save(path)
+    loaded = ProductCatalog.load(path)
+    assert loaded.get_product_metadata("P010") == {"category": "home", "name": "Floor lamp", "description": "Tall"}
+    assert loaded.get_product_metadata("P999") == {}
+
+
+def test_user_stats_survive_save_load(tmp_path):
+    """Per-user stats are read from the columnar arrays before and after save/load."""
+    catalog = UserCatalog(_transactions())
+    expected = {"total_interactions": 2.0, "avg_rating": 3.5, "min_rating": 3.0, "max_rating": 4.0}
+    assert catalog.get_user_stats("U002") == expected
+    assert catalog.get_user_stats("U999") == {}
+
+    path = str(tmp_path / "user_catalog.json")
+    catalog.save(path)
+    assert UserCatalog.load(path).get_user_stats("U002") == expected
+
+
+def test_user_catalog_loads_per_user_stats_layout(tmp_path):
+    """Catalogs saved with per-user stats records and index maps still load."""
+    path = tmp_path / "user_catalog.json"
+    path.write_text(
+        '{"user_stats": {"U001": {"total_interactions": 1.0, "avg_rating": 5.0, '
+        '"min_rating": 5.0, "max_rating": 5.0}}, '
+        '"user_to_idx": {"U001": 0}, "idx_to_user": {"0": "U001"}}'
+    )
+    catalog = UserCatalog.load(str(path))
+    assert catalog.get_user_stats("U001")["avg_rating"] == 5.0
+    assert catalog.get_user_idx("U001") == 0
+
+
+def test_product_filter_mask():
+    """Search filters are applied column-wise; unknown products fail them."""
+    transactions = pd.DataFrame({
+        "user_id": ["U001", "U002", "U001", "U003"],
+        "product_id": ["P001", "P001", "P002", "P003"],
+        "rating": [5, 3, 2, 5],
+    })
+    products = pd.DataFrame({
+        "product_id": ["P001", "P002", "P003"],
+        "category": ["books", "books", "toys"],
+        "name": ["A", "B", "C"],
+        "description": ["", "", ""],
+    })
+    catalog = ProductCatalog(transactions, products)
+    product_ids = ["P001", "P002", "P003", "P999"]
+
+    assert catalog.filter_mask(product_ids, {"category": "books"}).tolist() == [True, True, False, False]
+    assert catalog.filter_mask(product_ids, {"min_rating": 3.5}).tolist() == [True, False, True, False]
+    assert catalog.filter_mask(
+        product_ids, {"category": "books", "min_interactions": 2}
+    ).tolist() == [True, False, False, False]
+
+
+def test_describe_products_matches_per_product_lookups():
+    """describe_products gathers the same fields as the per-product getters."""
+    products = pd.DataFrame({
+        "product_id": ["P010", "P020"],
+        "category": ["books", "toys"],
+        "name": ["Novel", "Robot"],
+        "description": ["A novel", "A robot"],
+    })
+    catalog = ProductCatalog(_transactions(), products)
+
+    described = catalog.describe_products(["P020", "P999"])
+
+    assert described[0] == {
+        "name": "Robot",
+        "category": "toys",
+        "description": "A robot",
+        "avg_rating": catalog.get_product_stats("P020")["avg_rating"],
+        "total_interactions": 2,
+    }
+    assert described[1] == {
+        "name": "",
+        "category": "",
+        "description": "",
+        "avg_rating": 0.0,
+        "total_interactions": 0,
+    }
@@ -0,0 +1,39 @@
+"""Unit tests for the collaborative filter."""
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.models import collaborative
+from src.models.collaborative import CollaborativeFilter
+
+
+def _filter_with_factors(n_users: int, n_items: int) -> CollaborativeFilter:
+    rng = np.random.default_rng(0)
+    cf = CollaborativeFilter(factors=4)
+    cf.model = SimpleNamespace(
+        user_factors=rng.random((n_users, 4), dtype=np.float32),
+        item_factors=rng.random((n_items, 4), dtype=np.float32),
+    )
+    user_ids = [f"U{i}" for i in range(n_users)]
+    product_ids = [f"P{i}" for i in range(n_items)]
+    cf.user_to_idx = dict(zip(user_ids, range(n_users)))
+    cf.product_to_idx = dict(zip(product_ids, range(n_items)))
+    cf.idx_to_product = dict(enumerate(product_ids))
+    cf.product_ids = np.asarray(product_ids, dtype=object)
+    return cf
+
+
+def test_recommend_batch_blocks_match_full_scoring(monkeypatch):
+    """Scoring users in small blocks gives each user their exact top-k."""
+    monkeypatch.setattr(collaborative, "RECOMMEND_BATCH_BLOCK_USERS", 3)
+    cf = _filter_with_factors(n_users=10, n_items=20)
+    user_ids = [f"U{i}" for i in range(10)] + ["unknown"]
+
+    recommendations = cf.recommend_batch(user_ids, top_k=5)
+
+    assert recommendations["unknown"] == []
+    for i in range(10):
+        scores = cf.model.item_factors @ cf.model.user_factors[i]
+        expected = [f"P{j}" for j in np.argsort(-scores, kind="stable")[:5]]
+        assert [pid for pid, _ in recommendations[f"U{i}"]] == expected
+        assert all(isinstance(score, float) for _, score in recommendations[f"U{i}"])
@@ -1,9 +1,18 @@
 """Unit tests for embeddings module."""
 import pytest
 import numpy as np
+import pandas as pd
 from unittest.mock import Mock, patch, MagicMock
 
-from src.models.embeddings import prepare_product_text, get_embedding, generate_embeddings
+from src.models.embeddings import (
+    prepare_product_text,
+    prepare_product_texts,
+    get_embedding,
+    get_embeddings_batch,
+    generate_embeddings,
+    save_embeddings,
+    load_embeddings,
+)
 
 
 def test_prepare_product_text_full():
@@ -33,6 +42,20 @@ def test_prepare_product_text_empty():
     assert text == "Product"
 
 
+def test_prepare_product_texts_matches_row_wise():
+    """Test the DataFrame version builds the same texts as prepare_product_text."""
+    products = [
+        {"name": "Test Product", "description": "Test Description", "category": "Electronics"},
+        {"name": "Test Product", "description": "", "category": "Books"},
+        {"name": "Test Product", "description": "Only description", "category": ""},
+        {"name": "", "description": "", "category": ""},
+    ]
+    texts = prepare_product_texts(pd.DataFrame(products))
+    assert texts == [prepare_product_text(product) for product in products]
+
+    assert prepare_product_texts(pd.DataFrame({"name": ["Test Product"]})) == ["Test Product"]
+
+
 @patch("src.models.embeddings.OpenAI")
 def test_get_embedding_success(mock_openai):
     """Test successful embedding retrieval."""
@@ -60,7 +83,7 @@ def test_generate_embeddings_batch(mock_openai):
     # Mock embedding response
     mock_embedding = [0.1] * 1536
     mock_client.embeddings.create.return_value = Mock(
-        data=[Mock(embedding=mock_embedding)]
+        data=[Mock(embedding=mock_embedding), Mock(embedding=mock_embedding)]
     )
     
     products = [
@@ -78,4 +101,125 @@ def test_generate_embeddings_batch(mock_openai):
         assert embeddings.shape[0] == 2
         assert embeddings.shape[1] == 1536
         assert isinstance(embeddings, np.ndarray)
+        # Both products are embedded with one request
+        assert mock_client.embeddings.create.call_count == 1
+        assert mock_client.embeddings.create.call_args.kwargs["input"] == [
+            "Product 1 Desc 1", "Product 2 Desc 2"
+        ]
+
+
+def test_generate_embeddings_keeps_order_and_zero_fills_failures():
+    """Test concurrent batches keep input order and failures become zero vectors."""
+    def create(model, input, dimensions):
+        texts = input if isinstance(input, list) else [input]
+        if "Product 3" in texts:
+            raise RuntimeError("rate limited")
+        return Mock(data=[Mock(embedding=[float(text.split()[-1])] * dimensions) for text in texts])
+
+    mock_client = Mock()
+    mock_client.embeddings.create.side_effect = create
+    products = [{"name": f"Product {i}"} for i in range(1, 6)]
+
+    with patch("src.models.embeddings.settings") as mock_settings, \
+            patch("src.models.embeddings.get_embedding.retry.sleep"), \
+            patch("src.models.embeddings.get_embeddings_batch.retry.sleep"):
+        mock_settings.openai_model_id = "text-embedding-3-large"
+        mock_settings.openai_embedding_dimension = 4
+
+        embeddings = generate_embeddings(products, batch_size=2, client=mock_client, max_workers=4)
+
+    assert embeddings.shape == (5, 4)
+    assert embeddings[:, 0].tolist() == [1.0, 2.0, 0.0, 4.0, 5.0]
+
+
+def test_generate_embeddings_embeds_duplicate_texts_once():
+    """Test products sharing a text reuse a single embedding request."""
+    mock_client = Mock()
+    mock_client.embeddings.create.side_effect = lambda model, input, dimensions: Mock(
+        data=[Mock(embedding=[float(len(text))] * dimensions) for text in input]
+    )
+    products = [{"name": "Mouse"}, {"name": "Keyboard"}, {"name": "Mouse"}]
+
+    with patch("src.models.embeddings.settings") as mock_settings:
+        mock_settings.openai_model_id = "text-embedding-3-large"
+        mock_settings.openai_embedding_dimension = 2
+
+        embeddings = generate_embeddings(products, client=mock_client)
+
+    assert mock_client.embeddings.create.call_args.kwargs["input"] == ["Mouse", "Keyboard"]
+    assert embeddings[:, 0].tolist() == [5.0, 8.0, 5.0]
+
+
+def test_save_and_load_embeddings_float16(tmp_path):
+    """Test embeddings are stored as float16 and loaded memory-mapped."""
+    import json
+    from src.services.vector_store import FAISSVectorStore
+
+    embeddings = np.random.rand(4, 8).astype(np.float32)
+    file_path = str(tmp_path / "embeddings_20240101.npy")
+
+    save_embeddings(embeddings, file_path, metadata={"date": "20240101"})
+    with open(file_path.replace(".npy", "_metadata.json")) as f:
+        metadata = json.load(f)
+    assert metadata["dtype"] == "float16"
+    assert metadata["shape"] == [4, 8]
+
+    loaded = load_embeddings(file_path)
+    # Mapped from the file, not read into an owned in-memory array
+    assert not loaded.flags.owndata
+    assert not loaded.flags.writeable
+    assert loaded.dtype == np.float16
+    np.testing.assert_allclose(loaded, embeddings, atol=1e-3)
+
+    store = FAISSVectorStore(dimension=8)
+    store.add_embeddings(["P1", "P2", "P3", "P4"], loaded)
+    assert store.index.ntotal == 4
+
+    # float32 files are mapped read-only as well and must not be normalized in place
+    save_embeddings(embeddings, file_path, dtype=np.float32)
+    store = FAISSVectorStore(dimension=8)
+    store.add_embeddings(["P1", "P2", "P3", "P4"], load_embeddings(file_path))
+    assert store.index.ntotal == 4
+
+
+def test_save_and_load_compressed_embeddings(tmp_path):
+    """Test compressed embeddings are written as .npz and load back unchanged."""
+    import json
+
+    embeddings = np.random.rand(4, 8).astype(np.float32)
+    file_path = save_embeddings(
+        embeddings, str(tmp_path / "embeddings_20240101.npy"), metadata={"date": "20240101"},
+        compressed=True,
+    )
+
+    assert file_path.endswith("embeddings_20240101.npz")
+    with open(tmp_path / "embeddings_20240101_metadata.json") as f:
+        assert json.load(f)["file"] == "embeddings_20240101.npz"
+
+    loaded = load_embeddings(file_path)
+    assert loaded.dtype == np.float16
+    np.testing.assert_allclose(loaded, embeddings, atol=1e-3)
+
+
+def test_generate_embeddings_reuses_cached_texts(tmp_path):
+    """Test texts found in the embedding cache are not requested again."""
+    from src.models.embeddings import EmbeddingCache
+
+    mock_client = Mock()
+    mock_client.embeddings.create.side_effect = lambda model, input, dimensions: Mock(
+        data=[Mock(embedding=[float(len(text))] * dimensions) for text in input]
+    )
+    cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite"))
+
+    with patch("src.models.embeddings.settings") as mock_settings:
+        mock_settings.openai_model_id = "text-embedding-3-large"
+        mock_settings.openai_embedding_dimension = 2
+
+        generate_embeddings([{"name": "Mouse"}], client=mock_client, cache=cache)
+        embeddings = generate_embeddings(
+            [{"name": "Mouse"}, {"name": "Keyboard"}], client=mock_client, cache=cache
+        )
 
+    assert mock_client.embeddings.create.call_args.kwargs["input"] == ["Keyboard"]
+    assert embeddings[:, 0].tolist() == [5.0, 8.0]
+    cache.close()
@@ -0,0 +1,80 @@
+"""Unit tests for recommender evaluation."""
+import pytest
+import pandas as pd
+
+from src.models.evaluation import RecommenderEvaluator
+
+
+@pytest.fixture
+def evaluator():
+    test_df = pd.DataFrame({
+        "user_id": ["U001", "U001", "U001", "U002", "U002"],
+        "product_id": ["P001", "P002", "P003", "P001", "P004"],
+        "rating": [5, 4, 2, 5, 1],
+    })
+    return RecommenderEvaluator(test_df)
+
+
+def test_ground_truth_keeps_relevant_items(evaluator):
+    """Only items rated >= 4 count as relevant."""
+    assert evaluator.user_ground_truth["U001"] == frozenset({"P001", "P002"})
+    assert evaluator.user_ground_truth["U002"] == frozenset({"P001"})
+
+
+def test_ground_truth_keeps_users_without_relevant_items():
+    """Users with no item rated >= 4 are kept with an empty set."""
+    evaluator = RecommenderEvaluator(pd.DataFrame({
+        "user_id": ["U001", "U002"],
+        "product_id": ["P001", "P002"],
+        "rating": [5, 2],
+    }))
+    assert evaluator.user_ground_truth == {"U001": frozenset({"P001"}), "U002": frozenset()}
+
+
+def test_evaluate_matches_evaluate_recommendations(evaluator):
+    """evaluate() scores the same lists as evaluate_recommendations()."""
+    ranked = {
+        "U001": ["P001", "P005", "P002"],
+        "U002": ["P004", "P001", "P003"],
+    }
+
+    def recommend(user_id: str, top_k: int):
+        return [(product_id, 1.0) for product_id in ranked[user_id][:top_k]]
+
+    summary = evaluator.evaluate(recommend, k_values=[1, 3])
+    assert summary == evaluator.evaluate_recommendations(ranked, k_values=[1, 3])
+
+    assert summary["precision@1"]["mean"] == pytest.approx(0.5)
+    assert summary["recall@3"]["mean"] == pytest.approx(1.0)
+
+
+def test_failing_recommender_scores_zero(evaluator):
+    """Users whose recommender call raises are scored as empty lists."""
+    def recommend(user_id: str, top_k: int):
+        raise RuntimeError("model unavailable")
+
+    summary = evaluator.evaluate(recommend, k_values=[5])
+    assert summary["precision@5"]["mean"] == 0.0
+    assert summary["ndcg@5"]["mean"] == 0.0
+
+
+def test_evaluate_recommendations_matches_metric_methods(evaluator):
+    """Vectorized metrics agree with the per-user metric methods."""
+    ranked = {
+        "U001": ["P003", "P002", "P009", "P001"],
+        "U002": ["P001"],
+    }
+    summary = evaluator.evaluate_recommendations(ranked, k_values=[2, 4])
+
+    for k in (2, 4):
+        for metric, method in (
+            ("precision", evaluator.precision_at_k),
+            ("recall", evaluator.recall_at_k),
+            ("ndcg", evaluator.ndcg_at_k),
+            ("map", evaluator.map_at_k),
+        ):
+            expected = [
+                method(ranked[user_id], ground_truth, k)
+                for user_id, ground_truth in evaluator.user_ground_truth.items()
+            ]
+            assert summary[f"{metric}@{k}"]["mean"] == pytest.approx(sum(expected) / len(expected))
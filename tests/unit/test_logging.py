@@ -0,0 +1,15 @@
+"""Unit tests for logging configuration."""
+import json
+
+from src.infrastructure.logging import _json_renderer
+
+
+def test_json_renderer_accepts_non_str_dict_keys():
+    """Events carrying dicts with int keys (e.g. value_counts()) still render."""
+    rendered = _json_renderer()(
+        None, "info", {"event": "Data quality report", "report": {"rating_distribution": {5: 10, 1: 2}}}
+    )
+
+    if isinstance(rendered, bytes):
+        rendered = rendered.decode()
+    assert json.loads(rendered)["report"]["rating_distribution"] == {"5": 10, "1": 2}
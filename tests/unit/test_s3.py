@@ -0,0 +1,20 @@
+"""Unit tests for the shared S3 helpers."""
+from unittest.mock import Mock
+
+from src.infrastructure.s3 import find_latest_key
+
+
+def test_find_latest_key_follows_every_listing_page():
+    """The newest key on a later page wins, with suffixes in order of preference."""
+    pages = [
+        {"Contents": [{"Key": "indices/faiss_index_20240101.faiss"}, {"Key": "indices/faiss_index_20240301.pkl"}]},
+        {"Contents": [{"Key": "indices/faiss_index_20240201.faiss"}]},
+        {},
+    ]
+    s3_client = Mock()
+    s3_client.get_paginator.return_value.paginate.return_value = pages
+
+    assert find_latest_key(s3_client, "indices/", ".faiss", ".pkl") == "indices/faiss_index_20240201.faiss"
+    assert find_latest_key(s3_client, "indices/", ".npy", ".pkl") == "indices/faiss_index_20240301.pkl"
+    assert find_latest_key(s3_client, "indices/", ".npy") is None
+    s3_client.get_paginator.assert_called_with("list_objects_v2")
@@ -0,0 +1,94 @@
+"""Unit tests for the search service."""
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import numpy as np
+
+from src.services.search import _SearchBatcher
+
+
+def test_search_batcher_coalesces_concurrent_queries():
+    """Concurrent queries share one search_batch call and get their own top_k."""
+    vector_store = Mock()
+    vector_store.search_batch_arrays.side_effect = lambda queries, top_k: [
+        (
+            np.array([f"P{int(row[0])}-{rank}" for rank in range(top_k)], dtype=object),
+            np.ones(top_k, dtype=np.float32),
+        )
+        for row in queries
+    ]
+    batcher = _SearchBatcher(vector_store, window_seconds=0.2)
+    # Another search is already in flight, so the first of these waits for the rest
+    batcher._in_flight = 1
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [
+            executor.submit(batcher.search, np.full(4, i, dtype=np.float32), i + 1)
+            for i in range(3)
+        ]
+        results = [future.result() for future in futures]
+
+    assert vector_store.search_batch_arrays.call_count == 1
+    assert [len(product_ids) for product_ids, _ in results] == [1, 2, 3]
+    assert [product_ids[0] for product_ids, _ in results] == ["P0-0", "P1-0", "P2-0"]
+
+
+def test_search_batcher_runs_a_lone_query_without_waiting():
+    """With nothing else in flight the batch window is skipped."""
+    import time
+
+    vector_store = Mock()
+    vector_store.search_batch_arrays.return_value = [
+        (np.array(["P1"], dtype=object), np.ones(1, dtype=np.float32))
+    ]
+    batcher = _SearchBatcher(vector_store, window_seconds=10)
+
+    start = time.perf_counter()
+    product_ids, _ = batcher.search(np.zeros(4, dtype=np.float32), 1)
+
+    assert time.perf_counter() - start < 1
+    assert product_ids.tolist() == ["P1"]
+    assert batcher._in_flight == 0
+
+
+def test_cached_query_embeddings_reuse_the_thread_buffer(monkeypatch):
+    """Cache hits are copied into one per-thread buffer instead of new arrays."""
+    from src.services import search as search_module
+
+    cached = {"value": np.arange(4, dtype=np.float32).tobytes()}
+    monkeypatch.setattr(search_module.cache, "get", lambda key: cached["value"])
+    service = search_module.SearchService(
+        vector_store=Mock(product_ids=[]), product_catalog=Mock(), openai_client=Mock()
+    )
+
+    first = service._get_query_embedding("red shoes")
+    first_values = first.tolist()
+    cached["value"] = np.ones(4, dtype=np.float32).tobytes()
+    second = service._get_query_embedding("blue shoes")
+
+    assert first_values == [0.0, 1.0, 2.0, 3.0]
+    assert second is first
+    assert second.tolist() == [1.0, 1.0, 1.0, 1.0]
+
+
+def test_query_embedding_cache_key_is_a_content_digest(monkeypatch):
+    """The key is a BLAKE2b digest of model, dimension and query, not hash(query)."""
+    import hashlib
+
+    from src.services import search as search_module
+
+    keys = []
+    monkeypatch.setattr(
+        search_module.cache, "get", lambda key: keys.append(key) or np.zeros(4, dtype=np.float32).tobytes()
+    )
+    service = search_module.SearchService(
+        vector_store=Mock(product_ids=[]), product_catalog=Mock(), openai_client=Mock()
+    )
+    service._get_query_embedding("red shoes")
+
+    settings = search_module.settings
+    expected = hashlib.blake2b(
+        f"{settings.openai_model_id}\x00{settings.openai_embedding_dimension}\x00red shoes".encode(),
+        digest_size=16,
+    ).hexdigest()
+    assert keys == [f"query_embedding:{expected}"]
@@ -0,0 +1,87 @@
+"""Unit tests for report serialization."""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.infrastructure import serialization
+from src.infrastructure.serialization import read_json, write_json, write_json_report
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def encoder(request, monkeypatch):
+    """Run a test with orjson (when installed) and with the stdlib fallback."""
+    if request.param == "stdlib":
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+def test_write_json_report_handles_numpy_and_non_str_keys(tmp_path, encoder):
+    """numpy scalars, numeric keys and unknown types round-trip through JSON."""
+    path = tmp_path / "report.json"
+    report = {
+        "total": np.int64(3),
+        "share": np.float32(0.5),
+        "counts": np.array([1, 2]),
+        "ratings": {5.0: 2, 4.0: 1},
+        "min": pd.Timestamp("2024-01-01"),
+    }
+
+    write_json_report(str(path), report)
+
+    loaded = json.loads(path.read_text())
+    assert loaded["total"] == 3
+    assert loaded["share"] == 0.5
+    assert loaded["counts"] == [1, 2]
+    assert loaded["ratings"] == {"5.0": 2, "4.0": 1}
+    assert loaded["min"].startswith("2024-01-01")
+
+
+def test_write_json_round_trips_index_maps(tmp_path, encoder):
+    """Catalog-style index maps with int keys round-trip with string keys."""
+    path = tmp_path / "catalog.json"
+    data = {
+        "user_to_idx": {"U1": 0, "U2": 1},
+        "idx_to_user": {0: "U1", 1: "U2"},
+        "stats": {"avg_rating": np.float64(4.5), "total_interactions": np.int64(7)},
+    }
+
+    write_json(str(path), data)
+
+    loaded = read_json(str(path))
+    assert loaded["user_to_idx"] == {"U1": 0, "U2": 1}
+    assert loaded["idx_to_user"] == {"0": "U1", "1": "U2"}
+    assert loaded["stats"] == {"avg_rating": 4.5, "total_interactions": 7}
+
+
+def test_read_json_reads_nan_written_by_stdlib(tmp_path, monkeypatch):
+    """Files the stdlib encoder wrote with NaN still load when orjson is installed."""
+    if serialization.orjson is None:
+        pytest.skip("orjson not installed")
+    path = tmp_path / "catalog.json"
+    with monkeypatch.context() as patch:
+        patch.setattr(serialization, "orjson", None)
+        write_json(str(path), {"avg_rating": [float("nan"), 4.0]})
+
+    loaded = read_json(str(path))
+    assert np.isnan(loaded["avg_rating"][0])
+    assert loaded["avg_rating"][1] == 4.0
+
+
+def test_write_json_report_writes_nan_as_null(tmp_path, encoder):
+    """Reports are standard JSON: NaN and Infinity become null with either encoder."""
+    path = tmp_path / "report.json"
+    report = {
+        "mean": float("nan"),
+        "max": np.float32("inf"),
+        "values": np.array([1.0, np.nan]),
+        "nested": [{"std": np.float64("nan")}],
+    }
+
+    write_json_report(str(path), report)
+
+    loaded = json.loads(path.read_text(), parse_constant=pytest.fail)
+    assert loaded == {"mean": None, "max": None, "values": [1.0, None], "nested": [{"std": None}]}
@@ -0,0 +1,27 @@
+import pandas as pd
+from src.data.transformation import clean_data, validate_and_clean_batches
+from src.data.validation import validate_transactions
+
+
+def test_validate_and_clean_batches_matches_full_pipeline():
+    df = pd.DataFrame({
+        "user_id": ["U001", "U001", "U002", "U003", "U001", "U004"],
+        "product_id": ["P001", "P001", "P002", "P003", "P001", "P004"],
+        "rating": [5, 3, 7, 4, 2, 1],
+        "timestamp": [
+            "2024-01-01T12:00:00Z",
+            "2024-01-01T13:00:00+0100",
+            "2024-01-02T12:00:00",
+            "not-a-timestamp",
+            "2024-01-01T12:00:00+00:00",
+            "2024-01-03T08:30:00",
+        ],
+    })
+
+    expected = clean_data(validate_transactions(df)).reset_index(drop=True)
+    batches = (df.iloc[start:start + 2] for start in range(0, len(df), 2))
+    result = validate_and_clean_batches(batches)
+
+    pd.testing.assert_frame_equal(result, expected)
+    # The three U001/P001 rows share one normalized timestamp; rating 7 and the bad timestamp are dropped
+    assert result["rating"].tolist() == [2, 1]
@@ -46,3 +46,39 @@ def test_product_validation():
     assert valid_product.product_id == "P001"
     assert valid_product.category == "electronics"
 
+
+
+def test_validate_transactions_drops_invalid_rows():
+    df = pd.DataFrame({
+        "user_id": ["U001", "U002", "U003", "U004"],
+        "product_id": ["P001", "P002", "P003", "P004"],
+        "rating": [5, 7, 4.6, None],
+        "timestamp": ["2024-01-01T12:00:00Z", "2024-01-02T12:00:00", "2024-01-03", "2024-01-04T08:00:00"],
+    })
+    df.loc[2, "timestamp"] = "not-a-timestamp"
+
+    validated_df = validate_transactions(df)
+    assert validated_df["user_id"].tolist() == ["U001"]
+
+
+def test_validate_products_requires_all_columns():
+    df = pd.DataFrame({"product_id": ["P001"], "category": ["home"], "name": ["Lamp"]})
+    assert validate_products(df).empty
+    
+    df["description"] = ""
+    assert len(validate_products(df)) == 1
+
+
+def test_data_quality_report_rating_stats():
+    from src.data.validation import get_data_quality_report
+
+    df = pd.DataFrame({
+        "user_id": ["U001", "U001", "U002", "U003"],
+        "product_id": ["P001", "P002", "P001", "P003"],
+        "rating": [5, 3, 4, 4],
+    })
+
+    stats = get_data_quality_report(df)["rating_stats"]
+    assert stats["mean"] == pytest.approx(df["rating"].mean())
+    assert stats["std"] == pytest.approx(df["rating"].std())
+    assert (stats["min"], stats["max"]) == (3, 5)
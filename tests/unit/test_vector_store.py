@@ -4,7 +4,7 @@ import numpy as np
 import tempfile
 import os
 
-from src.services.vector_store import FAISSVectorStore
+from src.services.vector_store import FAISSVectorStore, _normalize_rows
 from src.config.constants import FAISSIndexType
 
 
@@ -96,3 +96,266 @@ def test_get_embedding():
     missing_embedding = store.get_embedding("P999")
     assert missing_embedding is None
 
+
+
+def test_flat_index_serves_embeddings_without_a_copy():
+    """Test a flat store reads embeddings back from the index instead of a second copy."""
+    store = FAISSVectorStore(dimension=8, index_type=FAISSIndexType.INNER_PRODUCT)
+    embeddings = np.random.rand(3, 8).astype(np.float32)
+    store.add_embeddings(["P001", "P002", "P003"], embeddings)
+
+    assert store._embeddings is None
+    expected = embeddings[1] / np.linalg.norm(embeddings[1])
+    np.testing.assert_allclose(store.get_embedding("P002"), expected, rtol=1e-5)
+
+
+def test_search_batch_matches_search():
+    """Test batched search returns the same results as per-query search."""
+    store = FAISSVectorStore(dimension=64, index_type=FAISSIndexType.INNER_PRODUCT)
+    
+    product_ids = [f"P{i:03d}" for i in range(20)]
+    store.add_embeddings(product_ids, np.random.rand(20, 64).astype(np.float32))
+    
+    queries = np.random.rand(3, 64).astype(np.float32)
+    batch_results = store.search_batch(queries.copy(), top_k=5)
+    
+    assert len(batch_results) == 3
+    for query, results in zip(queries, batch_results):
+        assert [p for p, _ in results] == [p for p, _ in store.search(query.copy(), top_k=5)]
+
+
+def test_index_factory_trains_before_add(tmp_path):
+    """Test a trainable factory index is trained on add and survives save/load."""
+    store = FAISSVectorStore(
+        dimension=16, index_type=FAISSIndexType.INNER_PRODUCT, index_factory="IVF4,Flat"
+    )
+    product_ids = [f"P{i:03d}" for i in range(200)]
+    embeddings = np.random.rand(200, 16).astype(np.float32)
+
+    store.add_embeddings(product_ids, embeddings)
+    assert store.index.is_trained
+    assert store.index.ntotal == 200
+
+    file_path = str(tmp_path / "faiss_index.pkl")
+    store.save(file_path)
+    loaded = FAISSVectorStore.load(file_path)
+    assert loaded.index_factory == "IVF4,Flat"
+    assert len(loaded.search(embeddings[0], top_k=5)) > 0
+
+
+def test_ivf_nlist_placeholder_and_nprobe_persist(tmp_path):
+    """Test "{nlist}" is sized from the first batch and nprobe survives save/load."""
+    import faiss
+
+    store = FAISSVectorStore(
+        dimension=16,
+        index_type=FAISSIndexType.INNER_PRODUCT,
+        index_factory="IVF{nlist},Flat",
+        nprobe=4,
+    )
+    embeddings = np.random.rand(400, 16).astype(np.float32)
+    store.add_embeddings([f"P{i:03d}" for i in range(400)], embeddings)
+
+    # 4 * sqrt(400) = 80 lists is capped at 400 // 39 = 10
+    assert store.index_factory == "IVF10,Flat"
+    assert faiss.extract_index_ivf(store.index).nprobe == 4
+
+    file_path = str(tmp_path / "faiss_index_20240101.faiss")
+    store.save(file_path)
+    loaded = FAISSVectorStore.load(file_path)
+    assert loaded.nprobe == 4
+    assert faiss.extract_index_ivf(loaded.index).nprobe == 4
+
+
+def test_ivf_nlist_placeholder_small_catalog():
+    """Test "{nlist}" never exceeds the batch size, so tiny catalogs still train."""
+    store = FAISSVectorStore(
+        dimension=16,
+        index_type=FAISSIndexType.INNER_PRODUCT,
+        index_factory="IVF{nlist},Flat",
+    )
+    embeddings = np.random.default_rng(0).random((10, 16)).astype(np.float32)
+    store.add_embeddings([f"P{i:03d}" for i in range(10)], embeddings)
+
+    assert store.index_factory == "IVF1,Flat"
+    results = store.search(embeddings[3], top_k=1)
+    assert results[0][0] == "P003"
+
+
+@pytest.mark.parametrize("quantization", ["int8", "fp16"])
+def test_quantized_index_search_and_persist(tmp_path, quantization):
+    """Test scalar-quantized indices keep ranking and survive save/load."""
+    import faiss
+
+    store = FAISSVectorStore(
+        dimension=16, index_type=FAISSIndexType.INNER_PRODUCT, quantization=quantization
+    )
+    embeddings = np.random.default_rng(0).standard_normal((200, 16)).astype(np.float32)
+    product_ids = [f"P{i:03d}" for i in range(200)]
+    store.add_embeddings(product_ids, embeddings)
+
+    assert isinstance(store.index, faiss.IndexScalarQuantizer)
+    assert store.search(embeddings[7], top_k=1)[0][0] == "P007"
+    # Only the codes are resident; embeddings are decoded from the index on demand
+    assert store._embeddings is None
+    decoded = store.get_embedding("P007")
+    assert decoded.dtype == np.float32
+    np.testing.assert_allclose(decoded, embeddings[7] / np.linalg.norm(embeddings[7]), atol=0.05)
+
+    file_path = str(tmp_path / "faiss_index_20240101.faiss")
+    store.save(file_path)
+    loaded = FAISSVectorStore.load(file_path)
+    assert loaded.quantization == quantization
+    assert loaded.search(embeddings[7], top_k=1)[0][0] == "P007"
+
+
+def test_save_and_load_native_index(tmp_path):
+    """Test a .faiss index round-trips through write_index with its sidecars."""
+    store = FAISSVectorStore(dimension=16, index_type=FAISSIndexType.INNER_PRODUCT)
+    product_ids = [f"P{i:03d}" for i in range(10)]
+    embeddings = np.random.rand(10, 16).astype(np.float32)
+    store.add_embeddings(product_ids, embeddings)
+
+    file_path = str(tmp_path / "faiss_index_20240101.faiss")
+    store.save(file_path)
+    assert os.path.exists(str(tmp_path / "faiss_index_20240101_metadata.json"))
+    assert os.path.exists(str(tmp_path / "faiss_index_20240101_embeddings.npy"))
+
+    loaded = FAISSVectorStore.load(file_path)
+    assert loaded.product_ids == product_ids
+    assert loaded.index.ntotal == 10
+    np.testing.assert_allclose(loaded.get_embedding("P003"), store.get_embedding("P003"))
+    assert [p for p, _ in loaded.search(embeddings[0].copy(), top_k=3)] == \
+        [p for p, _ in store.search(embeddings[0].copy(), top_k=3)]
+
+
+@pytest.mark.parametrize("index_factory", [None, "IVF4,Flat"])
+def test_search_only_scores_allowed_vectors(index_factory):
+    """Test an allowed mask restricts results without shrinking them below top_k."""
+    store = FAISSVectorStore(
+        dimension=16, index_type=FAISSIndexType.INNER_PRODUCT, index_factory=index_factory, nprobe=4
+    )
+    product_ids = [f"P{i:03d}" for i in range(200)]
+    embeddings = np.random.rand(200, 16).astype(np.float32)
+    store.add_embeddings(product_ids, embeddings)
+
+    allowed = np.zeros(200, dtype=bool)
+    allowed[::10] = True
+    results = store.search(embeddings[3].copy(), top_k=5, allowed=allowed)
+
+    assert len(results) == 5
+    assert all(int(product_id[1:]) % 10 == 0 for product_id, _ in results)
+
+
+@pytest.mark.parametrize("index_type", [FAISSIndexType.INNER_PRODUCT, FAISSIndexType.L2])
+def test_distance_matrix_matches_distance(index_type):
+    """distance_matrix agrees with pairwise distance(), including unknown products."""
+    store = FAISSVectorStore(dimension=8, index_type=index_type)
+    store.add_embeddings(["P001", "P002", "P003"], np.random.rand(3, 8).astype(np.float32))
+
+    product_ids = ["P001", "P002", "UNKNOWN", "P003"]
+    distances = store.distance_matrix(product_ids)
+
+    for i, first in enumerate(product_ids):
+        for j, second in enumerate(product_ids):
+            if i != j:
+                assert distances[i, j] == pytest.approx(store.distance(first, second), abs=1e-5)
+
+
+def test_distances_batches_distance():
+    """distances() returns distance() for each pair, with 1.0 for unknown products."""
+    store = FAISSVectorStore(dimension=8, index_type=FAISSIndexType.L2)
+    embeddings = np.random.rand(3, 8).astype(np.float32)
+    store.add_embeddings(["P001", "P002", "P003"], embeddings)
+
+    distances = store.distances("P001", ["P002", "UNKNOWN", "P003"])
+
+    np.testing.assert_allclose(
+        distances,
+        [np.linalg.norm(embeddings[0] - embeddings[1]), 1.0, np.linalg.norm(embeddings[0] - embeddings[2])],
+        rtol=1e-5,
+    )
+    assert store.distance("P001", "UNKNOWN") == 1.0
+
+
+def test_to_gpu_without_gpu_support_keeps_cpu_index():
+    """Test to_gpu() is a no-op on faiss-cpu builds or machines without a GPU."""
+    import faiss
+
+    if hasattr(faiss, "StandardGpuResources") and faiss.get_num_gpus() > 0:
+        pytest.skip("GPU available")
+
+    store = FAISSVectorStore(dimension=8, index_type=FAISSIndexType.INNER_PRODUCT)
+    embeddings = np.random.rand(10, 8).astype(np.float32)
+    store.add_embeddings([f"P{i:03d}" for i in range(10)], embeddings)
+
+    assert store.to_gpu() is False
+    assert isinstance(store.index, faiss.IndexFlat)
+    assert store.search(embeddings[3], top_k=1)[0][0] == "P003"
+
+
+@pytest.mark.parametrize(
+    "index_type,threshold,expected",
+    [(FAISSIndexType.INNER_PRODUCT, 0.5, ["P1", "P2"]), (FAISSIndexType.L2, 0.5, ["P0", "P1"])],
+)
+def test_search_arrays_mask_missing_and_threshold(index_type, threshold, expected):
+    """Test -1 indices and the metric-specific threshold are dropped from the arrays."""
+    from unittest.mock import Mock
+
+    store = FAISSVectorStore(dimension=4, index_type=index_type)
+    store.product_ids = ["P0", "P1", "P2"]
+    distances = np.array([[0.2, 0.5, 0.9, 1.0]], dtype=np.float32)
+    indices = np.array([[0, 1, 2, -1]], dtype=np.int64)
+    store.index = Mock(ntotal=4)
+    store.index.search.return_value = (distances, indices)
+
+    [(product_ids, scores)] = store.search_batch_arrays(
+        np.ones((1, 4), dtype=np.float32), top_k=4, threshold=threshold
+    )
+
+    assert product_ids.tolist() == expected
+    assert scores.dtype == np.float32
+    assert len(scores) == len(expected)
+
+
+def test_inner_product_store_keeps_unit_vectors():
+    """Test InnerProduct stores hold unit vectors, so searching one needs no renormalization."""
+    store = FAISSVectorStore(dimension=8, index_type=FAISSIndexType.INNER_PRODUCT)
+    embeddings = np.random.rand(5, 8).astype(np.float32) * 3
+    store.add_embeddings([f"P{i}" for i in range(5)], embeddings)
+
+    assert store.normalized
+    assert not FAISSVectorStore(dimension=8, index_type=FAISSIndexType.L2).normalized
+    stored = store.get_embedding("P2")
+    assert np.isclose(np.linalg.norm(stored), 1.0, atol=1e-5)
+    results = store.search_by_vector(stored, top_k=1, normalized=True)
+    assert results[0][0] == "P2"
+    assert np.isclose(results[0][1], 1.0, atol=1e-5)
+
+
+def test_normalize_rows_in_blocks_matches_single_pass(monkeypatch):
+    """Test block-parallel normalization gives the same unit rows as one pass."""
+    import faiss
+    from src.services import vector_store as vector_store_module
+
+    monkeypatch.setattr(vector_store_module, "NORMALIZE_BLOCK_ROWS", 7)
+    embeddings = np.random.rand(50, 8).astype(np.float32)
+    expected = embeddings.copy()
+    faiss.normalize_L2(expected)
+
+    _normalize_rows(embeddings)
+
+    np.testing.assert_allclose(embeddings, expected, rtol=1e-6)
+
+
+def test_search_arrays_matches_search():
+    """Test search_arrays returns the same results as search, as parallel arrays."""
+    store = FAISSVectorStore(dimension=8, index_type=FAISSIndexType.INNER_PRODUCT)
+    embeddings = np.random.rand(20, 8).astype(np.float32)
+    store.add_embeddings([f"P{i:02d}" for i in range(20)], embeddings)
+
+    product_ids, scores = store.search_arrays(embeddings[4].copy(), top_k=5)
+
+    assert product_ids.dtype == object
+    assert scores.dtype == np.float32
+    assert list(zip(product_ids.tolist(), scores.tolist())) == store.search(embeddings[4].copy(), top_k=5)